@@ -3,6 +3,13 @@
 -- =====================================================================
 
 -- Pour faciliter les tests, on supprime les tables si elles existent déjà.
+DROP TABLE IF EXISTS sketch_quantiles CASCADE;
+DROP TABLE IF EXISTS activite_table CASCADE;
+DROP TABLE IF EXISTS activite_joueur CASCADE;
+DROP TABLE IF EXISTS activite_periode CASCADE;
+DROP TABLE IF EXISTS stats_joueur CASCADE;
+DROP TABLE IF EXISTS resultat_main CASCADE;
+DROP TABLE IF EXISTS main_jouee CASCADE;
 DROP TABLE IF EXISTS partie_joueur CASCADE;;
 DROP TABLE IF EXISTS partie  CASCADE;
 DROP TABLE IF EXISTS table_joueur CASCADE;
@@ -38,9 +45,10 @@ CREATE TABLE table_poker (
   nb_sieges INT NOT NULL,
   blind_initial DECIMAL(10, 2) NOT NULL,
   pot DECIMAL(10, 2) NOT NULL DEFAULT 0.00,
-  flop VARCHAR(200) DEFAULT '',
-  turn VARCHAR(200) DEFAULT '',
-  river VARCHAR(200) DEFAULT '',
+  -- Cartes communes : un octet par carte (code de la carte, 0 à 51), voir ListeCartes.cartes_to_bytes.
+  flop BYTEA DEFAULT '',
+  turn BYTEA DEFAULT '',
+  river BYTEA DEFAULT '',
   val_derniere_mise DECIMAL(10, 2) NOT NULL DEFAULT 0.00,
   -- nb_joueurs est une donnée dénormalisée pour un accès rapide.
   -- Elle devra être mise à jour par l'application.
@@ -74,7 +82,7 @@ CREATE TABLE table_joueur (
 -- Représente une main de poker qui s'est déroulée sur une table.
 -- -----------------------------------------------------
 CREATE TABLE partie (
-  id_partie INT PRIMARY KEY,
+  id_partie INT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
   id_table INT NOT NULL,
   pot DECIMAL(12, 2) NOT NULL,
   date_debut TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -87,6 +95,44 @@ CREATE TABLE partie (
     ON DELETE CASCADE
 );
 
+-- -----------------------------------------------------
+-- Table `main_jouee`
+-- Résumé compact d'une main jouée par le moteur de table (MoteurTable),
+-- enregistré en une seule écriture à la fin de la main.
+-- -----------------------------------------------------
+CREATE TABLE main_jouee (
+  id_partie INT PRIMARY KEY,
+  id_table INT NOT NULL,
+  numero INT NOT NULL,
+  board BYTEA DEFAULT '', -- un octet par carte, comme table_poker.flop
+  mains JSONB NOT NULL, -- id joueur -> codes des 2 cartes
+  actions JSONB NOT NULL, -- [id joueur, tour, action, montant]
+  gains JSONB NOT NULL, -- id joueur -> montant remporté
+  CONSTRAINT fk_main_jouee_partie
+    FOREIGN KEY (id_partie)
+    REFERENCES partie(id_partie)
+    ON DELETE CASCADE
+);
+
+-- -----------------------------------------------------
+-- Table `resultat_main`
+-- Résultat de chaque joueur à chaque main jouée hors moteur (menus en ligne de commande),
+-- enregistré à la distribution du pot (voir TableDao.distribuer_pot).
+-- -----------------------------------------------------
+CREATE TABLE resultat_main (
+  id_resultat INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  id_table INT NOT NULL,
+  id_joueur INT NOT NULL,
+  date_main TIMESTAMP NOT NULL DEFAULT NOW(),
+  mise DECIMAL(12, 2) NOT NULL DEFAULT 0.00, -- total misé sur la main
+  gain DECIMAL(12, 2) NOT NULL DEFAULT 0.00, -- montant remporté
+  victoire BOOLEAN NOT NULL DEFAULT FALSE, -- voir Pot.gagnants
+  CONSTRAINT fk_resultat_main_joueur
+    FOREIGN KEY (id_joueur)
+    REFERENCES joueur(id_joueur)
+    ON DELETE CASCADE
+);
+
 -- -----------------------------------------------------
 -- Table `partie_joueur` (TABLE DE JONCTION)
 -- Lie les joueurs aux parties auxquelles ils ont participé. Relation N-N.
@@ -98,7 +144,7 @@ CREATE TABLE partie_joueur (
     solde_partie DECIMAL(10,2) DEFAULT 0.00,
     statut VARCHAR(50) DEFAULT 'en attente',
     id_siege INT NULL,
-    cartes_main TEXT DEFAULT '',
+    cartes_main BYTEA DEFAULT '', -- un octet par carte, comme table_poker.flop
     PRIMARY KEY (id_table, id_joueur),
     CONSTRAINT fk_partie_joueur_table
         FOREIGN KEY (id_table)
@@ -111,6 +157,72 @@ CREATE TABLE partie_joueur (
 );
 
 
+-- -----------------------------------------------------
+-- Table `stats_joueur`
+-- Statistiques cumulées de chaque joueur, mises à jour à la fin de chaque main
+-- (voir StatistiquesDao.cumuler) et reconstructibles depuis l'historique.
+-- -----------------------------------------------------
+CREATE TABLE stats_joueur (
+  id_joueur INT PRIMARY KEY,
+  nb_parties INT NOT NULL DEFAULT 0, -- mains jouées
+  nb_victoires INT NOT NULL DEFAULT 0, -- mains où le joueur a remporté une part du pot payée par d'autres (voir Pot.gagnants)
+  total_gains DECIMAL(12, 2) NOT NULL DEFAULT 0.00, -- résultat net (gains - mises)
+  total_mises DECIMAL(12, 2) NOT NULL DEFAULT 0.00,
+  derniere_partie TIMESTAMP,
+  CONSTRAINT fk_stats_joueur_joueur
+    FOREIGN KEY (id_joueur)
+    REFERENCES joueur(id_joueur)
+    ON DELETE CASCADE
+);
+
+-- classements : les k premiers sont lus dans l'index
+CREATE INDEX idx_stats_joueur_victoires ON stats_joueur (nb_victoires DESC);
+CREATE INDEX idx_stats_joueur_parties ON stats_joueur (nb_parties DESC);
+CREATE INDEX idx_joueur_credit ON joueur (credit DESC);
+
+-- -----------------------------------------------------
+-- Tables `activite_periode`, `activite_joueur` et `activite_table`
+-- Activité (mains, pot, joueurs et tables distincts) par heure, jour et mois,
+-- mise à jour à chaque main créée (voir StatistiquesDao.cumuler_activite).
+-- -----------------------------------------------------
+CREATE TABLE activite_periode (
+  granularite VARCHAR(5) NOT NULL, -- 'heure', 'jour' ou 'mois'
+  debut TIMESTAMP NOT NULL, -- début de la période (DATE_TRUNC)
+  nb_parties INT NOT NULL DEFAULT 0,
+  pot_total DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+  nb_joueurs INT NOT NULL DEFAULT 0, -- joueurs distincts (voir activite_joueur)
+  nb_tables INT NOT NULL DEFAULT 0, -- tables distinctes (voir activite_table)
+  PRIMARY KEY (granularite, debut)
+);
+
+-- appartenance des joueurs et des tables à chaque période, pour compter les distincts
+CREATE TABLE activite_joueur (
+  granularite VARCHAR(5) NOT NULL,
+  debut TIMESTAMP NOT NULL,
+  id_joueur INT NOT NULL,
+  PRIMARY KEY (granularite, debut, id_joueur)
+);
+
+CREATE TABLE activite_table (
+  granularite VARCHAR(5) NOT NULL,
+  debut TIMESTAMP NOT NULL,
+  id_table INT NOT NULL,
+  PRIMARY KEY (granularite, debut, id_table)
+);
+
+-- -----------------------------------------------------
+-- Table `sketch_quantiles`
+-- Résumés de quantiles (sketch KLL, voir src/utils/sketch_quantiles.py) des pots et des
+-- mises de chaque table, mis à jour à la fin de chaque main (voir StatistiquesDao.cumuler_quantiles).
+-- La ligne d'id_table 0 résume toutes les tables.
+-- -----------------------------------------------------
+CREATE TABLE sketch_quantiles (
+  mesure VARCHAR(10) NOT NULL, -- 'pot' (pot de chaque main) ou 'mise' (mise d'un joueur sur une main)
+  id_table INT NOT NULL, -- 0 : toutes les tables
+  sketch BYTEA NOT NULL, -- SketchKLL.en_bytes
+  PRIMARY KEY (mesure, id_table)
+);
+
 -- -----------------------------------------------------
 -- Table `admin`
 -- Gere les administrateurs et leurs identifiants.
@@ -0,0 +1,24 @@
+-- =====================================================================
+--- MIGRATION : CARTES STOCKÉES EN OCTETS
+-- =====================================================================
+-- Passe les colonnes de cartes du format texte ("As de coeur,10 de pique")
+-- au format binaire (un octet par carte, code de la carte de 0 à 51).
+-- Les lignes existantes sont converties telles quelles en octets UTF-8 :
+-- ListeCartes.bytes_to_cartes reconnaît ces anciennes lignes et continue de les lire,
+-- elles sont réécrites au format binaire à la prochaine distribution.
+
+ALTER TABLE table_poker
+  ALTER COLUMN flop DROP DEFAULT,
+  ALTER COLUMN flop TYPE BYTEA USING convert_to(COALESCE(flop, ''), 'UTF8'),
+  ALTER COLUMN flop SET DEFAULT '',
+  ALTER COLUMN turn DROP DEFAULT,
+  ALTER COLUMN turn TYPE BYTEA USING convert_to(COALESCE(turn, ''), 'UTF8'),
+  ALTER COLUMN turn SET DEFAULT '',
+  ALTER COLUMN river DROP DEFAULT,
+  ALTER COLUMN river TYPE BYTEA USING convert_to(COALESCE(river, ''), 'UTF8'),
+  ALTER COLUMN river SET DEFAULT '';
+
+ALTER TABLE partie_joueur
+  ALTER COLUMN cartes_main DROP DEFAULT,
+  ALTER COLUMN cartes_main TYPE BYTEA USING convert_to(COALESCE(cartes_main, ''), 'UTF8'),
+  ALTER COLUMN cartes_main SET DEFAULT '';
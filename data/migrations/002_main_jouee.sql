@@ -0,0 +1,20 @@
+-- =====================================================================
+--- MIGRATION : RÉSUMÉ DES MAINS JOUÉES PAR LE MOTEUR DE TABLE
+-- =====================================================================
+-- Le moteur de table (MoteurTable) joue les mains en mémoire et n'écrit
+-- qu'une fois par main : une ligne dans partie, une ligne dans main_jouee
+-- et les soldes finaux des joueurs dans partie_joueur.
+
+CREATE TABLE IF NOT EXISTS main_jouee (
+  id_partie INT PRIMARY KEY,
+  id_table INT NOT NULL,
+  numero INT NOT NULL,
+  board BYTEA DEFAULT '',
+  mains JSONB NOT NULL,
+  actions JSONB NOT NULL,
+  gains JSONB NOT NULL,
+  CONSTRAINT fk_main_jouee_partie
+    FOREIGN KEY (id_partie)
+    REFERENCES partie(id_partie)
+    ON DELETE CASCADE
+);
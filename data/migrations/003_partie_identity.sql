@@ -0,0 +1,17 @@
+-- =====================================================================
+--- MIGRATION : IDENTIFIANT DE PARTIE GÉNÉRÉ PAR UNE SÉQUENCE
+-- =====================================================================
+-- id_partie était calculé par SELECT COALESCE(MAX(id_partie), 0) + 1 avant chaque
+-- insertion (lecture de l'index à chaque partie, doublons possibles entre deux
+-- insertions simultanées). La colonne devient une identité : la base attribue
+-- l'identifiant, renvoyé par INSERT ... RETURNING id_partie.
+
+ALTER TABLE partie
+  ALTER COLUMN id_partie ADD GENERATED BY DEFAULT AS IDENTITY;
+
+-- la séquence reprend après la plus grande partie existante
+SELECT setval(
+  pg_get_serial_sequence('partie', 'id_partie'),
+  COALESCE((SELECT MAX(id_partie) FROM partie), 0) + 1,
+  false
+);
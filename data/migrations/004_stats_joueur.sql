@@ -0,0 +1,25 @@
+-- =====================================================================
+--- MIGRATION : STATISTIQUES CUMULÉES DES JOUEURS
+-- =====================================================================
+-- Les statistiques des joueurs (fiche, classements, joueurs les plus actifs)
+-- étaient recalculées à chaque appel par jointure et GROUP BY sur tout l'historique.
+-- Elles sont désormais lues dans stats_joueur, mise à jour à la fin de chaque main.
+-- Après la migration, remplir la table depuis l'historique :
+--     python -m src.utils.reconstruire_stats
+
+CREATE TABLE IF NOT EXISTS stats_joueur (
+  id_joueur INT PRIMARY KEY,
+  nb_parties INT NOT NULL DEFAULT 0,
+  nb_victoires INT NOT NULL DEFAULT 0,
+  total_gains DECIMAL(12, 2) NOT NULL DEFAULT 0.00,
+  total_mises DECIMAL(12, 2) NOT NULL DEFAULT 0.00,
+  derniere_partie TIMESTAMP,
+  CONSTRAINT fk_stats_joueur_joueur
+    FOREIGN KEY (id_joueur)
+    REFERENCES joueur(id_joueur)
+    ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_stats_joueur_victoires ON stats_joueur (nb_victoires DESC);
+CREATE INDEX IF NOT EXISTS idx_stats_joueur_parties ON stats_joueur (nb_parties DESC);
+CREATE INDEX IF NOT EXISTS idx_joueur_credit ON joueur (credit DESC);
@@ -0,0 +1,33 @@
+-- =====================================================================
+--- MIGRATION : SÉRIES D'ACTIVITÉ PAR PÉRIODE
+-- =====================================================================
+-- obtenir_activite_par_periode agrégeait toute la table partie (DATE_TRUNC + GROUP BY)
+-- à chaque appel. L'activité est désormais tenue par heure, jour et mois dans
+-- activite_periode, mise à jour à chaque main créée ; une requête ne lit que sa fenêtre.
+-- Après la migration, remplir les tables depuis l'historique :
+--     python -m src.utils.reconstruire_stats
+
+CREATE TABLE IF NOT EXISTS activite_periode (
+  granularite VARCHAR(5) NOT NULL, -- 'heure', 'jour' ou 'mois'
+  debut TIMESTAMP NOT NULL, -- début de la période (DATE_TRUNC)
+  nb_parties INT NOT NULL DEFAULT 0,
+  pot_total DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+  nb_joueurs INT NOT NULL DEFAULT 0, -- joueurs distincts (voir activite_joueur)
+  nb_tables INT NOT NULL DEFAULT 0, -- tables distinctes (voir activite_table)
+  PRIMARY KEY (granularite, debut)
+);
+
+-- appartenance des joueurs et des tables à chaque période, pour compter les distincts
+CREATE TABLE IF NOT EXISTS activite_joueur (
+  granularite VARCHAR(5) NOT NULL,
+  debut TIMESTAMP NOT NULL,
+  id_joueur INT NOT NULL,
+  PRIMARY KEY (granularite, debut, id_joueur)
+);
+
+CREATE TABLE IF NOT EXISTS activite_table (
+  granularite VARCHAR(5) NOT NULL,
+  debut TIMESTAMP NOT NULL,
+  id_table INT NOT NULL,
+  PRIMARY KEY (granularite, debut, id_table)
+);
@@ -0,0 +1,15 @@
+-- =====================================================================
+--- MIGRATION : QUANTILES APPROCHÉS DES POTS ET DES MISES
+-- =====================================================================
+-- La médiane des pots et des mises était calculée par PERCENTILE_CONT, qui trie toute la
+-- colonne à chaque appel. Les quantiles sont désormais lus dans des sketchs KLL par table,
+-- mis à jour à la fin de chaque main.
+-- Après la migration, remplir la table depuis l'historique :
+--     python -m src.utils.reconstruire_stats
+
+CREATE TABLE IF NOT EXISTS sketch_quantiles (
+  mesure VARCHAR(10) NOT NULL, -- 'pot' (pot de chaque main) ou 'mise' (mise d'un joueur sur une main)
+  id_table INT NOT NULL,
+  sketch BYTEA NOT NULL, -- SketchKLL.en_bytes
+  PRIMARY KEY (mesure, id_table)
+);
@@ -0,0 +1,11 @@
+-- =====================================================================
+--- MIGRATION : SKETCH GLOBAL DES QUANTILES
+-- =====================================================================
+-- Les quantiles de toutes les tables étaient obtenus en fusionnant les sketchs de chaque
+-- table à chaque lecture. Un sketch global (id_table 0) est désormais tenu à jour à la fin
+-- de chaque main ; les sketchs gardent aussi la somme et la somme des carrés des valeurs
+-- (format version 2). Les sketchs existants sont supprimés, puis reconstruits depuis
+-- l'historique :
+--     python -m src.utils.reconstruire_stats
+
+DELETE FROM sketch_quantiles;
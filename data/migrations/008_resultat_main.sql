@@ -0,0 +1,23 @@
+-- =====================================================================
+--- MIGRATION : RÉSULTAT DES MAINS JOUÉES HORS MOTEUR
+-- =====================================================================
+-- Les mains jouées en ligne de commande ne laissaient pas d'historique : la
+-- reconstruction des statistiques les estimait depuis partie_joueur, dont la
+-- mise est remise à zéro à chaque main. Le résultat de chaque joueur est
+-- désormais enregistré à la distribution du pot. Les statistiques des joueurs
+-- sans main enregistrée (ni dans main_jouee ni ici) ne sont plus modifiées par
+--     python -m src.utils.reconstruire_stats
+
+CREATE TABLE IF NOT EXISTS resultat_main (
+  id_resultat INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  id_table INT NOT NULL,
+  id_joueur INT NOT NULL,
+  date_main TIMESTAMP NOT NULL DEFAULT NOW(),
+  mise DECIMAL(12, 2) NOT NULL DEFAULT 0.00,
+  gain DECIMAL(12, 2) NOT NULL DEFAULT 0.00,
+  victoire BOOLEAN NOT NULL DEFAULT FALSE,
+  CONSTRAINT fk_resultat_main_joueur
+    FOREIGN KEY (id_joueur)
+    REFERENCES joueur(id_joueur)
+    ON DELETE CASCADE
+);
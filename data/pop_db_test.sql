@@ -39,6 +39,9 @@ OVERRIDING SYSTEM VALUE
 VALUES
 (1, 1, 500, '2025-11-05 14:32:10');
 
+-- les identifiants générés reprennent après les parties insérées ci-dessus
+SELECT setval(pg_get_serial_sequence('partie', 'id_partie'), (SELECT MAX(id_partie) FROM partie));
+
 INSERT INTO partie_joueur(id_table, id_joueur, mise_tour, solde_partie, statut, id_siege)
 OVERRIDING SYSTEM VALUE
 VALUES
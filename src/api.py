@@ -1,6 +1,8 @@
-from fastapi import FastAPI, HTTPException, Depends
+import asyncio
+
+from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect
 from fastapi.responses import RedirectResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 from src.service.joueur_service import JoueurService
@@ -11,6 +13,13 @@ from src.business_object.joueur import Joueur
 from src.business_object.table import Table
 from src.business_object.monnaie import Monnaie
 from src.service.transaction_service import TransactionService
+from src.service.equite_service import EquiteService, MAX_ITERATIONS, MAX_PROCESSUS
+from src.service.admin_service import AdminService
+from src.service.diffuseur_table import DiffuseurTable
+from src.service.superviseur_tables import SuperviseurTables
+from src.dao.db_connection_async import DBConnectionAsync
+from src.business_object.liste_cartes import ListeCartes
+from src.business_object.carte import Carte
 
 
 # --- Page d'accueil ---
@@ -25,6 +34,15 @@ table_service = TableService()
 partie_service = PartieService()
 transaction_service = TransactionService()
 joueur_partie_service = JoueurPartieService()
+equite_service = EquiteService()
+admin_service = AdminService()
+
+@app.on_event("shutdown")
+async def fermer_connexions_async():
+    """Ferme le pool de connexions asynchrones à l'arrêt du serveur"""
+    await DiffuseurTable().fermer()
+    await DBConnectionAsync().fermer()
+    await asyncio.to_thread(SuperviseurTables().arreter)
 
 @app.get("/", include_in_schema=False)
 async def redirect_to_docs():
@@ -108,6 +126,7 @@ class RetirerJoueurPartieRequest(BaseModel):
 class MiserRequest(BaseModel):
     id_joueur: int
     montant: int
+    id_table: int
 
 class SeCoucherRequest(BaseModel):
     id_joueur: int
@@ -124,6 +143,26 @@ class AttribuerCartesMainRequest(BaseModel):
     id_joueur: int
     cartes: List[str]
 
+class EquiteRequest(BaseModel):
+    mains: dict[str, Optional[List[str]]]  # id joueur -> cartes ("As de coeur", ...), null si inconnue
+    board: List[str] = []
+    n_iterations: int = Field(10000, gt=0, le=MAX_ITERATIONS)
+    seed: Optional[int] = None
+    n_processus: int = Field(1, gt=0, le=MAX_PROCESSUS)
+    mode: str = "auto"  # "monte_carlo", "exact" ou "auto"
+
+class RejoindreMoteurRequest(BaseModel):
+    id_joueur: int
+    tapis: float
+
+class QuitterMoteurRequest(BaseModel):
+    id_joueur: int
+
+class ActionMoteurRequest(BaseModel):
+    id_joueur: int
+    action: str  # "suivre", "miser" ou "se coucher"
+    montant: float = 0.0
+
 class MettreAJourStatutRequest(BaseModel):
     id_joueur: int
     id_table: int
@@ -145,7 +184,7 @@ async def lister_joueurs():
 # Trouver un joueur par ID
 @app.get("/joueurs/{id_joueur}")
 async def trouver_joueur(id_joueur: int):
-    joueur = joueur_service.trouver_par_id(id_joueur)
+    joueur = await joueur_service.trouver_par_id_async(id_joueur)
     if joueur:
         return {"joueur": joueur}
     raise HTTPException(status_code=404, detail="Joueur non trouvé")
@@ -286,13 +325,12 @@ def set_river(id_table: int, request: CartesCommunesRequest):
         raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
 
 @app.get("/tables/{id_table}/cartes-communes")
-def get_cartes_communes(id_table: int):
+async def get_cartes_communes(id_table: int):
     try:
-        cartes_communes = table_service.get_cartes_communes(id_table)
+        cartes_communes = await table_service.get_cartes_communes_async(id_table)
         return {
-            "flop": cartes_communes.get("flop", []),
-            "turn": cartes_communes.get("turn", []),
-            "river": cartes_communes.get("river", [])
+            etape: [str(carte) for carte in cartes_communes[etape].get_cartes()]
+            for etape in ("flop", "turn", "river")
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
@@ -322,13 +360,52 @@ def retirer_pot(id_table: int, request: PotRequest):
         raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
 
 @app.get("/tables/{id_table}/pot")
-def get_pot(id_table: int):
+async def get_pot(id_table: int):
     try:
-        montant = table_service.get_pot(id_table)
+        montant = await table_service.get_pot_async(id_table)
         return {"montant": montant}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
 
+@app.get("/tables/{id_table}/etat")
+def get_etat_table(id_table: int):
+    try:
+        etat = table_service.etat_table(id_table)
+        if etat is None:
+            raise HTTPException(status_code=404, detail="Table non trouvée")
+        return etat.en_dict()
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
+
+@app.websocket("/ws/tables/{id_table}")
+async def suivre_table(websocket: WebSocket, id_table: int):
+    """Suit une table en temps réel : état complet à la connexion, puis deltas et résultats des mains"""
+    await websocket.accept()
+    file = await DiffuseurTable().abonner(id_table)
+    if file is None:
+        await websocket.send_json({"type": "erreur", "detail": "Table non trouvée"})
+        await websocket.close(code=4404)
+        return
+
+    async def envoyer():
+        while True:
+            await websocket.send_json(await file.get())
+
+    envoi = asyncio.create_task(envoyer())
+    try:
+        while True:
+            # les messages du client sont ignorés ; la réception détecte sa déconnexion
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        envoi.cancel()
+        DiffuseurTable().desabonner(id_table, file)
+
 @app.put("/tables/{id_table}/derniere-mise")
 def set_val_derniere_mise(id_table: int, request: DerniereMiseRequest):
     try:
@@ -542,9 +619,9 @@ def retirer_joueur_de_partie(request: RetirerJoueurPartieRequest):
         raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
 
 @app.post("/joueurs-partie/miser")
-def miser(request: MiserRequest):
+async def miser(request: MiserRequest):
     try:
-        success = joueur_partie_service.miser(request.id_joueur, request.montant)
+        success = await joueur_partie_service.miser_async(request.id_joueur, request.montant, request.id_table)
         if success:
             return {"message": f"Mise de {request.montant} effectuée avec succès par le joueur {request.id_joueur}"}
         raise HTTPException(status_code=400, detail=f"Échec de la mise pour le joueur {request.id_joueur}")
@@ -577,7 +654,7 @@ def lister_joueurs_selon_table(id_table: int):
 def recuperer_cartes_main_joueur(id_table: int, id_joueur: int):
     try:
         cartes = joueur_partie_service.recuperer_cartes_main_joueur(id_table, id_joueur)
-        return {"cartes": cartes.cartes}
+        return {"cartes": [str(carte) for carte in cartes.cartes]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
 
@@ -617,6 +694,139 @@ def obtenir_statut(id_joueur: int, id_table: int):
         raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
 
 
+# Fonction synchrone : FastAPI l'exécute dans son pool de threads, la boucle d'événements n'est pas bloquée
+@app.post("/equite")
+def calculer_equite(request: EquiteRequest):
+    try:
+        mains = {
+            id_joueur: [Carte.from_str(c) for c in cartes] if cartes else None
+            for id_joueur, cartes in request.mains.items()
+        }
+        board = [Carte.from_str(c) for c in request.board]
+        return equite_service.calculer_equite(
+            mains, board, request.n_iterations, request.seed, request.n_processus, request.mode
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
+
+
+# --- Statistiques ---
+
+@app.get("/statistiques/rapport")
+def get_rapport_statistiques():
+    """Rapport complet des statistiques, servi depuis le cache tant qu'aucune écriture ne l'invalide"""
+    rapport = admin_service.obtenir_rapport_complet()
+    if not rapport:
+        raise HTTPException(status_code=500, detail="Erreur lors du calcul du rapport")
+    return rapport
+
+@app.get("/statistiques/cache")
+def get_statistiques_cache():
+    """Compteurs du cache des statistiques"""
+    return admin_service.statistiques_cache()
+
+
+# --- Moteur de table en mémoire, réparti sur les processus de tables (voir SuperviseurTables) ---
+# Fonctions synchrones : l'attente de la réponse du processus de la table ne bloque pas la boucle d'événements
+
+@app.post("/tables/{id_table}/moteur/rejoindre")
+def rejoindre_moteur(id_table: int, request: RejoindreMoteurRequest):
+    try:
+        superviseur = SuperviseurTables()
+        if superviseur.etat(id_table) is None:
+            etat = table_service.etat_table(id_table)
+            if etat is None:
+                raise HTTPException(status_code=404, detail="Table non trouvée")
+            superviseur.ouvrir_table(id_table, etat.blind_initial)
+        credit = joueur_partie_service.acheter_tapis(request.id_joueur, id_table, request.tapis)
+        if credit is None:
+            raise HTTPException(status_code=400, detail="Crédit insuffisant ou joueur déjà assis à la table")
+        try:
+            superviseur.ajouter_joueur(id_table, request.id_joueur, request.tapis)
+        except Exception:
+            joueur_partie_service.rendre_tapis(request.id_joueur, id_table, request.tapis)
+            raise
+        return superviseur.etat(id_table)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
+
+@app.post("/tables/{id_table}/moteur/quitter")
+def quitter_moteur(id_table: int, request: QuitterMoteurRequest):
+    try:
+        superviseur = SuperviseurTables()
+        if superviseur.etat(id_table) is None:
+            # table fermée (redémarrage, processus perdu) : le solde enregistré en base fait foi
+            tapis = None
+            credit = joueur_partie_service.rendre_tapis(request.id_joueur, id_table)
+            if credit is None:
+                raise HTTPException(status_code=400, detail="Joueur non assis à la table")
+        else:
+            tapis = superviseur.retirer_joueur(id_table, request.id_joueur)
+            credit = joueur_partie_service.rendre_tapis(request.id_joueur, id_table, tapis)
+            if credit is None:
+                raise HTTPException(status_code=500, detail="Tapis non recrédité")
+        return {"id_joueur": request.id_joueur, "tapis": tapis, "credit": credit}
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
+
+@app.post("/tables/{id_table}/moteur/nouvelle-main")
+def nouvelle_main_moteur(id_table: int):
+    try:
+        superviseur = SuperviseurTables()
+        superviseur.nouvelle_main(id_table)
+        return superviseur.etat(id_table)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
+
+@app.post("/tables/{id_table}/moteur/agir")
+def agir_moteur(id_table: int, request: ActionMoteurRequest):
+    try:
+        superviseur = SuperviseurTables()
+        resume = superviseur.agir(id_table, request.id_joueur, request.action, request.montant)
+        return {"etat": superviseur.etat(id_table), "resultat": resume.en_dict() if resume else None}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur interne du serveur: {str(e)}")
+
+@app.get("/tables/{id_table}/moteur")
+def get_etat_moteur(id_table: int):
+    etat = SuperviseurTables().etat(id_table)
+    if etat is None:
+        raise HTTPException(status_code=404, detail="Table non ouverte")
+    return etat
+
+@app.get("/tables/{id_table}/moteur/main")
+def get_main_moteur(id_table: int, id_joueur: int):
+    """Cartes privées d'un joueur pour la main en cours (absentes de l'état public de la table)"""
+    try:
+        return {"id_joueur": id_joueur, "cartes": SuperviseurTables().main(id_table, id_joueur)}
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.post("/moteur/processus")
+def ajouter_processus_tables():
+    """Lance un processus de tables de plus (dans la limite de POKER_PROCESSUS_TABLES_MAX) et y déplace les tables qui lui reviennent"""
+    superviseur = SuperviseurTables()
+    try:
+        nb_deplacees = superviseur.ajouter_processus()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"nb_processus": superviseur.nb_processus, "nb_tables_deplacees": nb_deplacees}
+
+
 if __name__ == "__main__":
     import uvicorn
 
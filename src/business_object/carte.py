@@ -5,6 +5,13 @@ class Carte :
     La classe Carte permet de modéliser une carte du jeu,
     avec sa valeur et sa couleur.
 
+    Les cartes sont immuables et partagées : il n'existe qu'une instance par carte
+    (52 au total), Carte("As", "Pique") renvoie toujours le même objet.
+    Chaque carte porte un code entier précalculé
+    ``code = indice_rang * 4 + indice_couleur`` (indice_rang : 0 pour "2" ... 12 pour "As",
+    indice_couleur : position dans COULEURS()), qui sert au hachage, à l'égalité
+    et à l'évaluation des mains.
+
     Parameters
     ----------
     valeur : str
@@ -22,8 +29,14 @@ class Carte :
     Valeur de la carte.
     __couleur : str
     Couleur de la carte.
+    __code : int
+    Code entier de la carte (0 à 51).
+    __indice_rang : int
+    Rang de la carte (0 pour "2" ... 12 pour "As").
     """
 
+    __slots__ = ("__valeur", "__couleur", "__code", "__indice_rang")
+
     __VALEURS = (
         "As",
         "2",
@@ -41,15 +54,42 @@ class Carte :
     )
     __COULEURS = ("Pique", "Carreau", "Coeur", "Trêfle")
 
+    # Instances partagées, par (valeur, couleur), par code et par texte ("As de pique")
+    __CARTES = {}
+    __PAR_CODE = [None] * 52
+    __PAR_TEXTE = {}
 
-    def __init__(self, valeur: str, couleur: str):
-        if valeur not in self.__VALEURS:
+    def __new__(cls, valeur: str, couleur: str):
+        carte = cls.__CARTES.get((valeur, couleur))
+        if carte is not None:
+            return carte
+        if valeur not in cls.__VALEURS:
             raise ValueError(f"Valeur {valeur} non valide")
-        if couleur not in self.__COULEURS:
+        if couleur not in cls.__COULEURS:
             raise ValueError(f"Couleur {couleur} non valide")
-        self.__valeur = valeur
-        self.__couleur = couleur
 
+        carte = super().__new__(cls)
+        indice_rang = (cls.__VALEURS.index(valeur) - 1) % len(cls.__VALEURS)
+        code = indice_rang * len(cls.__COULEURS) + cls.__COULEURS.index(couleur)
+        object.__setattr__(carte, "_Carte__valeur", valeur)
+        object.__setattr__(carte, "_Carte__couleur", couleur)
+        object.__setattr__(carte, "_Carte__code", code)
+        object.__setattr__(carte, "_Carte__indice_rang", indice_rang)
+
+        cls.__CARTES[(valeur, couleur)] = carte
+        cls.__PAR_CODE[code] = carte
+        cls.__PAR_TEXTE[str(carte)] = carte
+        return carte
+
+    def __setattr__(self, nom, valeur):
+        raise AttributeError("Une carte est immuable.")
+
+    def __delattr__(self, nom):
+        raise AttributeError("Une carte est immuable.")
+
+    def __reduce__(self):
+        # la désérialisation (pickle, copy) renvoie l'instance partagée
+        return (Carte, (self.__valeur, self.__couleur))
 
     @classmethod
     def VALEURS(cls):
@@ -58,7 +98,7 @@ class Carte :
     @classmethod
     def COULEURS(cls):
         return cls.__COULEURS
-    
+
     @property
     def valeur(self):
         return self.__valeur
@@ -67,9 +107,17 @@ class Carte :
     def couleur(self):
         return self.__couleur
 
+    @property
+    def code(self) -> int:
+        return self.__code
+
+    @property
+    def indice_rang(self) -> int:
+        return self.__indice_rang
+
     def __eq__(self, other):
         if isinstance(other, Carte):
-            return (self.__valeur, self.__couleur) == (other.__valeur, other.__couleur)
+            return self.__code == other.__code
         else:
             return False
 
@@ -80,14 +128,24 @@ class Carte :
         return f"Carte({self.__valeur!r}, {self.__couleur!r})"
 
     def __hash__(self):
-        return hash(repr(self))
-    
+        return self.__code
+
+    @classmethod
+    def depuis_code(cls, code: int) -> "Carte":
+        """Renvoie la carte correspondant à un code entier (0 à 51)."""
+        if not isinstance(code, int) or not 0 <= code < len(cls.__PAR_CODE):
+            raise ValueError(f"Code de carte {code} non valide")
+        return cls.__PAR_CODE[code]
+
     @classmethod
     def from_str(cls, s: str) -> "Carte":
         """
         Reconstruit une carte à partir d'une chaîne de type "valeur de couleur", 
         ex: "As de coeur" ou "10 de pique".
         """
+        carte = cls.__PAR_TEXTE.get(s)
+        if carte is not None:
+            return carte
         try:
             valeur, couleur = s.split(" de ", 1)
             couleur = couleur.capitalize() #car stocké avec le format str en bdd
@@ -95,3 +153,9 @@ class Carte :
         except Exception as e:
             raise ValueError(f"Impossible de créer une Carte à partir de '{s}'") from e
 
+
+# Création des 52 instances partagées
+for _couleur in Carte.COULEURS():
+    for _valeur in Carte.VALEURS():
+        Carte(_valeur, _couleur)
+del _couleur, _valeur
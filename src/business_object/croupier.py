@@ -13,7 +13,8 @@ class Croupier:
     Attributes
     ----------
     pioche : ListeCartes
-        La pioche de cartes utilisée par le croupier.
+        La pioche de cartes utilisée par le croupier, mélangée une seule fois
+        à la création du croupier : chaque carte distribuée est ensuite piochée en O(1).
 
     Methods
     -------
@@ -29,6 +30,8 @@ class Croupier:
 
     def __init__(self, pioche: ListeCartes):
         self.pioche = pioche
+        if not pioche.melangee:
+            pioche.melanger()
 
     def distribuer(self, joueurs_partie: List[JoueurPartie], nb_cartes: int):
         """Distribue un nombre de cartes privées à chaque joueur (pré-flop)."""
@@ -0,0 +1,111 @@
+from dataclasses import asdict, dataclass
+
+from src.business_object.carte import Carte
+
+
+@dataclass(frozen=True)
+class JoueurAssis:
+    """
+    Etat d'un joueur assis à une table, tel que lu en base (ligne de partie_joueur)
+
+    Attributs:
+    ----------
+        id_joueur (int): Identifiant du joueur.
+        id_siege (int): Siège occupé (None si non attribué).
+        statut (str): Statut du joueur dans la main ("en jeu", "s'est couché", ...).
+        mise_tour (int): Mise du joueur pendant le tour d'enchères en cours.
+        solde_partie (float): Solde du joueur dans la partie.
+        credit (float): Crédit du joueur (None s'il n'est pas connu) ; absent de en_dict.
+    """
+
+    id_joueur: int
+    id_siege: int = None
+    statut: str = None
+    mise_tour: int = 0
+    solde_partie: float = 0.0
+    credit: float = None
+
+
+@dataclass(frozen=True)
+class EtatTable:
+    """
+    Photographie immuable de l'état d'une table de poker, lue en une seule requête
+
+    Regroupe les colonnes de table_poker utilisées par la boucle de jeu et les joueurs assis,
+    pour éviter une requête par information (pot, dernière mise, joueur dont c'est le tour, ...).
+
+    Attributs:
+    ----------
+        id_table (int): Identifiant de la table.
+        nb_sieges (int): Nombre de sièges de la table.
+        blind_initial (float): Montant de la blind initiale.
+        pot (float): Montant du pot.
+        val_derniere_mise (float): Valeur de la dernière mise.
+        id_joueur_tour (int): Joueur dont c'est le tour.
+        id_joueur_bouton (int): Joueur qui a le bouton.
+        flop, turn, river (tuple[Carte]): Cartes communes distribuées.
+        joueurs (tuple[JoueurAssis]): Joueurs assis, triés par siège puis par identifiant.
+    """
+
+    id_table: int
+    nb_sieges: int = 0
+    blind_initial: float = 0.0
+    pot: float = 0.0
+    val_derniere_mise: float = 0.0
+    id_joueur_tour: int = None
+    id_joueur_bouton: int = None
+    flop: tuple[Carte, ...] = ()
+    turn: tuple[Carte, ...] = ()
+    river: tuple[Carte, ...] = ()
+    joueurs: tuple[JoueurAssis, ...] = ()
+
+    @property
+    def board(self) -> tuple[Carte, ...]:
+        """Toutes les cartes communes distribuées (flop, turn puis river)"""
+        return self.flop + self.turn + self.river
+
+    @property
+    def ids_joueurs(self) -> list[int]:
+        """Identifiants des joueurs assis"""
+        return [joueur.id_joueur for joueur in self.joueurs]
+
+    @property
+    def statuts(self) -> dict:
+        """Dictionnaire clé : id joueur, valeur : statut"""
+        return {joueur.id_joueur: joueur.statut for joueur in self.joueurs}
+
+    def statut(self, id_joueur: int) -> str:
+        """Statut d'un joueur (None s'il n'est pas assis à la table)"""
+        for joueur in self.joueurs:
+            if joueur.id_joueur == id_joueur:
+                return joueur.statut
+        return None
+
+    def credit(self, id_joueur: int) -> float:
+        """Crédit d'un joueur (None s'il n'est pas assis à la table)"""
+        for joueur in self.joueurs:
+            if joueur.id_joueur == id_joueur:
+                return joueur.credit
+        return None
+
+    def joueurs_avec_statut(self, statuts) -> list[int]:
+        """Identifiants des joueurs dont le statut appartient à statuts"""
+        return [joueur.id_joueur for joueur in self.joueurs if joueur.statut in statuts]
+
+    def en_dict(self) -> dict:
+        """Représentation sérialisable en JSON (cartes sous forme de texte, sans le crédit des joueurs)"""
+        return {
+            "id_table": self.id_table,
+            "nb_sieges": self.nb_sieges,
+            "blind_initial": self.blind_initial,
+            "pot": self.pot,
+            "val_derniere_mise": self.val_derniere_mise,
+            "id_joueur_tour": self.id_joueur_tour,
+            "id_joueur_bouton": self.id_joueur_bouton,
+            "flop": [str(carte) for carte in self.flop],
+            "turn": [str(carte) for carte in self.turn],
+            "river": [str(carte) for carte in self.river],
+            "joueurs": [
+                {cle: valeur for cle, valeur in asdict(joueur).items() if cle != "credit"} for joueur in self.joueurs
+            ],
+        }
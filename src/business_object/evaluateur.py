@@ -0,0 +1,199 @@
+"""Implémentation de l'évaluateur de mains par tables précalculées.
+
+Chaque carte est encodée par un petit entier ``code = indice_rang * 4 + indice_couleur``
+(indice_rang : 0 pour "2" ... 12 pour "As", indice_couleur : position dans Carte.COULEURS()).
+
+L'évaluation d'une main de 1 à 7 cartes ne fait que des additions et des accès à des tables
+construites une seule fois à l'import du module :
+
+- une clé de rangs additive (somme de 5 ** indice_rang) indexe un dictionnaire
+  contenant la force de toutes les mains sans couleur possibles ;
+- une clé de couleurs additive (somme de 8 ** indice_couleur) indique en un accès
+  si une couleur (flush) est présente ;
+- en cas de flush, le masque de bits des rangs de la couleur indexe une table de 8192 entrées.
+
+La force renvoyée est un entier unique comparable : la catégorie (valeur de Combinaison)
+occupe les bits de poids fort, les rangs départageants (kickers) les 20 bits de poids faible.
+"""
+
+from src.business_object.carte import Carte
+from src.business_object.combinaison import Combinaison
+
+NB_RANGS = 13
+NB_COULEURS = 4
+NB_CARTES_MAX = 7
+DECALAGE_CATEGORIE = 20
+
+# Ordre croissant de force des valeurs : "2" ... "Roi", "As"
+ORDRE_RANGS = Carte.VALEURS()[1:] + Carte.VALEURS()[:1]
+
+
+def encoder(carte: Carte) -> int:
+    """Renvoie le code entier (0 à 51) d'une carte."""
+    return carte.code
+
+
+def encoder_cartes(cartes) -> list[int]:
+    """Renvoie la liste des codes entiers d'une liste de cartes."""
+    return [carte.code for carte in cartes]
+
+
+def _emballer(categorie: Combinaison, rangs) -> int:
+    """Construit la force d'une main à partir de sa catégorie et de ses rangs départageants."""
+    force = categorie
+    for rang in rangs:
+        force = (force << 4) | (rang + 1)
+    return force << 4 * (5 - len(rangs))
+
+
+def _plus_haute_quinte(masque: int) -> int:
+    """Renvoie l'indice de la carte haute de la meilleure quinte du masque, -1 sinon."""
+    # As utilisable en carte basse pour la quinte As-2-3-4-5
+    masque_etendu = (masque << 1) | (masque >> 12 & 1)
+    for haut in range(NB_RANGS, 3, -1):
+        fenetre = 0b11111 << (haut - 4)
+        if masque_etendu & fenetre == fenetre:
+            return haut - 1
+    return -1
+
+
+def _rangs_du_masque(masque: int) -> list[int]:
+    """Liste décroissante des indices de rangs présents dans un masque."""
+    return [r for r in range(NB_RANGS - 1, -1, -1) if masque >> r & 1]
+
+
+_QUINTES = [_plus_haute_quinte(masque) for masque in range(1 << NB_RANGS)]
+_RANGS_DU_MASQUE = [_rangs_du_masque(masque) for masque in range(1 << NB_RANGS)]
+
+
+def _force_sans_couleur(masque: int, par_rang: list) -> int:
+    """Force d'une main sans flush.
+
+    masque est le masque des rangs présents, par_rang la liste des couples
+    (nombre de cartes, indice_rang) triée par ordre décroissant.
+    """
+    quinte = _QUINTES[masque]
+
+    def autres(*exclus):
+        return [r for r in _RANGS_DU_MASQUE[masque] if r not in exclus]
+
+    nb_max, rang_max = par_rang[0] if par_rang else (0, 0)
+    if nb_max == 4:
+        return _emballer(Combinaison.Carre, [rang_max] + autres(rang_max)[:1])
+    if nb_max == 3:
+        paires = [r for nb, r in par_rang[1:] if nb >= 2]
+        if paires:
+            return _emballer(Combinaison.Full, [rang_max, max(paires)])
+    if quinte >= 0:
+        return _emballer(Combinaison.Quinte, [quinte])
+    if nb_max == 3:
+        return _emballer(Combinaison.Brelan, [rang_max] + autres(rang_max)[:2])
+    paires = [r for nb, r in par_rang if nb == 2]
+    if len(paires) >= 2:
+        return _emballer(Combinaison.DoublePaire, paires[:2] + autres(*paires[:2])[:1])
+    if paires:
+        return _emballer(Combinaison.Paire, paires[:1] + autres(paires[0])[:3])
+    return _emballer(Combinaison.CarteHaute, _RANGS_DU_MASQUE[masque][:5])
+
+
+def _force_couleur(masque: int) -> int:
+    """Force d'une main dont au moins cinq cartes sont de la couleur décrite par le masque."""
+    quinte = _QUINTES[masque]
+    if quinte == NB_RANGS - 1:
+        return _emballer(Combinaison.QuinteRoyale, [quinte])
+    if quinte >= 0:
+        return _emballer(Combinaison.QuinteFlush, [quinte])
+    return _emballer(Combinaison.Flush, _RANGS_DU_MASQUE[masque][:5])
+
+
+def _construire_table_rangs() -> dict[int, int]:
+    """Force de toutes les répartitions de rangs de 0 à 7 cartes, indexée par clé de rangs."""
+    table = {}
+
+    def parcourir(rang: int, restant: int, cle: int, masque: int, par_rang: list):
+        # parcours des rangs du plus fort au plus faible : par_rang reste trié par rang décroissant
+        if rang < 0:
+            table[cle] = _force_sans_couleur(masque, sorted(par_rang, key=lambda x: x[0], reverse=True))
+            return
+        parcourir(rang - 1, restant, cle, masque, par_rang)
+        for nb in range(1, min(4, restant) + 1):
+            parcourir(rang - 1, restant - nb, cle + nb * 5 ** rang, masque | 1 << rang, par_rang + [(nb, rang)])
+
+    parcourir(NB_RANGS - 1, NB_CARTES_MAX, 0, 0, [])
+    return table
+
+
+def _construire_table_couleurs() -> list[int]:
+    """Indice de la couleur présente au moins cinq fois, -1 sinon, indexé par clé de couleurs."""
+    table = [-1] * 8 ** NB_COULEURS
+    for cle in range(len(table)):
+        for couleur in range(NB_COULEURS):
+            if cle >> (3 * couleur) & 0b111 >= 5:
+                table[cle] = couleur
+    return table
+
+
+def _construire_table_flush() -> list[int]:
+    """Force des mains de la même couleur, indexée par masque de rangs (0 si moins de 5 cartes)."""
+    return [_force_couleur(masque) if bin(masque).count("1") >= 5 else 0 for masque in range(1 << NB_RANGS)]
+
+
+POIDS_RANG = [5 ** (code // NB_COULEURS) for code in range(NB_RANGS * NB_COULEURS)]
+POIDS_COULEUR = [8 ** (code % NB_COULEURS) for code in range(NB_RANGS * NB_COULEURS)]
+TABLE_RANGS = _construire_table_rangs()
+TABLE_COULEURS = _construire_table_couleurs()
+TABLE_FLUSH = _construire_table_flush()
+
+
+def evaluer(codes) -> int:
+    """Renvoie la force d'une main de 1 à 7 cartes encodées.
+
+    Parameters
+    ----------
+    codes : list[int]
+        Les codes des cartes (voir encoder).
+
+    Returns
+    -------
+    force : int
+        Entier d'autant plus grand que la main est forte ;
+        deux mains de même valeur au poker ont la même force.
+    """
+    cle_rangs = 0
+    cle_couleurs = 0
+    for code in codes:
+        cle_rangs += POIDS_RANG[code]
+        cle_couleurs += POIDS_COULEUR[code]
+    couleur = TABLE_COULEURS[cle_couleurs]
+    if couleur < 0:
+        return TABLE_RANGS[cle_rangs]
+    masque = 0
+    for code in codes:
+        if code & 3 == couleur:
+            masque |= 1 << (code >> 2)
+    return TABLE_FLUSH[masque]
+
+
+def force_main(cartes) -> int:
+    """Renvoie la force d'une main de 1 à 7 cartes, totale sur toutes les catégories et kickers.
+
+    Deux mains se comparent directement par leur force : la plus forte a la plus grande force,
+    deux mains de même valeur au poker ont exactement la même force.
+
+    Parameters
+    ----------
+    cartes : list[Carte] | ListeCartes
+        Les cartes de la main (cartes du joueur et cartes communes).
+
+    Returns
+    -------
+    force : int
+    """
+    if hasattr(cartes, "get_cartes"):
+        cartes = cartes.get_cartes()
+    return evaluer(encoder_cartes(cartes))
+
+
+def combinaison_depuis_force(force: int) -> Combinaison:
+    """Renvoie la Combinaison correspondant à une force."""
+    return Combinaison(force >> DECALAGE_CATEGORIE)
@@ -0,0 +1,53 @@
+"""Évaluation vectorisée (NumPy) d'un grand nombre de mains à la fois.
+
+Reprend les tables de l'évaluateur scalaire (voir evaluateur) sous forme de tableaux NumPy :
+une main est évaluée par quelques accès indexés sur des colonnes entières, sans boucle Python
+par main. Les rangs renvoyés sont identiques à ceux de evaluateur.evaluer.
+"""
+
+import numpy as np
+
+from src.business_object import evaluateur
+
+_POIDS_RANG = np.array(evaluateur.POIDS_RANG, dtype=np.int64)
+_POIDS_COULEUR = np.array(evaluateur.POIDS_COULEUR, dtype=np.int64)
+_BITS_RANG = np.array([1 << (code >> 2) for code in range(52)], dtype=np.int64)
+_TABLE_COULEURS = np.array(evaluateur.TABLE_COULEURS, dtype=np.int8)
+_TABLE_FLUSH = np.array(evaluateur.TABLE_FLUSH, dtype=np.int64)
+
+# Les clés de rangs sont creuses (jusqu'à 5 ** 13) : elles sont triées pour une recherche dichotomique
+_CLES_RANGS = np.array(sorted(evaluateur.TABLE_RANGS), dtype=np.int64)
+_FORCES_RANGS = np.array([evaluateur.TABLE_RANGS[cle] for cle in _CLES_RANGS.tolist()], dtype=np.int64)
+
+
+def evaluer_lot(codes) -> np.ndarray:
+    """Renvoie le rang de N mains de 1 à 7 cartes encodées.
+
+    Parameters
+    ----------
+    codes : np.ndarray
+        Tableau (N, k) d'entiers (uint8 de préférence), k entre 1 et 7,
+        chaque ligne contenant les codes de cartes distinctes d'une main (voir evaluateur.encoder).
+
+    Returns
+    -------
+    rangs : np.ndarray
+        Tableau (N,) d'entiers int64, rangs[i] == evaluateur.evaluer(codes[i]).
+    """
+    codes = np.asarray(codes)
+    if codes.ndim != 2 or not 1 <= codes.shape[1] <= evaluateur.NB_CARTES_MAX:
+        raise ValueError("codes doit être un tableau (N, k) avec k entre 1 et 7.")
+    codes = codes.astype(np.intp, copy=False)
+
+    cles_rangs = _POIDS_RANG[codes].sum(axis=1)
+    rangs = _FORCES_RANGS[np.searchsorted(_CLES_RANGS, cles_rangs)]
+
+    couleurs = _TABLE_COULEURS[_POIDS_COULEUR[codes].sum(axis=1)]
+    avec_flush = np.flatnonzero(couleurs >= 0)
+    if avec_flush.size:
+        codes_flush = codes[avec_flush]
+        de_la_couleur = (codes_flush & 3) == couleurs[avec_flush, None]
+        # cartes distinctes : la somme des bits de rang vaut leur OU
+        masques = np.where(de_la_couleur, _BITS_RANG[codes_flush], 0).sum(axis=1)
+        rangs[avec_flush] = _TABLE_FLUSH[masques]
+    return rangs
@@ -25,7 +25,7 @@ class JoueurPartie:
     
     Méthodes:
     ---------
-    miser(montant: int) -> None
+    miser(montant: int) -> int
         Permet au joueur de miser un certain montant.       
     se_coucher() -> None
         Permet au joueur de se coucher.
@@ -39,9 +39,19 @@ class JoueurPartie:
         self.mise_tour = Monnaie(0) 
 
     def miser(self, montant: int):
-        """Le joueur mise un certain montant"""
+        """Le joueur mise un certain montant.
+
+        Une mise supérieure au solde est ramenée au solde : le joueur est alors à tapis
+        (statut "all-in") et ne pourra prétendre qu'aux pots auxquels il a contribué
+        (voir Pot.calculer_pots).
+
+        Returns
+        -------
+        montant : int
+            Le montant réellement misé.
+        """
         if montant <= 0:
-            return  # Ne rien faire si montant négatif ou nul
+            return 0  # Ne rien faire si montant négatif ou nul
         
         if montant > self.solde_partie.valeur  :
             # Ajuster au solde maximum disponible
@@ -49,7 +59,10 @@ class JoueurPartie:
         
         self.solde_partie.debiter(montant)
         self.mise_tour.crediter(montant)
+        if self.solde_partie.valeur == 0:
+            self.statut = "all-in"
         print(f"{self.joueur.pseudo} mise {montant}.")
+        return montant
 
     def se_coucher(self):
         """Le joueur se couche."""
@@ -11,14 +11,23 @@ class ListeCartes():
     ----------
     cartes : list[Carte]
     Une liste de cartes.
+    rng : random.Random, optional
+    Générateur aléatoire utilisé pour mélanger et piocher (random.Random(graine) pour
+    rejouer une donne, secrets.SystemRandom() en production). Par défaut le module random.
 
     Attributes
     ----------
     __cartes : list[Carte]
     Liste de cartes.
+    __rng : random.Random
+    Générateur aléatoire de la liste.
+    __melangee : bool
+    Vrai si la liste a été mélangée : piocher prend alors la carte du dessus (fin de liste).
     """
 
-    def __init__(self, cartes=None):
+    def __init__(self, cartes=None, rng=None):
+        self.__rng = rng if rng is not None else random
+        self.__melangee = False
         if cartes is None: # a voir si c'est utile de renvoyer l'ensemble des cartes si cartes=None
             self.__cartes = [
                 Carte(valeur, couleur)
@@ -43,6 +52,7 @@ class ListeCartes():
             raise ValueError(f"{carte} doit être une Carte.")
         else:
             self.__cartes.append(carte)
+            self.__melangee = False
 
     def get_cartes(self):
         return self.__cartes
@@ -52,8 +62,32 @@ class ListeCartes():
         """Retourne la liste des cartes."""
         return self.__cartes
     
+    @property
+    def melangee(self) -> bool:
+        """Indique si la liste a été mélangée depuis la dernière carte ajoutée."""
+        return self.__melangee
+
+    def melanger(self) -> "ListeCartes":
+        """Mélange la liste sur place (Fisher–Yates) avec le générateur de la liste.
+
+        Après le mélange, chaque pioche retire la dernière carte en O(1).
+
+        Returns
+        -------
+        ListeCartes
+            La liste elle-même.
+        """
+        cartes = self.__cartes
+        for i in range(len(cartes) - 1, 0, -1):
+            j = self.__rng.randrange(i + 1)
+            cartes[i], cartes[j] = cartes[j], cartes[i]
+        self.__melangee = True
+        return self
+
     def piocher(self) -> Carte:
         """Pioche une carte aléatoire et la retire de la liste.
+
+        Si la liste a été mélangée, la carte du dessus (fin de liste) est retirée en O(1).
         Returns
         -------
         Carte | None
@@ -61,7 +95,9 @@ class ListeCartes():
         """
         if not self.__cartes:
             return None
-        index = random.randint(0, len(self.__cartes) - 1)
+        if self.__melangee:
+            return self.__cartes.pop()
+        index = self.__rng.randint(0, len(self.__cartes) - 1)
         return self.__cartes.pop(index)
 
     def cartes_to_str(liste_cartes):
@@ -73,4 +109,25 @@ class ListeCartes():
         from src.business_object.carte import Carte
         from src.business_object.liste_cartes import ListeCartes
         cartes = [Carte.from_str(c.strip()) for c in s.split(',') if c]
-        return ListeCartes(cartes)
\ No newline at end of file
+        return ListeCartes(cartes)
+
+    @staticmethod
+    def cartes_to_bytes(liste_cartes) -> bytes:
+        """Encode une ListeCartes en octets : un octet par carte, égal au code de la carte (0 à 51)."""
+        return bytes(carte.code for carte in liste_cartes.cartes)
+
+    @staticmethod
+    def bytes_to_cartes(donnees) -> "ListeCartes":
+        """Décode une ListeCartes stockée en octets (voir cartes_to_bytes).
+
+        Les anciennes lignes au format texte ("As de coeur,10 de pique") restent lisibles :
+        un texte contient toujours un octet supérieur à 51, qui ne peut pas être un code de carte.
+        """
+        if not donnees:
+            return ListeCartes([])
+        if isinstance(donnees, str):
+            return ListeCartes.str_to_cartes(donnees)
+        donnees = bytes(donnees)
+        if max(donnees) > 51:
+            return ListeCartes.str_to_cartes(donnees.decode("utf-8"))
+        return ListeCartes([Carte.depuis_code(code) for code in donnees])
@@ -0,0 +1,414 @@
+"""Moteur de jeu en mémoire d'une table de poker (Texas Hold'em sans limite).
+
+Le moteur fait autorité sur l'état de la main en cours : sièges, tapis, pot, cartes, joueur dont
+c'est le tour et tour d'enchères. Les actions sont appliquées en mémoire, sans aucune écriture en base ;
+à la fin de chaque main, un résumé compact (ResumeMain) est transmis à la fonction de persistance
+(voir PersistanceMains), qui l'enregistre en une seule transaction.
+"""
+
+import random
+import threading
+
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from src.business_object.carte import Carte
+from src.business_object.croupier import Croupier
+from src.business_object.liste_cartes import ListeCartes
+from src.business_object.pot import Pot
+
+TOURS = ("Pré-flop", "Flop", "Turn", "River")
+ACTIONS = ("suivre", "miser", "se coucher")
+
+EN_JEU = "en jeu"
+COUCHE = "s'est couché"
+TAPIS = "all-in"
+
+
+@dataclass(frozen=True)
+class ResumeMain:
+    """
+    Résumé d'une main terminée, tel qu'il est enregistré en base
+
+    Attributs:
+    ----------
+        id_table (int): Table de la main.
+        numero (int): Numéro de la main sur la table (à partir de 1).
+        date_debut (datetime): Début de la main.
+        board (tuple[Carte]): Cartes communes distribuées.
+        mains (dict): id joueur -> ses 2 cartes.
+        actions (tuple): Actions jouées, (id joueur, tour, action, montant payé).
+        contributions (dict): id joueur -> montant total mis au pot.
+        gains (dict): id joueur -> montant remporté.
+        soldes (dict): id joueur -> tapis en fin de main.
+    """
+
+    id_table: int
+    numero: int
+    date_debut: datetime
+    board: tuple[Carte, ...]
+    mains: dict
+    actions: tuple
+    contributions: dict
+    gains: dict
+    soldes: dict = field(default_factory=dict)
+
+    @property
+    def pot(self) -> float:
+        """Montant total du pot de la main"""
+        return round(sum(self.contributions.values()), 2)
+
+    @property
+    def gagnants(self) -> set:
+        """Joueurs ayant remporté une part du pot payée par les autres (voir Pot.gagnants)"""
+        return Pot.gagnants(self.contributions, self.gains)
+
+    def en_dict(self) -> dict:
+        """Représentation sérialisable en JSON (cartes sous forme de texte)"""
+        return {
+            "id_table": self.id_table,
+            "numero": self.numero,
+            "date_debut": self.date_debut.isoformat() if self.date_debut else None,
+            "board": [str(carte) for carte in self.board],
+            "mains": {j: [str(carte) for carte in cartes] for j, cartes in self.mains.items()},
+            "actions": [list(action) for action in self.actions],
+            "pot": self.pot,
+            "gains": dict(self.gains),
+            "gagnants": sorted(self.gagnants),
+            "soldes": dict(self.soldes),
+        }
+
+
+class MoteurTable:
+    """
+    Etat en mémoire d'une table et de sa main en cours
+
+    Attributs:
+    ----------
+        id_table (int): Identifiant de la table.
+        blind (float): Grosse blinde (la petite blinde en vaut la moitié).
+        sieges (list[int]): Joueurs assis, dans l'ordre des sièges.
+
+    Les méthodes publiques sont protégées par un verrou : un même moteur peut être utilisé
+    par plusieurs threads (requêtes de l'API). Un moteur se sérialise avec pickle (verrou et
+    fonction de persistance exclus), pour passer d'un processus à un autre.
+    """
+
+    def __init__(self, id_table: int, blind: float, rng=None, persister=None):
+        """
+        Parameters
+        ----------
+        id_table : int
+            Identifiant de la table.
+        blind : float
+            Montant de la grosse blinde.
+        rng : random.Random, optional
+            Générateur utilisé pour mélanger le paquet de chaque main (un random.Random si None).
+        persister : callable, optional
+            Appelée avec le ResumeMain de chaque main terminée (par ex. PersistanceMains().soumettre).
+        """
+        self.id_table = id_table
+        self.blind = float(blind)
+        self.sieges = []
+        self.__rng = rng if rng is not None else random.Random()
+        self.persister = persister
+        self.__verrou = threading.RLock()
+        self.__tapis = {}
+        self.__bouton = None
+        self.__numero = 0
+        self.en_cours = False
+        self.__reinitialiser_main()
+
+    def __reinitialiser_main(self):
+        self.__croupier = None
+        self.__mains = {}
+        self.board = []
+        self.__statuts = {}
+        self.__mises_tour = {}
+        self.__contributions = {}
+        self.__actions = []
+        self.__a_parle = set()
+        self.__indice_tour = 0
+        self.mise_courante = 0.0
+        self.__relance_min = self.blind
+        self.joueur_tour = None
+        self.__date_debut = None
+
+    def __getstate__(self):
+        etat = self.__dict__.copy()
+        del etat["_MoteurTable__verrou"]
+        etat["persister"] = None
+        return etat
+
+    def __setstate__(self, etat):
+        self.__dict__.update(etat)
+        self.__verrou = threading.RLock()
+
+    # ------------------------------------------------------------------ joueurs
+
+    def ajouter_joueur(self, id_joueur: int, tapis: float):
+        """Assoit un joueur avec son tapis ; il jouera à partir de la main suivante"""
+        with self.__verrou:
+            if id_joueur in self.__tapis:
+                raise ValueError(f"Le joueur {id_joueur} est déjà assis à la table.")
+            if tapis <= 0:
+                raise ValueError("Le tapis doit être strictement positif.")
+            self.sieges.append(id_joueur)
+            self.__tapis[id_joueur] = round(float(tapis), 2)
+
+    def retirer_joueur(self, id_joueur: int) -> float:
+        """Retire un joueur de la table et renvoie son tapis
+
+        Un joueur engagé dans la main en cours ne peut pas quitter la table avant la fin
+        de la main : la table n'est alors pas modifiée.
+        """
+        with self.__verrou:
+            if id_joueur not in self.__tapis:
+                raise ValueError(f"Le joueur {id_joueur} n'est pas assis à la table.")
+            if self.en_cours and id_joueur in self.__statuts:
+                raise ValueError("Un joueur engagé dans la main ne peut quitter qu'à la fin de la main.")
+            self.sieges.remove(id_joueur)
+            if self.__bouton == id_joueur:
+                self.__bouton = None
+            return self.__tapis.pop(id_joueur)
+
+    def tapis(self, id_joueur: int) -> float:
+        """Tapis actuel d'un joueur"""
+        return self.__tapis[id_joueur]
+
+    # ------------------------------------------------------------------ déroulement
+
+    @property
+    def tour(self) -> str:
+        """Tour d'enchères en cours"""
+        return TOURS[self.__indice_tour]
+
+    @property
+    def pot(self) -> float:
+        """Montant du pot de la main en cours"""
+        return round(sum(self.__contributions.values()), 2)
+
+    def statut(self, id_joueur: int) -> str:
+        """Statut d'un joueur dans la main en cours (None s'il n'y participe pas)"""
+        return self.__statuts.get(id_joueur)
+
+    def en_dict(self) -> dict:
+        """Etat public de la table, sérialisable en JSON (sans les cartes privées)"""
+        with self.__verrou:
+            return {
+                "id_table": self.id_table,
+                "blind": self.blind,
+                "en_cours": self.en_cours,
+                "tour": self.tour if self.en_cours else None,
+                "pot": self.pot,
+                "mise_courante": self.mise_courante,
+                "id_joueur_tour": self.joueur_tour,
+                "id_joueur_bouton": self.__bouton,
+                "board": [str(carte) for carte in self.board],
+                "joueurs": [
+                    {"id_joueur": j, "tapis": self.__tapis[j], "statut": self.__statuts.get(j)}
+                    for j in self.sieges
+                ],
+            }
+
+    def main(self, id_joueur: int) -> list[Carte]:
+        """Cartes privées d'un joueur pour la main en cours"""
+        return list(self.__mains.get(id_joueur, ()))
+
+    def annuler_main(self):
+        """Annule la main en cours : chaque joueur récupère ce qu'il a mis au pot
+
+        Utilisée à la fermeture de la table, pour que les tapis rendus aux joueurs ne perdent pas
+        les mises d'une main inachevée. Sans effet s'il n'y a pas de main en cours.
+        """
+        with self.__verrou:
+            if not self.en_cours:
+                return
+            for id_joueur, montant in self.__contributions.items():
+                self.__tapis[id_joueur] = round(self.__tapis[id_joueur] + montant, 2)
+            self.__reinitialiser_main()
+            self.en_cours = False
+
+    def montant_a_suivre(self, id_joueur: int) -> float:
+        """Montant que le joueur doit payer pour suivre (borné par son tapis)"""
+        return round(min(self.mise_courante - self.__mises_tour.get(id_joueur, 0.0), self.__tapis[id_joueur]), 2)
+
+    def nouvelle_main(self):
+        """Commence une main : avance le bouton, prélève les blindes et distribue les cartes"""
+        with self.__verrou:
+            if self.en_cours:
+                raise ValueError("Une main est déjà en cours.")
+            participants = [id_joueur for id_joueur in self.sieges if self.__tapis[id_joueur] > 0]
+            if len(participants) < 2:
+                raise ValueError("Il faut au moins deux joueurs avec un tapis pour commencer une main.")
+
+            self.__reinitialiser_main()
+            self.en_cours = True
+            self.__numero += 1
+            self.__date_debut = datetime.now()
+            self.__participants = participants
+            self.__statuts = {id_joueur: EN_JEU for id_joueur in participants}
+            self.__mises_tour = {id_joueur: 0.0 for id_joueur in participants}
+            self.__contributions = {id_joueur: 0.0 for id_joueur in participants}
+
+            self.__bouton = self.__suivant(self.__bouton, participants)
+            # en tête à tête, le bouton est petite blinde
+            petite = self.__bouton if len(participants) == 2 else self.__suivant(self.__bouton, participants)
+            grosse = self.__suivant(petite, participants)
+            self.__payer(petite, self.blind / 2, "petite blinde")
+            self.__payer(grosse, self.blind, "grosse blinde")
+            self.mise_courante = self.blind
+
+            self.__croupier = Croupier(ListeCartes(rng=self.__rng))
+            mains = self.__croupier.distribuer2(participants, 2)
+            self.__mains = {id_joueur: tuple(mains[id_joueur].get_cartes()) for id_joueur in participants}
+
+            self.joueur_tour = grosse
+            self.__passer_au_suivant()
+
+    def agir(self, id_joueur: int, action: str, montant: float = 0.0) -> ResumeMain:
+        """Applique l'action du joueur dont c'est le tour
+
+        Parameters
+        ----------
+        id_joueur : int
+            Joueur qui agit (doit être le joueur dont c'est le tour).
+        action : str
+            "suivre" (parole ou suivi), "miser" (relance de montant au-dessus de la mise à suivre)
+            ou "se coucher". Une relance supérieure au tapis est ramenée au tapis.
+        montant : float
+            Montant de la relance, pour "miser".
+
+        Returns
+        -------
+        resume : ResumeMain
+            Le résumé de la main si l'action l'a terminée, None sinon.
+        """
+        with self.__verrou:
+            if not self.en_cours:
+                raise ValueError("Aucune main en cours.")
+            if action not in ACTIONS:
+                raise ValueError(f"Action inconnue : {action}. Actions possibles : {', '.join(ACTIONS)}.")
+            if id_joueur != self.joueur_tour:
+                raise ValueError(f"Ce n'est pas au joueur {id_joueur} de jouer.")
+            return self.__appliquer(id_joueur, action, float(montant))
+
+    # ------------------------------------------------------------------ mécanique interne
+
+    def __appliquer(self, id_joueur, action, montant) -> ResumeMain:
+        if action == "se coucher":
+            self.__statuts[id_joueur] = COUCHE
+            self.__actions.append((id_joueur, self.__indice_tour, action, 0.0))
+        elif action == "suivre":
+            self.__payer(id_joueur, self.montant_a_suivre(id_joueur), action)
+        else:
+            a_payer = self.mise_courante + montant - self.__mises_tour[id_joueur]
+            if montant <= 0:
+                raise ValueError("Le montant de la relance doit être strictement positif.")
+            if a_payer < self.__tapis[id_joueur] and montant < self.__relance_min:
+                raise ValueError(f"La relance minimale est de {self.__relance_min}.")
+            ancienne_mise = self.mise_courante
+            self.__payer(id_joueur, min(a_payer, self.__tapis[id_joueur]), action)
+            relance = self.__mises_tour[id_joueur] - ancienne_mise
+            if relance >= self.__relance_min:
+                # relance complète : les autres joueurs doivent reparler
+                self.__relance_min = relance
+                self.__a_parle = set()
+            self.mise_courante = max(self.mise_courante, self.__mises_tour[id_joueur])
+        self.__a_parle.add(id_joueur)
+
+        restants = [j for j in self.__participants if self.__statuts[j] != COUCHE]
+        if len(restants) == 1:
+            return self.__terminer({restants[0]: self.pot})
+        if self.__tour_clos():
+            return self.__tour_suivant()
+        self.__passer_au_suivant()
+        return None
+
+    def __payer(self, id_joueur, montant, action):
+        montant = round(min(montant, self.__tapis[id_joueur]), 2)
+        self.__tapis[id_joueur] = round(self.__tapis[id_joueur] - montant, 2)
+        self.__mises_tour[id_joueur] = round(self.__mises_tour[id_joueur] + montant, 2)
+        self.__contributions[id_joueur] = round(self.__contributions[id_joueur] + montant, 2)
+        if self.__tapis[id_joueur] == 0:
+            self.__statuts[id_joueur] = TAPIS
+        self.__actions.append((id_joueur, self.__indice_tour, action, montant))
+
+    def __tour_clos(self) -> bool:
+        """Tous les joueurs encore en jeu ont parlé et égalisé la mise courante"""
+        actifs = [j for j in self.__participants if self.__statuts[j] == EN_JEU]
+        return all(j in self.__a_parle and self.__mises_tour[j] == self.mise_courante for j in actifs)
+
+    def __tour_suivant(self) -> ResumeMain:
+        """Passe au tour d'enchères suivant (ou à l'abattage)"""
+        actifs = [j for j in self.__participants if self.__statuts[j] == EN_JEU]
+        while True:
+            if self.__indice_tour == len(TOURS) - 1:
+                return self.__abattage()
+            self.__indice_tour += 1
+            if self.__indice_tour == 1:
+                self.board.extend(self.__croupier.distribuer_flop().get_cartes())
+            else:
+                self.board.append(self.__croupier.distribuer_turn())
+            # s'il reste moins de deux joueurs pouvant miser, les cartes sont distribuées sans enchères
+            if len(actifs) >= 2:
+                break
+
+        self.__mises_tour = {j: 0.0 for j in self.__participants}
+        self.mise_courante = 0.0
+        self.__relance_min = self.blind
+        self.__a_parle = set()
+        self.joueur_tour = self.__bouton
+        self.__passer_au_suivant()
+        return None
+
+    def __passer_au_suivant(self):
+        """Donne la parole au prochain joueur en jeu après le joueur courant"""
+        actifs = [j for j in self.__participants if self.__statuts[j] == EN_JEU]
+        ordre = self.__participants
+        indice = ordre.index(self.joueur_tour) if self.joueur_tour in ordre else -1
+        for decalage in range(1, len(ordre) + 1):
+            candidat = ordre[(indice + decalage) % len(ordre)]
+            if candidat in actifs:
+                self.joueur_tour = candidat
+                return
+
+    def __abattage(self) -> ResumeMain:
+        """Paie le pot principal et les pots secondaires aux meilleures mains de leurs éligibles"""
+        pot = Pot()
+        for id_joueur, contribution in self.__contributions.items():
+            pot.ajouter_mise(contribution, id_joueur)
+        mains = {j: list(self.__mains[j]) + self.board for j in self.__participants if self.__statuts[j] != COUCHE}
+        return self.__terminer(pot.repartir(mains, self.__ordre_apres_bouton()))
+
+    def __ordre_apres_bouton(self) -> list:
+        indice = self.__participants.index(self.__bouton)
+        return self.__participants[indice + 1:] + self.__participants[:indice + 1]
+
+    def __terminer(self, gains: dict) -> ResumeMain:
+        """Crédite les gains, clôt la main et transmet son résumé à la persistance"""
+        for id_joueur, gain in gains.items():
+            self.__tapis[id_joueur] = round(self.__tapis[id_joueur] + gain, 2)
+        resume = ResumeMain(
+            id_table=self.id_table,
+            numero=self.__numero,
+            date_debut=self.__date_debut,
+            board=tuple(self.board),
+            mains=dict(self.__mains),
+            actions=tuple(self.__actions),
+            contributions=dict(self.__contributions),
+            gains=dict(gains),
+            soldes={j: self.__tapis[j] for j in self.__participants},
+        )
+        self.en_cours = False
+        self.joueur_tour = None
+        if self.persister is not None:
+            self.persister(resume)
+        return resume
+
+    @staticmethod
+    def __suivant(id_joueur, ordre: list):
+        """Joueur suivant id_joueur dans ordre (le premier si id_joueur n'y est pas)"""
+        if id_joueur not in ordre:
+            return ordre[0]
+        return ordre[(ordre.index(id_joueur) + 1) % len(ordre)]
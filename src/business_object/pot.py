@@ -1,10 +1,33 @@
 """Implémentation de la classe Pot."""
 
+from dataclasses import dataclass
+
 from src.business_object.monnaie import Monnaie
+from src.business_object.evaluateur import force_main
+
+
+@dataclass(frozen=True)
+class PotSecondaire:
+    """
+    Une couche du pot : le pot principal ou un pot secondaire
+
+    Attributs:
+    ----------
+        montant (float): Montant de la couche.
+        eligibles (tuple): Joueurs pouvant la remporter (non couchés, ayant contribué au moins à ce niveau).
+    """
+
+    montant: float
+    eligibles: tuple
+
 
 class Pot:
     """
     La classe Pot modélise la cagnotte commune d'une partie de poker.
+
+    Les mises enregistrées avec l'identifiant du joueur sont suivies par joueur : quand un joueur
+    à tapis a misé moins que les autres, calculer_pots découpe le pot en pot principal et pots
+    secondaires, et repartir paie chaque couche à la meilleure main parmi ses joueurs éligibles.
     """
     def __init__(self, montant_initial: int = 0):
         """
@@ -14,14 +37,18 @@ class Pot:
             Montant initial du pot, par défaut 0
         """
         self.montant_pot = Monnaie(montant_initial)
+        self.contributions = {}
 
-    def ajouter_mise(self, montant: int):
-        """Ajoute une mise au pot."""
+    def ajouter_mise(self, montant: int, id_joueur: int = None):
+        """Ajoute une mise au pot, comptée dans la contribution du joueur s'il est précisé."""
         self.montant_pot.crediter(montant)
+        if id_joueur is not None and montant > 0:
+            self.contributions[id_joueur] = round(self.contributions.get(id_joueur, 0) + montant, 2)
 
     def reinitialiser_pot(self):
         """Remet le pot à zéro."""
         self.montant_pot = Monnaie(0)
+        self.contributions = {}
 
     def get_montant(self) -> int:
         """Retourne le montant total du pot."""
@@ -30,4 +57,120 @@ class Pot:
     @property
     def valeur(self) -> int:
         """Propriété pour accéder à la valeur du pot (compatibilité avec les tests existants)."""
-        return self.get_montant()
\ No newline at end of file
+        return self.get_montant()
+
+    @staticmethod
+    def partager(montant: float, gagnants: list) -> dict:
+        """Partage un montant entre des gagnants, au centime près.
+
+        Parameters
+        ----------
+        montant : float
+            Montant à partager.
+        gagnants : list
+            Identifiants des gagnants, dans l'ordre de priorité (en général à partir du joueur
+            qui suit le bouton) : les centimes indivisibles vont aux premiers.
+
+        Returns
+        -------
+        dict
+            Dictionnaire clé : id gagnant, valeur : montant remporté (la somme vaut montant).
+        """
+        if not gagnants:
+            return {}
+        part, reste = divmod(round(montant * 100), len(gagnants))
+        return {id_joueur: (part + (i < reste)) / 100 for i, id_joueur in enumerate(gagnants)}
+
+    @staticmethod
+    def gagnants(contributions: dict, gains: dict) -> set:
+        """Joueurs ayant remporté une part du pot payée par d'autres joueurs.
+
+        La part d'une mise que personne n'a suivie revient à son auteur (voir calculer_pots) :
+        elle figure dans ses gains mais n'est pas une victoire.
+
+        Parameters
+        ----------
+        contributions : dict
+            Dictionnaire clé : id joueur, valeur : montant total mis au pot sur la main.
+        gains : dict
+            Dictionnaire clé : id joueur, valeur : montant remporté (voir repartir).
+
+        Returns
+        -------
+        set
+            Identifiants des gagnants.
+        """
+        gagnants = set()
+        for id_joueur, gain in gains.items():
+            mise = contributions.get(id_joueur, 0)
+            suivie = max((m for j, m in contributions.items() if j != id_joueur), default=0)
+            if round(gain - max(0, mise - suivie), 2) > 0:
+                gagnants.add(id_joueur)
+        return gagnants
+
+    def calculer_pots(self, en_lice) -> list:
+        """Découpe les contributions en pot principal et pots secondaires.
+
+        Les contributions sont triées une fois (O(n log n)) ; chaque niveau de contribution
+        distinct ferme une couche, payée par tous les joueurs ayant contribué au moins ce niveau.
+        Les couches consécutives qui ont les mêmes joueurs éligibles sont fusionnées. Une mise
+        que personne n'a suivie forme une couche dont seul son auteur est éligible (elle lui revient).
+
+        Parameters
+        ----------
+        en_lice : iterable
+            Joueurs encore en lice (non couchés) : seuls eux peuvent remporter une couche.
+
+        Returns
+        -------
+        list[PotSecondaire]
+            Le pot principal puis les pots secondaires.
+        """
+        en_lice = set(en_lice)
+        tries = sorted(self.contributions.items(), key=lambda contribution: contribution[1])
+        pots = []
+        niveau_precedent = 0
+        for i, (_, niveau) in enumerate(tries):
+            if niveau == niveau_precedent:
+                continue
+            contributeurs = tries[i:]
+            montant = round((niveau - niveau_precedent) * len(contributeurs), 2)
+            niveau_precedent = niveau
+            eligibles = tuple(id_joueur for id_joueur, _ in contributeurs if id_joueur in en_lice)
+            if pots and (not eligibles or eligibles == pots[-1].eligibles):
+                # couche sans joueur en lice (mise d'un joueur couché) ou mêmes éligibles : fusionnée
+                pots[-1] = PotSecondaire(round(pots[-1].montant + montant, 2), pots[-1].eligibles)
+            else:
+                pots.append(PotSecondaire(montant, eligibles))
+        return pots
+
+    def repartir(self, mains: dict, ordre: list = None) -> dict:
+        """Répartit le pot entre les joueurs en lice à l'abattage.
+
+        Chaque main n'est évaluée qu'une fois (evaluateur.force_main) ; chaque couche du pot
+        est partagée entre ses éligibles de plus grande force.
+
+        Parameters
+        ----------
+        mains : dict
+            Dictionnaire clé : id joueur en lice, valeur : ses cartes et les cartes communes (5 à 7 cartes).
+        ordre : list, optional
+            Ordre de priorité des joueurs pour les centimes indivisibles (voir partager),
+            par défaut l'ordre de mains.
+
+        Returns
+        -------
+        dict
+            Dictionnaire clé : id joueur, valeur : montant remporté (tous pots confondus).
+        """
+        forces = {id_joueur: force_main(cartes) for id_joueur, cartes in mains.items()}
+        ordre = [id_joueur for id_joueur in (ordre or mains) if id_joueur in forces]
+        gains = {}
+        for pot in self.calculer_pots(forces):
+            if not pot.eligibles:
+                continue
+            force_max = max(forces[id_joueur] for id_joueur in pot.eligibles)
+            gagnants = [id_joueur for id_joueur in ordre if id_joueur in pot.eligibles and forces[id_joueur] == force_max]
+            for id_joueur, montant in self.partager(pot.montant, gagnants).items():
+                gains[id_joueur] = round(gains.get(id_joueur, 0) + montant, 2)
+        return gains
@@ -6,6 +6,7 @@ from typing import Optional, List
 from datetime import datetime, timedelta
 
 from src.utils.log_decorator import log
+from src.utils.cache import invalide_cache
 from src.utils.reset_database import ResetDatabase
 from src.utils.singleton import Singleton
 from src.dao.db_connection import DBConnection
@@ -664,6 +665,7 @@ class AdminDao(metaclass=Singleton):
     # =========================================================================
 
     @log
+    @invalide_cache("joueur", "transaction")
     def valider_transaction(self, id_transaction: int, id_admin: int = None) -> bool:
         """Valider une transaction financière
 
@@ -730,6 +732,7 @@ class AdminDao(metaclass=Singleton):
             return False
 
     @log
+    @invalide_cache("transaction")
     def rejeter_transaction(self, id_transaction: int, id_admin: int = None) -> bool:
         """Rejeter une transaction financière
 
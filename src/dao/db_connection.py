@@ -1,46 +1,147 @@
 import os
+import threading
+import time
+
 import dotenv
 import psycopg2
 
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool, PoolError
 from src.utils.singleton import Singleton
 
 
+class ConnexionEmpruntee:
+    """
+    Gestionnaire de contexte renvoyé par DBConnection().connection
+
+    A l'entrée, emprunte une connexion au pool (en attendant qu'une place se libère) ;
+    à la sortie, valide la transaction (ou l'annule en cas d'exception) et rend la connexion.
+    S'utilise comme une connexion psycopg2 : ``with DBConnection().connection as connection:``
+    """
+
+    def __init__(self, db_connection: "DBConnection"):
+        self.__db_connection = db_connection
+        self.__connection = None
+
+    def __enter__(self):
+        self.__connection = self.__db_connection.emprunter()
+        return self.__connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        connection, self.__connection = self.__connection, None
+        cassee = connection.closed or isinstance(exc_value, (psycopg2.InterfaceError, psycopg2.OperationalError))
+        try:
+            if not cassee:
+                if exc_type is None:
+                    connection.commit()
+                else:
+                    connection.rollback()
+        except (psycopg2.InterfaceError, psycopg2.OperationalError):
+            cassee = True
+        finally:
+            self.__db_connection.rendre(connection, cassee)
+        return False
+
+
 class DBConnection(metaclass=Singleton):
     """
     Classe de connexion à la base de données
-    Elle permet de n'ouvrir qu'une seule et unique connexion
+    Elle gère un pool borné de connexions partagé par tous les threads du processus.
+
+    Variables d'environnement (en plus de POSTGRES_HOST, POSTGRES_PORT, ...) :
+    - POSTGRES_POOL_MIN : nombre de connexions ouvertes au démarrage (1 par défaut)
+    - POSTGRES_POOL_MAX : nombre maximal de connexions simultanées (10 par défaut)
+    - POSTGRES_POOL_IDLE : durée d'inactivité (en secondes) au-delà de laquelle une connexion
+      est vérifiée avant d'être prêtée (60 par défaut)
+    - POSTGRES_POOL_TIMEOUT : attente maximale (en secondes) d'une connexion libre (30 par défaut)
     """
 
     def __init__(self):
-        """Ouverture de la connexion"""
+        """Ouverture du pool de connexions"""
         dotenv.load_dotenv()
 
-        self.__connection = psycopg2.connect(
-                host=os.environ["POSTGRES_HOST"],
-                port=os.environ["POSTGRES_PORT"],
-                database=os.environ["POSTGRES_DATABASE"],
-                user=os.environ["POSTGRES_USER"],
-                password=os.environ["POSTGRES_PASSWORD"],
-                cursor_factory=RealDictCursor,
-            )
-
-    # @property
-    # def connection(self):
-    #     return self.__connection
+        self.__taille_max = int(os.environ.get("POSTGRES_POOL_MAX", 10))
+        self.__delai_inactivite = float(os.environ.get("POSTGRES_POOL_IDLE", 60))
+        self.__timeout = float(os.environ.get("POSTGRES_POOL_TIMEOUT", 30))
+
+        self.__pool = ThreadedConnectionPool(
+            int(os.environ.get("POSTGRES_POOL_MIN", 1)),
+            self.__taille_max,
+            **self.parametres_connexion(),
+        )
+        # ThreadedConnectionPool lève une erreur quand il est épuisé : le sémaphore fait attendre
+        self.__places = threading.BoundedSemaphore(self.__taille_max)
+        self.__derniere_utilisation = {}
+
+    @staticmethod
+    def parametres_connexion() -> dict:
+        """Paramètres de connexion lus dans les variables d'environnement"""
+        return {
+            "host": os.environ["POSTGRES_HOST"],
+            "port": os.environ["POSTGRES_PORT"],
+            "database": os.environ["POSTGRES_DATABASE"],
+            "user": os.environ["POSTGRES_USER"],
+            "password": os.environ["POSTGRES_PASSWORD"],
+            "cursor_factory": RealDictCursor,
+        }
+
+    @property
+    def taille_max(self) -> int:
+        """Nombre maximal de connexions simultanées (POSTGRES_POOL_MAX)"""
+        return self.__taille_max
+
     @property
-    def connection(self):
+    def connection(self) -> ConnexionEmpruntee:
+        """Connexion empruntée au pool, à utiliser dans un bloc with"""
+        return ConnexionEmpruntee(self)
+
+    def emprunter(self):
+        """Emprunte une connexion au pool.
+
+        La connexion n'est vérifiée (SELECT 1) que si elle est restée inactive plus de
+        POSTGRES_POOL_IDLE secondes ; une connexion fermée ou en échec est remplacée.
+        """
+        if not self.__places.acquire(timeout=self.__timeout):
+            raise PoolError("Aucune connexion disponible dans le pool.")
         try:
-            # Test rapide pour voir si la connexion est encore valide
-            self.__connection.cursor().execute("SELECT 1")
+            connection = self.__pool.getconn()
+            derniere = self.__derniere_utilisation.get(id(connection))
+            if connection.closed or (derniere is not None and time.monotonic() - derniere > self.__delai_inactivite):
+                connection = self.__verifier(connection)
+            return connection
+        except Exception:
+            self.__places.release()
+            raise
+
+    def rendre(self, connection, cassee: bool = False):
+        """Rend une connexion au pool (fermée si elle est cassée)."""
+        try:
+            if cassee:
+                self.__derniere_utilisation.pop(id(connection), None)
+            else:
+                self.__derniere_utilisation[id(connection)] = time.monotonic()
+            self.__pool.putconn(connection, close=cassee or connection.closed)
+        finally:
+            self.__places.release()
+
+    def __verifier(self, connection):
+        """Renvoie la connexion si elle répond, une nouvelle connexion du pool sinon."""
+        try:
+            if not connection.closed:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                connection.rollback()
+                return connection
         except (psycopg2.InterfaceError, psycopg2.OperationalError):
-            # Reconnecte si la connexion est fermée ou perdue
-            self.__connection = psycopg2.connect(
-                host=os.environ["POSTGRES_HOST"],
-                port=os.environ["POSTGRES_PORT"],
-                database=os.environ["POSTGRES_DATABASE"],
-                user=os.environ["POSTGRES_USER"],
-                password=os.environ["POSTGRES_PASSWORD"],
-                cursor_factory=RealDictCursor,
-            )
-        return self.__connection
\ No newline at end of file
+            pass
+        self.__derniere_utilisation.pop(id(connection), None)
+        self.__pool.putconn(connection, close=True)
+        return self.__pool.getconn()
+
+    def nouvelle_connexion(self):
+        """Ouvre une connexion dédiée, hors pool (à fermer par l'appelant)"""
+        return psycopg2.connect(**self.parametres_connexion())
+
+    def fermer(self):
+        """Ferme toutes les connexions du pool"""
+        self.__pool.closeall()
@@ -0,0 +1,87 @@
+import os
+
+import dotenv
+
+from psycopg import AsyncConnection
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from src.utils.singleton import Singleton
+
+
+class DBConnectionAsync(metaclass=Singleton):
+    """
+    Classe de connexion asynchrone à la base de données (psycopg 3)
+    Elle gère un pool de connexions asynchrones, utilisé par les endpoints async de l'API
+    pour ne jamais bloquer la boucle d'événements.
+
+    Même configuration que DBConnection (POSTGRES_HOST, ..., POSTGRES_POOL_MIN/MAX/IDLE/TIMEOUT).
+    Le pool est ouvert au premier emprunt ou explicitement par ouvrir().
+    """
+
+    def __init__(self):
+        """Création du pool (ouvert plus tard, dans la boucle d'événements)"""
+        dotenv.load_dotenv()
+
+        self.__pool = AsyncConnectionPool(
+            kwargs=self.parametres_connexion(),
+            min_size=int(os.environ.get("POSTGRES_POOL_MIN", 1)),
+            max_size=int(os.environ.get("POSTGRES_POOL_MAX", 10)),
+            max_idle=float(os.environ.get("POSTGRES_POOL_IDLE", 60)),
+            timeout=float(os.environ.get("POSTGRES_POOL_TIMEOUT", 30)),
+            open=False,
+        )
+        self.__ouvert = False
+
+    @staticmethod
+    def parametres_connexion() -> dict:
+        """Paramètres de connexion lus dans les variables d'environnement"""
+        return {
+            "host": os.environ["POSTGRES_HOST"],
+            "port": os.environ["POSTGRES_PORT"],
+            "dbname": os.environ["POSTGRES_DATABASE"],
+            "user": os.environ["POSTGRES_USER"],
+            "password": os.environ["POSTGRES_PASSWORD"],
+            "row_factory": dict_row,
+        }
+
+    async def nouvelle_connexion(self) -> AsyncConnection:
+        """Ouvre une connexion dédiée en autocommit, hors pool (à fermer par l'appelant)"""
+        return await AsyncConnection.connect(autocommit=True, **self.parametres_connexion())
+
+    async def ouvrir(self):
+        """Ouvre le pool (sans effet s'il est déjà ouvert)"""
+        if not self.__ouvert:
+            self.__ouvert = True
+            await self.__pool.open()
+
+    async def fermer(self):
+        """Ferme le pool"""
+        if self.__ouvert:
+            self.__ouvert = False
+            await self.__pool.close()
+
+    @property
+    def connection(self):
+        """Connexion empruntée au pool, à utiliser dans un bloc ``async with``
+
+        La transaction est validée à la sortie du bloc (annulée en cas d'exception).
+        """
+        return _ConnexionAsyncEmpruntee(self, self.__pool)
+
+
+class _ConnexionAsyncEmpruntee:
+    """Ouvre le pool si besoin puis délègue à AsyncConnectionPool.connection()"""
+
+    def __init__(self, db_connection: DBConnectionAsync, pool: AsyncConnectionPool):
+        self.__db_connection = db_connection
+        self.__pool = pool
+        self.__contexte = None
+
+    async def __aenter__(self):
+        await self.__db_connection.ouvrir()
+        self.__contexte = self.__pool.connection()
+        return await self.__contexte.__aenter__()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return await self.__contexte.__aexit__(exc_type, exc_value, traceback)
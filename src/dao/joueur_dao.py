@@ -2,6 +2,7 @@ import logging
 
 from src.utils.singleton import Singleton
 from src.utils.log_decorator import log
+from src.utils.cache import invalide_cache
 
 from src.dao.db_connection import DBConnection
 
@@ -13,6 +14,7 @@ class JoueurDao(metaclass=Singleton):
     """Classe contenant les méthodes pour accéder aux Joueurs de la base de données"""
 
     @log
+    @invalide_cache("joueur")
     def creer(self, joueur) -> bool:
         """Creation d'un joueur dans la base de données
 
@@ -140,6 +142,7 @@ class JoueurDao(metaclass=Singleton):
         return liste_joueurs
 
     @log
+    @invalide_cache("joueur")
     def modifier(self, joueur) -> bool:
         """Modification d'un joueur dans la base de données
 
@@ -184,6 +187,7 @@ class JoueurDao(metaclass=Singleton):
         return res == 1
 
     @log
+    @invalide_cache("joueur", "partie_joueur", "transaction", "stats_joueur")
     def supprimer(self, joueur) -> bool:
         """Suppression d'un joueur dans la base de données
 
@@ -259,6 +263,7 @@ class JoueurDao(metaclass=Singleton):
         return joueur
     
     @log
+    @invalide_cache("joueur")
     def modifier_credit(self, id_joueur, credit) -> bool:
         """Modifier uniquement le crédit d'un joueur.
 
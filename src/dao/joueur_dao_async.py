@@ -0,0 +1,53 @@
+import logging
+
+from src.utils.singleton import Singleton
+from src.utils.log_decorator import log
+
+from src.dao.db_connection_async import DBConnectionAsync
+
+from src.business_object.joueur import Joueur
+
+
+class JoueurDaoAsync(metaclass=Singleton):
+    """Version asynchrone des méthodes de JoueurDao les plus sollicitées par l'API"""
+
+    @log
+    async def trouver_par_id(self, id_joueur) -> Joueur:
+        """Trouver un joueur grace à son id
+
+        Parameters
+        ----------
+        id_joueur : int
+            numéro id du joueur que l'on souhaite trouver
+
+        Returns
+        -------
+        joueur : Joueur
+            renvoie le joueur que l'on cherche par id
+        """
+        try:
+            async with DBConnectionAsync().connection as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(
+                        "SELECT *                           "
+                        "  FROM joueur                      "
+                        " WHERE id_joueur = %(id_joueur)s;  ",
+                        {"id_joueur": id_joueur},
+                    )
+                    res = await cursor.fetchone()
+        except Exception as e:
+            logging.info(e)
+            raise
+
+        joueur = None
+        if res:
+            joueur = Joueur(
+                pseudo=res["pseudo"],
+                age=res["age"],
+                mdp=res["mdp"],
+                mail=res["mail"],
+                credit=res["credit"],
+                id_joueur=res["id_joueur"],
+            )
+
+        return joueur
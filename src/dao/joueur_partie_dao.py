@@ -2,8 +2,10 @@ import logging
 
 from src.utils.singleton import Singleton
 from src.utils.log_decorator import log
+from src.utils.cache import invalide_cache
 
 from src.dao.db_connection import DBConnection
+from src.dao.notification_table import notifier_table
 
 from src.business_object.joueur import Joueur
 from src.business_object.liste_cartes import ListeCartes
@@ -11,7 +13,46 @@ from src.business_object.liste_cartes import ListeCartes
 
 class JoueurPartieDao(metaclass=Singleton):
     """Classe contenant les méthodes pour accéder aux Joueurs lors d'une partie dans la base de données"""
+
+    # Mise d'un joueur sur son crédit (voir miser_atomique) : débit du crédit s'il suffit, mise du tour,
+    # pot, transaction et mises cumulées ; une ligne (credit, mise_tour, pot, id_transaction) si la mise est faite
+    REQUETE_MISE = (
+        "WITH debit AS (                                                  "
+        "    UPDATE joueur SET credit = credit - %(montant)s               "
+        "     WHERE id_joueur = %(id_joueur)s                             "
+        "       AND credit >= %(montant)s                                 "
+        "       AND EXISTS (SELECT 1 FROM partie_joueur                   "
+        "                    WHERE id_table = %(id_table)s                "
+        "                      AND id_joueur = %(id_joueur)s)             "
+        "    RETURNING id_joueur, credit                                  "
+        "), mise AS (                                                     "
+        "    UPDATE partie_joueur pj SET mise_tour = pj.mise_tour + %(montant)s "
+        "      FROM debit                                                 "
+        "     WHERE pj.id_table = %(id_table)s                            "
+        "       AND pj.id_joueur = debit.id_joueur                        "
+        "    RETURNING pj.mise_tour                                       "
+        "), pot AS (                                                      "
+        "    UPDATE table_poker SET pot = pot + %(montant)s                "
+        "     WHERE id_table = %(id_table)s                               "
+        "       AND EXISTS (SELECT 1 FROM debit)                          "
+        "    RETURNING pot                                                "
+        "), journal AS (                                                  "
+        "    INSERT INTO transaction (id_joueur, solde, date)             "
+        "    SELECT id_joueur, -ROUND(%(montant)s), NOW() FROM debit     "
+        "    RETURNING id_transaction                                     "
+        "), stats AS (                                                    "
+        "    INSERT INTO stats_joueur AS s (id_joueur, total_gains, total_mises) "
+        "    SELECT id_joueur, -%(montant)s, %(montant)s FROM debit       "
+        "    ON CONFLICT (id_joueur) DO UPDATE                            "
+        "       SET total_gains = s.total_gains - %(montant)s,            "
+        "           total_mises = s.total_mises + %(montant)s             "
+        ")                                                                "
+        "SELECT debit.credit, mise.mise_tour, pot.pot, journal.id_transaction "
+        "  FROM debit, mise, pot, journal;                                "
+    )
+
     @log
+    @invalide_cache("partie_joueur")
     def creer(self, joueur_partie, id_table) -> bool:
         """Creation d'un joueur_partie dans la base de données
 
@@ -48,6 +89,7 @@ class JoueurPartieDao(metaclass=Singleton):
                         },
                     )
                     res = cursor.fetchone()
+                    notifier_table(cursor, id_table, "joueurs")
                 connection.commit() 
         except Exception as e:
             logging.exception("Erreur lors de la création du joueur_partie")
@@ -60,6 +102,7 @@ class JoueurPartieDao(metaclass=Singleton):
         return created
 
     @log
+    @invalide_cache("partie_joueur")
     def supprimer(self, id_joueur) -> bool:
         """Suppression d'un joueur dans la table partie_joueur
 
@@ -79,10 +122,13 @@ class JoueurPartieDao(metaclass=Singleton):
                     # Supprimer le compte d'un joueur
                     cursor.execute(
                         "DELETE FROM partie_joueur                  "
-                        " WHERE id_joueur=%(id_joueur)s      ",
+                        " WHERE id_joueur=%(id_joueur)s      "
+                        "RETURNING id_table;                 ",
                         {"id_joueur": id_joueur},
                     )
                     res = cursor.rowcount
+                    for ligne in cursor.fetchall():
+                        notifier_table(cursor, ligne["id_table"], "joueurs")
         except Exception as e:
             logging.info(e)
             raise
@@ -91,6 +137,7 @@ class JoueurPartieDao(metaclass=Singleton):
     
     
     @log
+    @invalide_cache("partie_joueur")
     def modifier(self, joueur_partie, id_table) -> bool:
         """Modification d'un joueur partie dans la base de données
 
@@ -127,6 +174,7 @@ class JoueurPartieDao(metaclass=Singleton):
                         },
                     )
                     res = cursor.rowcount
+                    notifier_table(cursor, id_table, "statut")
         except Exception as e:
             logging.info(e)
 
@@ -182,13 +230,13 @@ class JoueurPartieDao(metaclass=Singleton):
             return ListeCartes([])
 
         if res and res["cartes_main"]:
-            return ListeCartes.str_to_cartes(res["cartes_main"])
+            return ListeCartes.bytes_to_cartes(res["cartes_main"])
         return ListeCartes([]) 
     
     @log
     def donner_cartes_main_joueur(self, id_table: int, id_joueur: int, main: ListeCartes) -> bool:
         """Attribue une main de cartes à un joueur dans une partie précise"""
-        cartes_str = ListeCartes.cartes_to_str(main)
+        cartes_octets = ListeCartes.cartes_to_bytes(main)
         try:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
@@ -196,9 +244,10 @@ class JoueurPartieDao(metaclass=Singleton):
                         "UPDATE partie_joueur "
                         "SET cartes_main=%(cartes_main)s "
                         "WHERE id_table=%(id_table)s AND id_joueur=%(id_joueur)s;",
-                        {"cartes_main": cartes_str, "id_table": id_table, "id_joueur": id_joueur},
+                        {"cartes_main": cartes_octets, "id_table": id_table, "id_joueur": id_joueur},
                     )
                     res = cursor.rowcount
+                    notifier_table(cursor, id_table, "cartes_main")
                 connection.commit()
         except Exception as e:
             logging.exception("Erreur lors de l'attribution des cartes au joueur")
@@ -207,6 +256,7 @@ class JoueurPartieDao(metaclass=Singleton):
         return res == 1
     
     @log
+    @invalide_cache("partie_joueur")
     def modifier_statut(self, id_joueur: int, id_table: int, statut: str) -> bool:
         """Met à jour le statut d'un joueur pour une table donnée.
 
@@ -234,6 +284,7 @@ class JoueurPartieDao(metaclass=Singleton):
                         {"statut": statut, "id_joueur": id_joueur, "id_table": id_table},
                     )
                     res = cursor.rowcount
+                    notifier_table(cursor, id_table, "statut")
                 connection.commit()
         except Exception as e:
             logging.exception("Erreur lors de la mise à jour du statut du joueur %s à la table %s", id_joueur, id_table)
@@ -271,4 +322,178 @@ class JoueurPartieDao(metaclass=Singleton):
 
         return res["statut"] if res else None
 
+    @log
+    def recuperer_statuts(self, id_table: int) -> dict:
+        """Récupère en une seule requête le statut de tous les joueurs d'une table.
+
+        Parameters
+        ----------
+        id_table : int
+            Identifiant de la table.
+
+        Returns
+        -------
+        statuts : dict[int, str]
+            Dictionnaire clé : id joueur, valeur : statut. Vide si la table n'a pas de joueur
+            ou en cas d'erreur.
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT id_joueur, statut FROM partie_joueur "
+                        "WHERE id_table = %(id_table)s;",
+                        {"id_table": id_table},
+                    )
+                    res = cursor.fetchall()
+        except Exception as e:
+            logging.exception("Erreur lors de la récupération des statuts des joueurs de la table %s", id_table)
+            return {}
+
+        return {row["id_joueur"]: row["statut"] for row in res}
+
+    @log
+    @invalide_cache("joueur", "partie_joueur", "transaction", "stats_joueur")
+    def miser_atomique(self, id_joueur: int, id_table: int, montant: float) -> dict:
+        """Mise d'un joueur en une seule requête : débit du crédit, pot, mise du tour, transaction
+        et mises cumulées du joueur (stats_joueur).
+
+        Le crédit n'est débité que s'il suffit (le test et le débit se font dans la même
+        instruction, sans lecture préalable) ; sinon rien n'est modifié.
+
+        Parameters
+        ----------
+        id_joueur : int
+            Identifiant du joueur.
+        id_table : int
+            Identifiant de la table à laquelle le joueur est assis.
+        montant : float
+            Montant misé.
+
+        Returns
+        -------
+        soldes : dict
+            Nouvelles valeurs {"credit", "mise_tour", "pot", "id_transaction"} ;
+            None si le crédit est insuffisant, si le joueur n'est pas à la table ou en cas d'erreur.
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        self.REQUETE_MISE,
+                        {"id_joueur": id_joueur, "id_table": id_table, "montant": montant},
+                    )
+                    res = cursor.fetchone()
+                    if res:
+                        notifier_table(cursor, id_table, "pot")
+        except Exception as e:
+            logging.exception("Erreur lors de la mise du joueur %s à la table %s", id_joueur, id_table)
+            return None
+
+        if not res:
+            return None
+        return {
+            "credit": float(res["credit"]),
+            "mise_tour": res["mise_tour"],
+            "pot": float(res["pot"]),
+            "id_transaction": res["id_transaction"],
+        }
+
+    @log
+    @invalide_cache("joueur", "partie_joueur")
+    def acheter_tapis(self, id_joueur: int, id_table: int, tapis: float) -> float:
+        """Assoit un joueur à une table avec un tapis pris sur son crédit, en une seule requête
+
+        Le crédit n'est débité que s'il suffit et si le joueur n'est pas déjà assis à la table ;
+        la place (partie_joueur) est créée dans la même instruction, avec le tapis pour solde.
+
+        Parameters
+        ----------
+        id_joueur : int
+            Identifiant du joueur.
+        id_table : int
+            Identifiant de la table.
+        tapis : float
+            Montant apporté à la table.
+
+        Returns
+        -------
+        credit : float
+            Nouveau crédit du joueur ; None si le crédit est insuffisant, si le joueur est
+            déjà assis à la table ou en cas d'erreur.
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "WITH debit AS (                                                  "
+                        "    UPDATE joueur SET credit = credit - %(tapis)s                 "
+                        "     WHERE id_joueur = %(id_joueur)s                             "
+                        "       AND credit >= %(tapis)s                                   "
+                        "       AND NOT EXISTS (SELECT 1 FROM partie_joueur               "
+                        "                        WHERE id_table = %(id_table)s            "
+                        "                          AND id_joueur = %(id_joueur)s)         "
+                        "    RETURNING id_joueur, credit                                  "
+                        "), place AS (                                                    "
+                        "    INSERT INTO partie_joueur (id_table, id_joueur, solde_partie) "
+                        "    SELECT %(id_table)s, id_joueur, %(tapis)s FROM debit         "
+                        "    RETURNING id_joueur                                          "
+                        ")                                                                "
+                        "SELECT debit.credit FROM debit, place;                           ",
+                        {"id_joueur": id_joueur, "id_table": id_table, "tapis": tapis},
+                    )
+                    res = cursor.fetchone()
+                    if res:
+                        notifier_table(cursor, id_table, "joueurs")
+        except Exception as e:
+            logging.exception("Erreur lors de l'achat du tapis du joueur %s à la table %s", id_joueur, id_table)
+            return None
+
+        return float(res["credit"]) if res else None
+
+    @log
+    @invalide_cache("joueur", "partie_joueur")
+    def rendre_tapis(self, id_joueur: int, id_table: int, tapis: float = None) -> float:
+        """Lève un joueur d'une table et recrédite son tapis, en une seule requête
+
+        Parameters
+        ----------
+        id_joueur : int
+            Identifiant du joueur.
+        id_table : int
+            Identifiant de la table.
+        tapis : float, optional
+            Tapis du joueur au moment où il quitte la table. Si None (table qui n'est plus
+            ouverte dans un processus de tables), le solde de la place en base est recrédité.
+
+        Returns
+        -------
+        credit : float
+            Nouveau crédit du joueur ; None si le joueur n'est pas assis à la table
+            ou en cas d'erreur.
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "WITH place AS (                                                  "
+                        "    DELETE FROM partie_joueur                                    "
+                        "     WHERE id_table = %(id_table)s                               "
+                        "       AND id_joueur = %(id_joueur)s                             "
+                        "    RETURNING id_joueur, solde_partie                            "
+                        ")                                                                "
+                        "UPDATE joueur j                                                  "
+                        "   SET credit = j.credit + COALESCE(%(tapis)s, place.solde_partie) "
+                        "  FROM place                                                     "
+                        " WHERE j.id_joueur = place.id_joueur                             "
+                        "RETURNING j.credit;                                              ",
+                        {"id_joueur": id_joueur, "id_table": id_table, "tapis": tapis},
+                    )
+                    res = cursor.fetchone()
+                    if res:
+                        notifier_table(cursor, id_table, "joueurs")
+        except Exception as e:
+            logging.exception("Erreur lors du retour du tapis du joueur %s à la table %s", id_joueur, id_table)
+            return None
 
+        return float(res["credit"]) if res else None
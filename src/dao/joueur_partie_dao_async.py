@@ -0,0 +1,54 @@
+import logging
+
+from src.utils.singleton import Singleton
+from src.utils.log_decorator import log
+from src.utils.cache import invalide_cache
+
+from src.dao.db_connection_async import DBConnectionAsync
+from src.dao.joueur_partie_dao import JoueurPartieDao
+from src.dao.notification_table import canal_table
+
+
+class JoueurPartieDaoAsync(metaclass=Singleton):
+    """Version asynchrone des méthodes de JoueurPartieDao les plus sollicitées par l'API"""
+
+    @log
+    @invalide_cache("joueur", "partie_joueur", "transaction", "stats_joueur")
+    async def miser(self, id_joueur: int, montant: float, id_table: int) -> bool:
+        """Mise d'un joueur sur son crédit, en une seule requête
+
+        Même requête que JoueurPartieDao.miser_atomique : débit du crédit (s'il suffit),
+        mise du tour, pot de la table, transaction et mises cumulées du joueur.
+
+        Parameters
+        ----------
+        id_joueur : int
+            L'identifiant du joueur.
+        montant : float
+            Le montant à miser.
+        id_table : int
+            La table de la partie : seule la place du joueur à cette table est modifiée.
+
+        Returns
+        -------
+        success : bool
+            True si la mise a été enregistrée
+            False si le crédit est insuffisant, si le joueur n'est pas à la table ou en cas d'erreur
+        """
+        try:
+            async with DBConnectionAsync().connection as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(
+                        JoueurPartieDao.REQUETE_MISE,
+                        {"id_joueur": id_joueur, "id_table": id_table, "montant": montant},
+                    )
+                    res = await cursor.fetchone()
+                    if res:
+                        await cursor.execute(
+                            "SELECT pg_notify(%(canal)s, 'pot');", {"canal": canal_table(id_table)}
+                        )
+        except Exception as e:
+            logging.exception("Erreur lors de la mise du joueur %s à la table %s", id_joueur, id_table)
+            return False
+
+        return res is not None
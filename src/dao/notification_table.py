@@ -0,0 +1,217 @@
+"""Événements de table diffusés par PostgreSQL (LISTEN / NOTIFY).
+
+Chaque écriture des DAO sur une table de jeu émet, dans la même transaction, une notification
+sur le canal ``table_<id_table>`` dont le contenu est le nom de l'événement (EVENEMENTS).
+PostgreSQL ne délivre la notification qu'à la validation de la transaction : un client réveillé
+relit donc toujours un état à jour.
+
+Un client qui attend un changement (son tour, la distribution, ...) s'abonne au canal de la table
+avec AbonnementTable et bloque sur select() au lieu de relire la base toutes les quelques secondes.
+Côté API, EcouteTablesAsync écoute les canaux de plusieurs tables sur une seule connexion asynchrone.
+
+Un événement peut porter des données : le contenu est alors ``<evenement> <données JSON>``.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import time
+
+from src.dao.db_connection import DBConnection
+from src.dao.db_connection_async import DBConnectionAsync
+
+EVENEMENTS = (
+    "joueurs",  # arrivée ou départ d'un joueur
+    "tour",  # changement du joueur dont c'est le tour
+    "bouton",  # changement du bouton
+    "cartes",  # cartes communes distribuées
+    "cartes_main",  # main distribuée à un joueur
+    "pot",  # pot alimenté ou vidé
+    "mise",  # nouvelle mise
+    "statut",  # statut d'un joueur modifié
+    "resultat",  # résultat d'une main (données : gagnants, combinaison, pot)
+)
+
+# Attente maximale par défaut : filet de sécurité si une notification était perdue
+DELAI_ATTENTE = 30.0
+
+# Durée d'une fenêtre d'écoute de EcouteTablesAsync : délai maximal de prise en compte d'un nouveau canal
+DELAI_ECOUTE = 0.2
+
+
+def canal_table(id_table: int) -> str:
+    """Nom du canal de notification d'une table"""
+    return f"table_{int(id_table)}"
+
+
+def id_table_du_canal(canal: str) -> int:
+    """Identifiant de la table d'un canal de notification"""
+    return int(canal.removeprefix("table_"))
+
+
+def lire_evenement(contenu: str) -> tuple:
+    """Décode le contenu d'une notification en (evenement, données ou None)"""
+    evenement, _, donnees = contenu.partition(" ")
+    return evenement, json.loads(donnees) if donnees else None
+
+
+def notifier_table(cursor, id_table: int, evenement: str, donnees: dict = None):
+    """Émet un événement sur le canal de la table, dans la transaction du curseur
+
+    Parameters
+    ----------
+    cursor : curseur psycopg2
+        Curseur de la transaction qui a modifié la table.
+    id_table : int
+        Identifiant de la table.
+    evenement : str
+        Nom de l'événement (voir EVENEMENTS).
+    donnees : dict, optional
+        Données jointes à l'événement, sérialisées en JSON (moins de 8000 octets).
+    """
+    if id_table is None:
+        return
+    contenu = evenement if donnees is None else f"{evenement} {json.dumps(donnees)}"
+    cursor.execute(
+        "SELECT pg_notify(%(canal)s, %(contenu)s);",
+        {"canal": canal_table(id_table), "contenu": contenu},
+    )
+
+
+class AbonnementTable:
+    """
+    Abonnement aux événements d'une table
+
+    Ouvre une connexion dédiée (hors pool, elle reste occupée pendant toute la partie)
+    et écoute le canal de la table. S'utilise dans un bloc with ou en appelant fermer().
+
+    Exemple
+    -------
+    >>> with AbonnementTable(id_table) as abonnement:
+    ...     while etat.id_joueur_tour != id_joueur:
+    ...         abonnement.attendre({"tour"})
+    ...         etat = TableService().etat_table(id_table)
+    """
+
+    def __init__(self, id_table: int):
+        self.id_table = id_table
+        self.__connexion = DBConnection().nouvelle_connexion()
+        self.__connexion.autocommit = True
+        with self.__connexion.cursor() as cursor:
+            cursor.execute(f"LISTEN {canal_table(id_table)};")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.fermer()
+        return False
+
+    def attendre(self, evenements=None, delai: float = DELAI_ATTENTE) -> list[str]:
+        """Bloque jusqu'à la réception d'un événement de la table (ou l'expiration du délai)
+
+        Les événements reçus depuis le dernier appel sont consommés en premier : un événement
+        arrivé pendant que le client faisait autre chose n'est pas perdu.
+
+        Parameters
+        ----------
+        evenements : set[str], optional
+            Événements attendus ; tous les événements réveillent l'appelant si None.
+        delai : float
+            Attente maximale en secondes.
+
+        Returns
+        -------
+        recus : list[str]
+            Les événements attendus reçus, liste vide si le délai a expiré.
+        """
+        fin = time.monotonic() + delai
+        while True:
+            self.__connexion.poll()
+            recus = [lire_evenement(notification.payload)[0] for notification in self.__connexion.notifies]
+            self.__connexion.notifies.clear()
+            recus = [evenement for evenement in recus if evenements is None or evenement in evenements]
+            if recus:
+                return recus
+            restant = fin - time.monotonic()
+            if restant <= 0:
+                return []
+            select.select([self.__connexion], [], [], restant)
+
+    def fermer(self):
+        """Ferme la connexion d'écoute"""
+        if not self.__connexion.closed:
+            self.__connexion.close()
+
+
+class EcouteTablesAsync:
+    """
+    Écoute asynchrone des événements de plusieurs tables sur une seule connexion
+
+    Chaque notification reçue est transmise à rappel(id_table, evenement, donnees).
+    La connexion ne peut pas exécuter LISTEN pendant qu'elle attend des notifications :
+    l'attente se fait par fenêtres de DELAI_ECOUTE secondes, entre lesquelles les canaux
+    ajoutés ou retirés sont pris en compte. En cas de coupure, la connexion est rouverte.
+    """
+
+    def __init__(self, rappel):
+        self.__rappel = rappel
+        self.__voulues = set()
+        self.__ecoutees = set()
+        self.__pretes = {}
+        self.__tache = None
+
+    async def ecouter(self, id_table: int):
+        """Écoute les événements d'une table (retourne une fois le LISTEN exécuté)"""
+        self.__voulues.add(id_table)
+        pret = self.__pretes.setdefault(id_table, asyncio.Event())
+        if self.__tache is None or self.__tache.done():
+            self.__tache = asyncio.create_task(self.__boucle())
+        await pret.wait()
+
+    def arreter_ecoute(self, id_table: int):
+        """N'écoute plus les événements d'une table"""
+        self.__voulues.discard(id_table)
+        self.__pretes.pop(id_table, None)
+
+    async def fermer(self):
+        """Arrête l'écoute et ferme la connexion"""
+        self.__voulues.clear()
+        self.__pretes.clear()
+        if self.__tache is not None:
+            self.__tache.cancel()
+            try:
+                await self.__tache
+            except asyncio.CancelledError:
+                pass
+            self.__tache = None
+
+    async def __boucle(self):
+        """Maintient la connexion d'écoute et distribue les notifications"""
+        while self.__voulues:
+            try:
+                async with await DBConnectionAsync().nouvelle_connexion() as connexion:
+                    self.__ecoutees.clear()
+                    while self.__voulues or self.__ecoutees:
+                        await self.__synchroniser(connexion)
+                        async for notification in connexion.notifies(timeout=DELAI_ECOUTE):
+                            evenement, donnees = lire_evenement(notification.payload)
+                            self.__rappel(id_table_du_canal(notification.channel), evenement, donnees)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.exception("Erreur de la connexion d'écoute des tables")
+                await asyncio.sleep(1)
+
+    async def __synchroniser(self, connexion):
+        """Exécute les LISTEN / UNLISTEN des tables ajoutées ou retirées"""
+        for id_table in self.__voulues - self.__ecoutees:
+            await connexion.execute(f"LISTEN {canal_table(id_table)};")
+            self.__ecoutees.add(id_table)
+        for id_table in self.__ecoutees - self.__voulues:
+            await connexion.execute(f"UNLISTEN {canal_table(id_table)};")
+            self.__ecoutees.discard(id_table)
+        for id_table in self.__ecoutees:
+            if id_table in self.__pretes:
+                self.__pretes[id_table].set()
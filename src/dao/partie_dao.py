@@ -2,18 +2,24 @@ import logging
 from typing import List, Optional
 from datetime import datetime
 
+from psycopg2.extras import Json, execute_values
+
 from src.utils.singleton import Singleton
 from src.utils.log_decorator import log
+from src.utils.cache import invalide_cache
 from src.dao.db_connection import DBConnection
+from src.dao.statistiques_dao import StatistiquesDao
 from src.business_object.partie import Partie
 from src.business_object.joueur_partie import JoueurPartie
 from src.business_object.pot import Pot
+from src.business_object.liste_cartes import ListeCartes
 
 
 class PartieDao(metaclass=Singleton):
     """Classe contenant les méthodes pour accéder aux Parties de la base de données"""
 
     @log
+    @invalide_cache("partie")
     def creer(self, partie: Partie) -> bool:
         """Création d'une partie dans la base de données
 
@@ -31,17 +37,13 @@ class PartieDao(metaclass=Singleton):
         try:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
-                    # Si id_partie est None, générer un nouvel ID
-                    if partie.id_partie is None:
-                        # Trouver le prochain ID disponible
-                        cursor.execute("SELECT COALESCE(MAX(id_partie), 0) + 1 AS next_id FROM partie;")
-                        next_id_row = cursor.fetchone()
-                        partie.id_partie = next_id_row["next_id"]
-
+                    # Sans identifiant, la base en attribue un (colonne identité)
+                    colonne_id = "" if partie.id_partie is None else "id_partie, "
+                    valeur_id = "" if partie.id_partie is None else "%(id_partie)s, "
                     cursor.execute(
-                        "INSERT INTO partie (id_partie, id_table, pot, date_debut) "
-                        "VALUES (%(id_partie)s, %(id_table)s, %(pot)s, %(date_debut)s) "
-                        "RETURNING id_partie;",
+                        f"INSERT INTO partie ({colonne_id}id_table, pot, date_debut) "
+                        f"VALUES ({valeur_id}%(id_table)s, %(pot)s, %(date_debut)s) "
+                        "RETURNING id_partie, id_table, pot, date_debut;",
                         {
                             "id_partie": partie.id_partie,
                             "id_table": partie.id_table,
@@ -52,6 +54,8 @@ class PartieDao(metaclass=Singleton):
                     res = cursor.fetchone()
                     if res:
                         partie.id_partie = res["id_partie"]
+                        StatistiquesDao.cumuler_activite(cursor, [(res["id_table"], res["pot"], res["date_debut"], None)])
+                        StatistiquesDao.cumuler_quantiles(cursor, "pot", [(res["id_table"], res["pot"])])
                 connection.commit()
         except Exception as e:
             logging.exception("Erreur lors de la création de la partie")
@@ -59,6 +63,61 @@ class PartieDao(metaclass=Singleton):
 
         return res is not None
 
+    @log
+    @invalide_cache("partie")
+    def creer_lot(self, parties: List[Partie]) -> bool:
+        """Création de plusieurs parties en une seule requête (archivage des mains)
+
+        Les identifiants attribués par la base sont reportés dans les parties.
+
+        Parameters
+        ----------
+        parties : list[Partie]
+            Parties à créer (leur id_partie est ignoré)
+
+        Returns
+        -------
+        created : bool
+            True si toutes les parties ont été créées
+            False sinon
+        """
+        if not parties:
+            return True
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    # identifiants tirés dans la séquence avec le rang de chaque partie : l'ordre des
+                    # lignes rendues par INSERT ... RETURNING n'est pas garanti
+                    res = execute_values(
+                        cursor,
+                        "WITH v AS (                                                      "
+                        "    SELECT ordre, nextval(pg_get_serial_sequence('partie', 'id_partie')) AS id_partie, "
+                        "           id_table, pot::DECIMAL(12, 2) AS pot, date_debut::TIMESTAMP AS date_debut "
+                        "      FROM (VALUES %s) AS v(ordre, id_table, pot, date_debut)    "
+                        "), ins AS (                                                      "
+                        "    INSERT INTO partie (id_partie, id_table, pot, date_debut)    "
+                        "    SELECT id_partie, id_table, pot, date_debut FROM v           "
+                        ")                                                                "
+                        "SELECT ordre, id_partie, id_table, pot, date_debut FROM v;       ",
+                        [
+                            (ordre, partie.id_table, partie.pot.get_montant(), partie.date_debut)
+                            for ordre, partie in enumerate(parties)
+                        ],
+                        page_size=len(parties),
+                        fetch=True,
+                    )
+                    StatistiquesDao.cumuler_activite(
+                        cursor, [(ligne["id_table"], ligne["pot"], ligne["date_debut"], None) for ligne in res]
+                    )
+                    StatistiquesDao.cumuler_quantiles(cursor, "pot", [(ligne["id_table"], ligne["pot"]) for ligne in res])
+        except Exception as e:
+            logging.exception("Erreur lors de la création d'un lot de %s parties", len(parties))
+            return False
+
+        for ligne in res:
+            parties[ligne["ordre"]].id_partie = ligne["id_partie"]
+        return len(res) == len(parties)
+
     @log
     def trouver_par_id(self, id_partie: int) -> Optional[Partie]:
         """Trouver une partie grâce à son id
@@ -106,6 +165,7 @@ class PartieDao(metaclass=Singleton):
         return partie
 
     @log
+    @invalide_cache("partie")
     def modifier(self, partie: Partie) -> bool:
         """Modification d'une partie dans la base de données
 
@@ -145,6 +205,7 @@ class PartieDao(metaclass=Singleton):
         return res == 1
 
     @log
+    @invalide_cache("partie")
     def supprimer(self, id_partie: int) -> bool:
         """Suppression d'une partie dans la base de données
 
@@ -342,4 +403,86 @@ class PartieDao(metaclass=Singleton):
             )
             liste_parties.append(partie)
 
-        return liste_parties
\ No newline at end of file
+        return liste_parties
+
+    @log
+    @invalide_cache("partie", "partie_joueur", "stats_joueur")
+    def enregistrer_main(self, resume) -> Optional[int]:
+        """Enregistre une main jouée par le moteur de table, en une seule transaction
+
+        Crée la partie, son résumé (main_jouee), reporte les soldes finaux des joueurs
+        dans partie_joueur et cumule la main dans leurs statistiques (stats_joueur), dans
+        les séries d'activité (activite_periode) et dans les sketchs de quantiles des pots
+        et des mises (sketch_quantiles).
+
+        Parameters
+        ----------
+        resume : ResumeMain
+            Résumé de la main (voir MoteurTable)
+
+        Returns
+        -------
+        id_partie : int
+            Identifiant de la partie créée, None en cas d'échec
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "INSERT INTO partie (id_table, pot, date_debut) "
+                        "VALUES (%(id_table)s, %(pot)s, %(date_debut)s) "
+                        "RETURNING id_partie;",
+                        {
+                            "id_table": resume.id_table,
+                            "pot": resume.pot,
+                            "date_debut": resume.date_debut,
+                        },
+                    )
+                    id_partie = cursor.fetchone()["id_partie"]
+                    cursor.execute(
+                        "INSERT INTO main_jouee (id_partie, id_table, numero, board, mains, actions, gains) "
+                        "VALUES (%(id_partie)s, %(id_table)s, %(numero)s, %(board)s, %(mains)s, %(actions)s, %(gains)s);",
+                        {
+                            "id_partie": id_partie,
+                            "id_table": resume.id_table,
+                            "numero": resume.numero,
+                            "board": ListeCartes.cartes_to_bytes(ListeCartes(list(resume.board))),
+                            "mains": Json({str(j): [c.code for c in cartes] for j, cartes in resume.mains.items()}),
+                            "actions": Json([list(action) for action in resume.actions]),
+                            "gains": Json({str(j): gain for j, gain in resume.gains.items()}),
+                        },
+                    )
+                    if resume.soldes:
+                        execute_values(
+                            cursor,
+                            "UPDATE partie_joueur AS pj                        "
+                            "   SET solde_partie = v.solde, mise_tour = 0      "
+                            "  FROM (VALUES %s) AS v(id_table, id_joueur, solde) "
+                            " WHERE pj.id_table = v.id_table                   "
+                            "   AND pj.id_joueur = v.id_joueur;                ",
+                            [(resume.id_table, j, solde) for j, solde in resume.soldes.items()],
+                        )
+                    StatistiquesDao.cumuler_activite(
+                        cursor, [(resume.id_table, resume.pot, resume.date_debut, list(resume.mains))]
+                    )
+                    StatistiquesDao.cumuler_quantiles(cursor, "pot", [(resume.id_table, resume.pot)])
+                    StatistiquesDao.cumuler_quantiles(
+                        cursor, "mise", [(resume.id_table, mise) for mise in resume.contributions.values() if mise > 0]
+                    )
+                    gagnants = resume.gagnants
+                    StatistiquesDao.cumuler(cursor, [
+                        (
+                            id_joueur,
+                            1,
+                            1 if id_joueur in gagnants else 0,
+                            round(resume.gains.get(id_joueur, 0) - resume.contributions.get(id_joueur, 0), 2),
+                            resume.contributions.get(id_joueur, 0),
+                            resume.date_debut,
+                        )
+                        for id_joueur in resume.mains
+                    ])
+        except Exception as e:
+            logging.exception("Erreur lors de l'enregistrement de la main")
+            return None
+
+        return id_partie
@@ -5,19 +5,433 @@ Ce module fournit des méthodes pour extraire des statistiques descriptives
 individuelles et collectives sur les joueurs et les parties.
 """
 
+import contextvars
+import threading
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from psycopg2.extras import execute_values
+
 from src.dao.db_connection import DBConnection
 from src.utils.singleton import Singleton
 from src.utils.log_decorator import log
+from src.utils.cache import cache_resultat, invalide_cache, signaler_echec
+from src.utils.sketch_quantiles import SketchKLL
+
+
+# Threads de calcul des sections du rapport, partagés par tous les rapports (voir _executeur_rapport)
+_executeur = None
+_verrou_executeur = threading.Lock()
+
+
+def _executeur_rapport(nb_sections: int) -> ThreadPoolExecutor:
+    """Pool de threads des sections du rapport, créé une fois
+
+    Il a au plus la moitié des connexions du pool (DBConnection) : des rapports simultanés
+    attendent un thread libre au lieu d'emprunter toutes les connexions des autres DAO.
+    """
+    global _executeur
+    with _verrou_executeur:
+        if _executeur is None:
+            nb_threads = max(1, min(nb_sections, DBConnection().taille_max // 2))
+            _executeur = ThreadPoolExecutor(max_workers=nb_threads, thread_name_prefix="rapport")
+        return _executeur
 
 
 class StatistiquesDao(metaclass=Singleton):
-    """Classe DAO pour gérer les statistiques du jeu de poker."""
+    """Classe DAO pour gérer les statistiques du jeu de poker.
+
+    Les statistiques individuelles (fiche joueur, classements, joueurs les plus actifs)
+    sont lues dans la table stats_joueur, cumulée à la fin de chaque main par les DAO
+    qui enregistrent la main (voir cumuler) et reconstructible depuis l'historique
+    (voir reconstruire_stats_joueur, exacte pour les mains du moteur de table seulement).
+
+    Les lectures sont gardées en cache (voir src.utils.cache), invalidé par les DAO
+    qui écrivent dans les tables lues.
+    """
+
+    # Sections du rapport complet : nom -> (méthode, arguments)
+    SECTIONS_RAPPORT = {
+        "stats_globales": ("obtenir_stats_globales", {}),
+        "stats_parties": ("obtenir_stats_parties", {}),
+        "stats_mises": ("obtenir_stats_mises", {}),
+        "top_10_joueurs": ("obtenir_classement_joueurs", {"limite": 10}),
+        "joueurs_actifs": ("obtenir_joueurs_plus_actifs", {"limite": 10}),
+        "distribution_age": ("obtenir_distribution_age", {}),
+        "taux_abandon": ("obtenir_taux_abandon", {}),
+        "stats_tables": ("obtenir_stats_tables", {}),
+    }
+
+    # Ajout de (id_joueur, nb_parties, nb_victoires, total_gains, total_mises, derniere_partie)
+    # aux statistiques cumulées
+    REQUETE_CUMUL = (
+        "INSERT INTO stats_joueur AS s                                             "
+        "       (id_joueur, nb_parties, nb_victoires, total_gains, total_mises, derniere_partie) "
+        "VALUES %s                                                                 "
+        "ON CONFLICT (id_joueur) DO UPDATE                                         "
+        "   SET nb_parties = s.nb_parties + EXCLUDED.nb_parties,                   "
+        "       nb_victoires = s.nb_victoires + EXCLUDED.nb_victoires,             "
+        "       total_gains = s.total_gains + EXCLUDED.total_gains,                "
+        "       total_mises = s.total_mises + EXCLUDED.total_mises,                "
+        "       derniere_partie = GREATEST(s.derniere_partie, EXCLUDED.derniere_partie);"
+    )
+
+    # Granularités tenues dans activite_periode : nom -> unité de DATE_TRUNC
+    GRANULARITES = {"heure": "hour", "jour": "day", "mois": "month"}
+
+    # Ajout de mains (id_table, pot, date_debut, joueurs) aux séries d'activité : chaque main
+    # compte dans son heure, son jour et son mois ; les joueurs et la table ne sont comptés
+    # qu'à leur première apparition dans la période. Sans liste de joueurs (NULL), ce sont
+    # les joueurs assis à la table.
+    REQUETE_ACTIVITE = (
+        "WITH mains (id_table, pot, date_debut, joueurs) AS (VALUES %s),           "
+        "periodes AS (                                                               "
+        "    SELECT g.granularite, DATE_TRUNC(g.unite, m.date_debut) AS debut,       "
+        "           m.id_table, m.pot,                                               "
+        "           COALESCE(m.joueurs, ARRAY(SELECT pj.id_joueur FROM partie_joueur pj "
+        "                                     WHERE pj.id_table = m.id_table)) AS joueurs "
+        "    FROM mains m                                                            "
+        "    CROSS JOIN (VALUES ('heure', 'hour'), ('jour', 'day'), ('mois', 'month')) "
+        "         AS g (granularite, unite)                                          "
+        "    WHERE m.date_debut IS NOT NULL                                          "
+        "), nouveaux_joueurs AS (                                                    "
+        "    INSERT INTO activite_joueur (granularite, debut, id_joueur)             "
+        "    SELECT DISTINCT p.granularite, p.debut, j.id_joueur                     "
+        "    FROM periodes p CROSS JOIN UNNEST(p.joueurs) AS j (id_joueur)           "
+        "    ON CONFLICT DO NOTHING                                                  "
+        "    RETURNING granularite, debut                                            "
+        "), nouvelles_tables AS (                                                    "
+        "    INSERT INTO activite_table (granularite, debut, id_table)               "
+        "    SELECT DISTINCT granularite, debut, id_table FROM periodes              "
+        "    ON CONFLICT DO NOTHING                                                  "
+        "    RETURNING granularite, debut                                            "
+        ")                                                                           "
+        "INSERT INTO activite_periode AS a                                           "
+        "       (granularite, debut, nb_parties, pot_total, nb_joueurs, nb_tables)   "
+        "SELECT p.granularite, p.debut, COUNT(*), SUM(p.pot),                        "
+        "       (SELECT COUNT(*) FROM nouveaux_joueurs n                             "
+        "         WHERE n.granularite = p.granularite AND n.debut = p.debut),        "
+        "       (SELECT COUNT(*) FROM nouvelles_tables t                             "
+        "         WHERE t.granularite = p.granularite AND t.debut = p.debut)         "
+        "FROM periodes p                                                             "
+        "GROUP BY p.granularite, p.debut                                             "
+        "ON CONFLICT (granularite, debut) DO UPDATE                                  "
+        "   SET nb_parties = a.nb_parties + EXCLUDED.nb_parties,                     "
+        "       pot_total = a.pot_total + EXCLUDED.pot_total,                        "
+        "       nb_joueurs = a.nb_joueurs + EXCLUDED.nb_joueurs,                     "
+        "       nb_tables = a.nb_tables + EXCLUDED.nb_tables;                        "
+    )
+
+    @staticmethod
+    def cumuler_activite(cursor, mains: list):
+        """Ajoute des mains aux séries d'activité par période, dans la transaction du curseur
+
+        Parameters
+        ----------
+        cursor : curseur psycopg2
+            Curseur de la transaction qui crée les mains (parties).
+        mains : list[tuple]
+            (id_table, pot, date_debut, joueurs) par main ; joueurs est la liste des
+            identifiants des joueurs de la main, ou None pour les joueurs assis à la table.
+        """
+        if mains:
+            execute_values(
+                cursor,
+                StatistiquesDao.REQUETE_ACTIVITE,
+                mains,
+                template="(%s::INT, %s::NUMERIC, %s::TIMESTAMP, %s::INT[])",
+            )
+
+    # Quantiles lus dans les sketchs des pots et des mises : nom -> q
+    QUANTILES = {"mediane": 0.5, "p90": 0.9, "p99": 0.99}
+
+    # id_table de la ligne de sketch_quantiles qui résume toutes les tables
+    ID_TABLE_GLOBALE = 0
+
+    @staticmethod
+    def cumuler_quantiles(cursor, mesure: str, valeurs: list):
+        """Ajoute des valeurs aux sketchs de quantiles de leur table, dans la transaction du curseur
+
+        Les valeurs sont aussi ajoutées au sketch global (id_table ID_TABLE_GLOBALE), lu en
+        temps constant par obtenir_quantiles. Les sketchs concernés sont verrouillés dans
+        l'ordre des tables, le sketch global en premier, le temps de la transaction.
+
+        Parameters
+        ----------
+        cursor : curseur psycopg2
+            Curseur de la transaction qui termine la main.
+        mesure : str
+            'pot' ou 'mise'.
+        valeurs : list[tuple]
+            (id_table, valeur) ; les valeurs None sont ignorées.
+        """
+        par_table = {}
+        for id_table, valeur in valeurs:
+            if valeur is not None:
+                par_table.setdefault(id_table, []).append(valeur)
+        if not par_table:
+            return
+        par_table[StatistiquesDao.ID_TABLE_GLOBALE] = [v for valeurs in par_table.values() for v in valeurs]
+        tables = sorted(par_table)
+        execute_values(
+            cursor,
+            "INSERT INTO sketch_quantiles (mesure, id_table, sketch) VALUES %s ON CONFLICT DO NOTHING;",
+            [(mesure, id_table, b"") for id_table in tables],
+        )
+        cursor.execute(
+            "SELECT id_table, sketch FROM sketch_quantiles                         "
+            " WHERE mesure = %(mesure)s AND id_table = ANY(%(tables)s)             "
+            " ORDER BY id_table                                                    "
+            "   FOR UPDATE;                                                        ",
+            {"mesure": mesure, "tables": tables},
+        )
+        lignes = []
+        for ligne in cursor.fetchall():
+            sketch = SketchKLL.depuis_bytes(bytes(ligne["sketch"]))
+            for valeur in par_table[ligne["id_table"]]:
+                sketch.ajouter(valeur)
+            lignes.append((mesure, ligne["id_table"], sketch.en_bytes()))
+        execute_values(
+            cursor,
+            "UPDATE sketch_quantiles AS s SET sketch = v.sketch                    "
+            "  FROM (VALUES %s) AS v (mesure, id_table, sketch)                    "
+            " WHERE s.mesure = v.mesure AND s.id_table = v.id_table;               ",
+            lignes,
+        )
+
+    @staticmethod
+    def cumuler(cursor, lignes: list):
+        """Ajoute les résultats d'une main aux statistiques cumulées, dans la transaction du curseur
+
+        Parameters
+        ----------
+        cursor : curseur psycopg2
+            Curseur de la transaction qui enregistre la main.
+        lignes : list[tuple]
+            (id_joueur, nb_parties, nb_victoires, gain net, mises, date de la main) par joueur.
+        """
+        if lignes:
+            execute_values(
+                cursor,
+                StatistiquesDao.REQUETE_CUMUL,
+                lignes,
+                template="(%s, %s, %s, %s::NUMERIC, %s::NUMERIC, %s::TIMESTAMP)",
+            )
+
+    @log
+    @invalide_cache("stats_joueur")
+    def reconstruire_stats_joueur(self) -> int:
+        """
+        Recalcule stats_joueur depuis l'historique des mains, en une transaction.
+
+        Sources : les mains archivées par le moteur de table (main_jouee) et le résultat
+        de chaque joueur aux mains jouées hors moteur (resultat_main, enregistré par
+        TableDao.distribuer_pot). Les statistiques des joueurs sans main dans ces tables
+        (mains jouées avant leur création) sont laissées telles quelles.
+
+        Returns
+        -------
+        int
+            Nombre de joueurs dont les statistiques ont été recalculées, -1 en cas d'erreur
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        """
+                        INSERT INTO stats_joueur
+                               (id_joueur, nb_parties, nb_victoires, total_gains, total_mises, derniere_partie)
+                        SELECT id_joueur, COUNT(*), SUM(victoire), SUM(gain), SUM(mise), MAX(date_main)
+                        FROM (
+                            -- victoire : gain au-delà de la part de sa mise que personne n'a suivie (voir Pot.gagnants)
+                            SELECT id_joueur,
+                                   CASE WHEN gain_brut - GREATEST(mise - suivie, 0) > 0 THEN 1 ELSE 0 END AS victoire,
+                                   gain_brut - mise AS gain,
+                                   mise,
+                                   date_main
+                            FROM (
+                                SELECT id_joueur, gain_brut, mise, date_main,
+                                       COALESCE(MAX(mise) OVER (PARTITION BY id_partie
+                                                                ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+                                                                EXCLUDE CURRENT ROW), 0) AS suivie
+                                FROM (
+                                    SELECT mj.id_partie,
+                                           m.key::INT AS id_joueur,
+                                           COALESCE((mj.gains ->> m.key)::NUMERIC, 0) AS gain_brut,
+                                           COALESCE(c.mise, 0) AS mise,
+                                           p.date_debut AS date_main
+                                    FROM main_jouee mj
+                                    JOIN partie p ON p.id_partie = mj.id_partie
+                                    CROSS JOIN LATERAL jsonb_each(mj.mains) m
+                                    LEFT JOIN LATERAL (
+                                        SELECT SUM((a ->> 3)::NUMERIC) AS mise
+                                        FROM jsonb_array_elements(mj.actions) a
+                                        WHERE a ->> 0 = m.key
+                                    ) c ON TRUE
+                                ) mise_joueur
+                            ) main_joueur
+                            UNION ALL
+                            SELECT r.id_joueur,
+                                   CASE WHEN r.victoire THEN 1 ELSE 0 END,
+                                   r.gain - r.mise,
+                                   r.mise,
+                                   r.date_main
+                            FROM resultat_main r
+                        ) historique
+                        WHERE id_joueur IN (SELECT id_joueur FROM joueur)
+                        GROUP BY id_joueur
+                        ON CONFLICT (id_joueur) DO UPDATE
+                           SET nb_parties = EXCLUDED.nb_parties,
+                               nb_victoires = EXCLUDED.nb_victoires,
+                               total_gains = EXCLUDED.total_gains,
+                               total_mises = EXCLUDED.total_mises,
+                               derniere_partie = EXCLUDED.derniere_partie
+                        """
+                    )
+                    return cursor.rowcount
+        except Exception as e:
+            print(f"Erreur lors de la reconstruction des statistiques des joueurs: {e}")
+            return -1
+
+    @log
+    @invalide_cache("partie")
+    def reconstruire_activite(self) -> int:
+        """
+        Recalcule entièrement les séries d'activité depuis la table partie, en une transaction.
+
+        Les heures sont calculées depuis les parties (joueurs : ceux de la main archivée
+        dans main_jouee, sinon ceux assis à la table) ; les jours et les mois sont dérivés
+        des heures.
+
+        Returns
+        -------
+        int
+            Nombre de périodes horaires, -1 en cas d'erreur
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute("DELETE FROM activite_joueur;")
+                    cursor.execute("DELETE FROM activite_table;")
+                    cursor.execute("DELETE FROM activite_periode;")
+                    cursor.execute(
+                        """
+                        INSERT INTO activite_joueur (granularite, debut, id_joueur)
+                        SELECT DISTINCT 'heure', DATE_TRUNC('hour', p.date_debut), j.id_joueur
+                        FROM partie p
+                        LEFT JOIN main_jouee mj ON mj.id_partie = p.id_partie
+                        CROSS JOIN LATERAL (
+                            SELECT m.key::INT AS id_joueur FROM jsonb_each(mj.mains) m
+                            UNION ALL
+                            SELECT pj.id_joueur FROM partie_joueur pj
+                            WHERE mj.id_partie IS NULL AND pj.id_table = p.id_table
+                        ) j
+                        WHERE p.date_debut IS NOT NULL;
+
+                        INSERT INTO activite_table (granularite, debut, id_table)
+                        SELECT DISTINCT 'heure', DATE_TRUNC('hour', date_debut), id_table
+                        FROM partie
+                        WHERE date_debut IS NOT NULL;
+                        """
+                    )
+                    for granularite, unite in self.GRANULARITES.items():
+                        if granularite == "heure":
+                            continue
+                        cursor.execute(
+                            """
+                            INSERT INTO activite_joueur (granularite, debut, id_joueur)
+                            SELECT DISTINCT %(granularite)s, DATE_TRUNC(%(unite)s, debut), id_joueur
+                            FROM activite_joueur WHERE granularite = 'heure';
+
+                            INSERT INTO activite_table (granularite, debut, id_table)
+                            SELECT DISTINCT %(granularite)s, DATE_TRUNC(%(unite)s, debut), id_table
+                            FROM activite_table WHERE granularite = 'heure';
+                            """,
+                            {"granularite": granularite, "unite": unite},
+                        )
+                    cursor.execute(
+                        """
+                        INSERT INTO activite_periode (granularite, debut, nb_parties, pot_total)
+                        SELECT 'heure', DATE_TRUNC('hour', date_debut), COUNT(*), SUM(pot)
+                        FROM partie
+                        WHERE date_debut IS NOT NULL
+                        GROUP BY 2;
+                        """
+                    )
+                    nb_heures = cursor.rowcount
+                    for granularite, unite in self.GRANULARITES.items():
+                        if granularite == "heure":
+                            continue
+                        cursor.execute(
+                            """
+                            INSERT INTO activite_periode (granularite, debut, nb_parties, pot_total)
+                            SELECT %(granularite)s, DATE_TRUNC(%(unite)s, debut), SUM(nb_parties), SUM(pot_total)
+                            FROM activite_periode WHERE granularite = 'heure'
+                            GROUP BY 2;
+                            """,
+                            {"granularite": granularite, "unite": unite},
+                        )
+                    cursor.execute(
+                        """
+                        UPDATE activite_periode a
+                           SET nb_joueurs = (SELECT COUNT(*) FROM activite_joueur j
+                                             WHERE j.granularite = a.granularite AND j.debut = a.debut),
+                               nb_tables = (SELECT COUNT(*) FROM activite_table t
+                                            WHERE t.granularite = a.granularite AND t.debut = a.debut);
+                        """
+                    )
+                    return nb_heures
+        except Exception as e:
+            print(f"Erreur lors de la reconstruction de l'activité par période: {e}")
+            return -1
+
+    @log
+    @invalide_cache("partie", "partie_joueur")
+    def reconstruire_quantiles(self) -> int:
+        """
+        Recalcule entièrement les sketchs de quantiles depuis l'historique, en une transaction.
+
+        Pots : ceux de la table partie. Mises : la mise de chaque joueur sur chaque main
+        archivée (main_jouee) et, pour les tables sans main archivée, les mises de partie_joueur.
+
+        Returns
+        -------
+        int
+            Nombre de sketchs, -1 en cas d'erreur
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute("DELETE FROM sketch_quantiles;")
+                    cursor.execute("SELECT id_table, pot FROM partie;")
+                    self.cumuler_quantiles(cursor, "pot", [(l["id_table"], l["pot"]) for l in cursor.fetchall()])
+                    cursor.execute(
+                        """
+                        SELECT mj.id_table, SUM((a ->> 3)::NUMERIC) AS mise
+                        FROM main_jouee mj
+                        CROSS JOIN LATERAL jsonb_array_elements(mj.actions) a
+                        GROUP BY mj.id_partie, mj.id_table, a ->> 0
+                        HAVING SUM((a ->> 3)::NUMERIC) > 0
+                        UNION ALL
+                        SELECT pj.id_table, pj.mise_tour
+                        FROM partie_joueur pj
+                        WHERE pj.mise_tour > 0
+                          AND NOT EXISTS (SELECT 1 FROM main_jouee mj WHERE mj.id_table = pj.id_table);
+                        """
+                    )
+                    self.cumuler_quantiles(cursor, "mise", [(l["id_table"], l["mise"]) for l in cursor.fetchall()])
+                    cursor.execute("SELECT COUNT(*) AS nb FROM sketch_quantiles;")
+                    return cursor.fetchone()["nb"]
+        except Exception as e:
+            print(f"Erreur lors de la reconstruction des quantiles: {e}")
+            return -1
 
     # =========================================================================
     # STATISTIQUES INDIVIDUELLES PAR JOUEUR
     # =========================================================================
 
     @log
+    @cache_resultat("joueur", "stats_joueur")
     def obtenir_stats_joueur(self, id_joueur: int) -> dict:
         """
         Récupère les statistiques complètes d'un joueur.
@@ -41,16 +455,15 @@ class StatistiquesDao(metaclass=Singleton):
                             j.pseudo,
                             j.credit,
                             j.age,
-                            COUNT(DISTINCT pp.id_table) as nb_parties_jouees,
-                            COALESCE(SUM(pp.solde_partie), 0) as total_gains,
-                            COALESCE(AVG(pp.solde_partie), 0) as gain_moyen_partie,
-                            COALESCE(AVG(pp.mise_tour), 0) as mise_moyenne,
-                            COALESCE(SUM(CASE WHEN pp.statut = 'gagnant' THEN 1 ELSE 0 END), 0) as nb_victoires,
+                            COALESCE(s.nb_parties, 0) as nb_parties_jouees,
+                            COALESCE(s.total_gains, 0) as total_gains,
+                            COALESCE(s.total_gains / NULLIF(s.nb_parties, 0), 0) as gain_moyen_partie,
+                            COALESCE(s.total_mises / NULLIF(s.nb_parties, 0), 0) as mise_moyenne,
+                            COALESCE(s.nb_victoires, 0) as nb_victoires,
                             j.date_creation
                         FROM joueur j
-                        LEFT JOIN partie_joueur pp ON j.id_joueur = pp.id_joueur
+                        LEFT JOIN stats_joueur s ON s.id_joueur = j.id_joueur
                         WHERE j.id_joueur = %(id_joueur)s
-                        GROUP BY j.id_joueur, j.pseudo, j.credit, j.age, j.date_creation
                         """,
                         {"id_joueur": id_joueur}
                     )
@@ -75,9 +488,11 @@ class StatistiquesDao(metaclass=Singleton):
                     return None
         except Exception as e:
             print(f"Erreur lors de la récupération des stats du joueur: {e}")
+            signaler_echec()
             return None
 
     @log
+    @cache_resultat("partie", "partie_joueur", "table_poker")
     def obtenir_historique_parties_joueur(self, id_joueur: int, limite: int = 10) -> list[dict]:
         """
         Récupère l'historique des dernières parties d'un joueur.
@@ -120,9 +535,11 @@ class StatistiquesDao(metaclass=Singleton):
                     return cursor.fetchall()
         except Exception as e:
             print(f"Erreur lors de la récupération de l'historique: {e}")
+            signaler_echec()
             return []
 
     @log
+    @cache_resultat("transaction")
     def obtenir_evolution_credit_joueur(self, id_joueur: int) -> list[dict]:
         """
         Récupère l'évolution du crédit d'un joueur via les transactions.
@@ -156,9 +573,11 @@ class StatistiquesDao(metaclass=Singleton):
                     return cursor.fetchall()
         except Exception as e:
             print(f"Erreur lors de la récupération de l'évolution du crédit: {e}")
+            signaler_echec()
             return []
 
     @log
+    @cache_resultat("partie_joueur", "table_poker")
     def obtenir_statistiques_par_table(self, id_joueur: int) -> list[dict]:
         """
         Récupère les performances d'un joueur par table.
@@ -204,6 +623,7 @@ class StatistiquesDao(metaclass=Singleton):
                     return results
         except Exception as e:
             print(f"Erreur lors de la récupération des stats par table: {e}")
+            signaler_echec()
             return []
 
     # =========================================================================
@@ -211,6 +631,7 @@ class StatistiquesDao(metaclass=Singleton):
     # =========================================================================
 
     @log
+    @cache_resultat("joueur", "partie", "table_poker")
     def obtenir_stats_globales(self) -> dict:
         """
         Récupère les statistiques globales de la plateforme.
@@ -248,9 +669,11 @@ class StatistiquesDao(metaclass=Singleton):
                     return None
         except Exception as e:
             print(f"Erreur lors de la récupération des stats globales: {e}")
+            signaler_echec()
             return None
 
     @log
+    @cache_resultat("joueur", "stats_joueur")
     def obtenir_classement_joueurs(self, critere: str = "credit", limite: int = 10) -> list[dict]:
         """
         Récupère le classement des joueurs selon un critère.
@@ -270,14 +693,18 @@ class StatistiquesDao(metaclass=Singleton):
         try:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
-                    if critere == "credit":
-                        order_by = "j.credit DESC"
-                    elif critere == "victoires":
-                        order_by = "nb_victoires DESC"
+                    # les k premiers sont lus dans l'index du critère (joueur.credit ou stats_joueur)
+                    if critere == "victoires":
+                        order_by = "s.nb_victoires DESC"
                     elif critere == "parties_jouees":
-                        order_by = "nb_parties DESC"
+                        order_by = "s.nb_parties DESC"
                     else:
                         order_by = "j.credit DESC"
+                    source = (
+                        "joueur j LEFT JOIN stats_joueur s ON s.id_joueur = j.id_joueur"
+                        if order_by == "j.credit DESC"
+                        else "stats_joueur s JOIN joueur j ON j.id_joueur = s.id_joueur"
+                    )
                     
                     cursor.execute(
                         f"""
@@ -285,12 +712,10 @@ class StatistiquesDao(metaclass=Singleton):
                             j.id_joueur,
                             j.pseudo,
                             j.credit,
-                            COUNT(DISTINCT pp.id_table) as nb_parties,
-                            SUM(CASE WHEN pp.statut = 'gagnant' THEN 1 ELSE 0 END) as nb_victoires,
-                            COALESCE(SUM(pp.solde_partie), 0) as gains_totaux
-                        FROM joueur j
-                        LEFT JOIN partie_joueur pp ON j.id_joueur = pp.id_joueur
-                        GROUP BY j.id_joueur, j.pseudo, j.credit
+                            COALESCE(s.nb_parties, 0) as nb_parties,
+                            COALESCE(s.nb_victoires, 0) as nb_victoires,
+                            COALESCE(s.total_gains, 0) as gains_totaux
+                        FROM {source}
                         ORDER BY {order_by}
                         LIMIT %(limite)s
                         """,
@@ -311,9 +736,11 @@ class StatistiquesDao(metaclass=Singleton):
                     return results
         except Exception as e:
             print(f"Erreur lors de la récupération du classement: {e}")
+            signaler_echec()
             return []
 
     @log
+    @cache_resultat("joueur")
     def obtenir_distribution_age(self) -> list[dict]:
         """
         Récupère la distribution des joueurs par tranche d'âge.
@@ -385,9 +812,11 @@ class StatistiquesDao(metaclass=Singleton):
                     return cursor.fetchall()
         except Exception as e:
             print(f"Erreur lors de la récupération de la distribution d'âge: {e}")
+            signaler_echec()
             return []
 
     @log
+    @cache_resultat("joueur", "stats_joueur")
     def obtenir_joueurs_plus_actifs(self, limite: int = 10) -> list[dict]:
         """
         Récupère les joueurs les plus actifs (nombre de parties jouées).
@@ -410,15 +839,14 @@ class StatistiquesDao(metaclass=Singleton):
                         SELECT 
                             j.id_joueur,
                             j.pseudo,
-                            COUNT(DISTINCT pp.id_table) as nb_parties,
-                            SUM(pp.mise_tour) as total_mises,
-                            AVG(pp.mise_tour) as mise_moyenne,
-                            MAX(p.date_debut) as derniere_partie
-                        FROM joueur j
-                        JOIN partie_joueur pp ON j.id_joueur = pp.id_joueur
-                        JOIN partie p ON pp.id_table = p.id_table
-                        GROUP BY j.id_joueur, j.pseudo
-                        ORDER BY nb_parties DESC
+                            s.nb_parties,
+                            s.total_mises,
+                            s.total_mises / NULLIF(s.nb_parties, 0) as mise_moyenne,
+                            s.derniere_partie
+                        FROM stats_joueur s
+                        JOIN joueur j ON j.id_joueur = s.id_joueur
+                        WHERE s.nb_parties > 0
+                        ORDER BY s.nb_parties DESC
                         LIMIT %(limite)s
                         """,
                         {"limite": limite}
@@ -426,6 +854,7 @@ class StatistiquesDao(metaclass=Singleton):
                     return cursor.fetchall()
         except Exception as e:
             print(f"Erreur lors de la récupération des joueurs actifs: {e}")
+            signaler_echec()
             return []
 
     # =========================================================================
@@ -433,93 +862,115 @@ class StatistiquesDao(metaclass=Singleton):
     # =========================================================================
 
     @log
-    def obtenir_stats_parties(self) -> dict:
+    @cache_resultat("partie", "partie_joueur")
+    def obtenir_quantiles(self, mesure: str, id_table: int = None) -> dict:
         """
-        Récupère les statistiques sur les parties.
-        
+        Quantiles approchés des pots ou des mises, lus dans les sketchs KLL (sans trier l'historique).
+
+        Une seule ligne est lue : le sketch de la table, ou le sketch global tenu à jour par
+        cumuler_quantiles. Erreur de rang d'environ 1,65 % (voir src.utils.sketch_quantiles).
+
+        Parameters
+        ----------
+        mesure : str
+            'pot' ou 'mise'
+        id_table : int, optional
+            Table voulue, par défaut toutes les tables
+
         Returns
         -------
         dict
-            Statistiques agrégées sur les parties
+            n, min, max, somme, moyenne, ecart_type (exacts) et les quantiles de QUANTILES
+            (None si aucune valeur)
         """
         try:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
-                        """
-                        SELECT 
-                            COUNT(*) as nb_parties_total,
-                            COALESCE(AVG(pot), 0) as pot_moyen,
-                            COALESCE(STDDEV(pot), 0) as ecart_type_pot,
-                            COALESCE(PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY pot), 0) as mediane_pot,
-                            COALESCE(MIN(pot), 0) as pot_min,
-                            COALESCE(MAX(pot), 0) as pot_max,
-                            COALESCE(SUM(pot), 0) as somme_totale_pots
-                        FROM partie
-                        """
+                        "SELECT sketch FROM sketch_quantiles                        "
+                        " WHERE mesure = %(mesure)s AND id_table = %(id_table)s;    ",
+                        {
+                            "mesure": mesure,
+                            "id_table": self.ID_TABLE_GLOBALE if id_table is None else id_table,
+                        },
                     )
-                    result = cursor.fetchone()
-                    
-                    if result:
-                        return {
-                            "nb_parties_total": result["nb_parties_total"],
-                            "pot_moyen": float(result["pot_moyen"] or 0),
-                            "ecart_type_pot": float(result["ecart_type_pot"] or 0),
-                            "mediane_pot": float(result["mediane_pot"] or 0),
-                            "pot_min": float(result["pot_min"] or 0),
-                            "pot_max": float(result["pot_max"] or 0),
-                            "somme_totale_pots": float(result["somme_totale_pots"] or 0)
-                        }
-                    return None
+                    ligne = cursor.fetchone()
+                    sketch = SketchKLL.depuis_bytes(bytes(ligne["sketch"]) if ligne else b"")
         except Exception as e:
-            print(f"Erreur lors de la récupération des stats des parties: {e}")
-            return None
+            print(f"Erreur lors de la lecture des quantiles: {e}")
+            signaler_echec()
+            sketch = SketchKLL()
+        quantiles = {
+            "n": sketch.n,
+            "min": sketch.min,
+            "max": sketch.max,
+            "somme": sketch.somme,
+            "moyenne": sketch.moyenne,
+            "ecart_type": sketch.ecart_type,
+        }
+        for nom, q in self.QUANTILES.items():
+            quantiles[nom] = sketch.quantile(q)
+        return quantiles
 
     @log
+    @cache_resultat("partie")
+    def obtenir_stats_parties(self) -> dict:
+        """
+        Récupère les statistiques sur les parties.
+
+        Toutes les valeurs sont lues dans le sketch global des pots (voir obtenir_quantiles),
+        alimenté à chaque création de partie : le nombre, le minimum, le maximum, la somme,
+        la moyenne et l'écart-type sont exacts ; la médiane, le p90 et le p99 sont approchés.
+
+        Returns
+        -------
+        dict
+            Statistiques agrégées sur les parties
+        """
+        quantiles = self.obtenir_quantiles("pot")
+        return {
+            "nb_parties_total": quantiles["n"],
+            "pot_moyen": quantiles["moyenne"] or 0.0,
+            "ecart_type_pot": quantiles["ecart_type"] or 0.0,
+            "mediane_pot": quantiles["mediane"] or 0.0,
+            "p90_pot": quantiles["p90"] or 0.0,
+            "p99_pot": quantiles["p99"] or 0.0,
+            "pot_min": quantiles["min"] or 0.0,
+            "pot_max": quantiles["max"] or 0.0,
+            "somme_totale_pots": quantiles["somme"],
+        }
+
+    @log
+    @cache_resultat("partie", "partie_joueur")
     def obtenir_stats_mises(self) -> dict:
         """
         Récupère les statistiques sur les mises des joueurs.
-        
+
+        Toutes les valeurs portent sur la même population : la mise de chaque joueur sur
+        chaque main terminée, lue dans les sketchs (voir obtenir_quantiles). Le nombre, le
+        minimum, le maximum, la somme, la moyenne et l'écart-type sont exacts ; la médiane,
+        le p90 et le p99 sont approchés.
+
         Returns
         -------
         dict
             Statistiques agrégées sur les mises
         """
-        try:
-            with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        SELECT 
-                            COUNT(*) as nb_mises_total,
-                            COALESCE(AVG(mise_tour), 0) as mise_moyenne,
-                            COALESCE(STDDEV(mise_tour), 0) as ecart_type_mise,
-                            COALESCE(PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY mise_tour), 0) as mediane_mise,
-                            COALESCE(MIN(mise_tour), 0) as mise_min,
-                            COALESCE(MAX(mise_tour), 0) as mise_max,
-                            COALESCE(SUM(mise_tour), 0) as somme_totale_mises
-                        FROM partie_joueur
-                        WHERE mise_tour > 0
-                        """
-                    )
-                    result = cursor.fetchone()
-                    
-                    if result:
-                        return {
-                            "nb_mises_total": result["nb_mises_total"],
-                            "mise_moyenne": float(result["mise_moyenne"] or 0),
-                            "ecart_type_mise": float(result["ecart_type_mise"] or 0),
-                            "mediane_mise": float(result["mediane_mise"] or 0),
-                            "mise_min": float(result["mise_min"] or 0),
-                            "mise_max": float(result["mise_max"] or 0),
-                            "somme_totale_mises": float(result["somme_totale_mises"] or 0)
-                        }
-                    return None
-        except Exception as e:
-            print(f"Erreur lors de la récupération des stats des mises: {e}")
-            return None
+        quantiles = self.obtenir_quantiles("mise")
+        return {
+            "nb_mises_total": quantiles["n"],
+            "mise_moyenne": quantiles["moyenne"] or 0.0,
+            "ecart_type_mise": quantiles["ecart_type"] or 0.0,
+            "mediane_mise": quantiles["mediane"] or 0.0,
+            "p90_mise": quantiles["p90"] or 0.0,
+            "p99_mise": quantiles["p99"] or 0.0,
+            "mise_min": quantiles["min"] or 0.0,
+            "mise_max": quantiles["max"] or 0.0,
+            "somme_totale_mises": quantiles["somme"],
+        }
 
     @log
+    @cache_resultat("table_poker", "partie", "partie_joueur")
     def obtenir_stats_tables(self) -> list[dict]:
         """
         Récupère les statistiques par table.
@@ -559,53 +1010,110 @@ class StatistiquesDao(metaclass=Singleton):
                     return results
         except Exception as e:
             print(f"Erreur lors de la récupération des stats des tables: {e}")
+            signaler_echec()
             return []
 
     @log
-    def obtenir_activite_par_periode(self, periode: str = "jour") -> list[dict]:
+    @cache_resultat("partie")
+    def obtenir_activite_par_periode(self, periode: str = "jour", debut=None, fin=None) -> list[dict]:
         """
         Récupère l'activité (nombre de parties) par période.
-        
+
+        L'activité est lue dans les séries pré-agrégées (activite_periode), seulement sur
+        la fenêtre demandée ; les semaines sont dérivées des jours.
+
         Parameters
         ----------
         periode : str
-            'jour', 'semaine' ou 'mois'
-            
+            'heure', 'jour', 'semaine' ou 'mois'
+        debut : datetime, optional
+            Début de la fenêtre (inclus) ; sans fenêtre, les 30 dernières périodes actives
+        fin : datetime, optional
+            Fin de la fenêtre (exclue)
+
         Returns
         -------
         list[dict]
-            Activité par période
+            Activité par période, de la plus récente à la plus ancienne
         """
         try:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
-                    if periode == "jour":
-                        date_trunc = "day"
-                    elif periode == "semaine":
-                        date_trunc = "week"
+                    if periode == "semaine":
+                        granularite, regroupement = "jour", "week"
                     else:
-                        date_trunc = "month"
-                    
+                        granularite, regroupement = periode if periode in self.GRANULARITES else "mois", None
+                    fenetre = {"granularite": granularite, "debut": debut, "fin": fin}
+                    filtre = (
+                        "granularite = %(granularite)s"
+                        " AND (%(debut)s::TIMESTAMP IS NULL OR debut >= %(debut)s::TIMESTAMP)"
+                        " AND (%(fin)s::TIMESTAMP IS NULL OR debut < %(fin)s::TIMESTAMP)"
+                    )
+
+                    if regroupement is None:
+                        cursor.execute(
+                            f"""
+                            SELECT
+                                debut as periode,
+                                nb_parties,
+                                nb_tables as nb_tables_utilisees,
+                                nb_joueurs,
+                                pot_total / NULLIF(nb_parties, 0) as pot_moyen,
+                                pot_total
+                            FROM activite_periode
+                            WHERE {filtre}
+                            ORDER BY debut DESC
+                            LIMIT CASE WHEN %(debut)s::TIMESTAMP IS NULL THEN 30 END
+                            """,
+                            fenetre,
+                        )
+                        return cursor.fetchall()
+
+                    if debut is None:
+                        # 30 dernières semaines jusqu'au dernier jour actif
+                        cursor.execute(
+                            "SELECT MAX(debut) as dernier FROM activite_periode WHERE granularite = 'jour';"
+                        )
+                        dernier = cursor.fetchone()["dernier"]
+                        if dernier is None:
+                            return []
+                        cursor.execute(
+                            "SELECT DATE_TRUNC('week', %(dernier)s::TIMESTAMP) - INTERVAL '29 weeks' as debut;",
+                            {"dernier": dernier},
+                        )
+                        fenetre["debut"] = cursor.fetchone()["debut"]
+
                     cursor.execute(
                         f"""
-                        SELECT 
-                            DATE_TRUNC('{date_trunc}', date_debut) as periode,
-                            COUNT(*) as nb_parties,
-                            COUNT(DISTINCT id_table) as nb_tables_utilisees,
-                            AVG(pot) as pot_moyen,
-                            SUM(pot) as pot_total
-                        FROM partie
-                        GROUP BY periode
-                        ORDER BY periode DESC
-                        LIMIT 30
-                        """
+                        SELECT
+                            a.periode,
+                            a.nb_parties,
+                            (SELECT COUNT(DISTINCT id_table) FROM activite_table
+                              WHERE {filtre} AND DATE_TRUNC('week', debut) = a.periode) as nb_tables_utilisees,
+                            (SELECT COUNT(DISTINCT id_joueur) FROM activite_joueur
+                              WHERE {filtre} AND DATE_TRUNC('week', debut) = a.periode) as nb_joueurs,
+                            a.pot_total / NULLIF(a.nb_parties, 0) as pot_moyen,
+                            a.pot_total
+                        FROM (
+                            SELECT DATE_TRUNC('week', debut) as periode,
+                                   SUM(nb_parties) as nb_parties,
+                                   SUM(pot_total) as pot_total
+                            FROM activite_periode
+                            WHERE {filtre}
+                            GROUP BY 1
+                        ) a
+                        ORDER BY a.periode DESC
+                        """,
+                        fenetre,
                     )
                     return cursor.fetchall()
         except Exception as e:
             print(f"Erreur lors de la récupération de l'activité par période: {e}")
+            signaler_echec()
             return []
 
     @log
+    @cache_resultat("partie_joueur")
     def obtenir_taux_abandon(self) -> dict:
         """
         Calcule les taux d'abandon (joueurs qui se couchent).
@@ -645,25 +1153,57 @@ class StatistiquesDao(metaclass=Singleton):
                     return None
         except Exception as e:
             print(f"Erreur lors du calcul du taux d'abandon: {e}")
+            signaler_echec()
             return None
 
     @log
+    @cache_resultat("joueur", "partie", "partie_joueur", "table_poker", "stats_joueur")
     def obtenir_rapport_complet(self) -> dict:
         """
         Génère un rapport complet avec toutes les statistiques principales.
-        
+
+        Les sections sont calculées en parallèle (voir iterer_rapport_complet) : la durée
+        du rapport est proche de celle de la requête la plus lente.
+
         Returns
         -------
         dict
             Rapport complet des statistiques
         """
-        return {
-            "stats_globales": self.obtenir_stats_globales(),
-            "stats_parties": self.obtenir_stats_parties(),
-            "stats_mises": self.obtenir_stats_mises(),
-            "top_10_joueurs": self.obtenir_classement_joueurs(limite=10),
-            "joueurs_actifs": self.obtenir_joueurs_plus_actifs(limite=10),
-            "distribution_age": self.obtenir_distribution_age(),
-            "taux_abandon": self.obtenir_taux_abandon(),
-            "stats_tables": self.obtenir_stats_tables()
-        }
\ No newline at end of file
+        sections = dict(self.iterer_rapport_complet())
+        return {nom: sections[nom] for nom in self.SECTIONS_RAPPORT}
+
+    def iterer_rapport_complet(self, sections: list = None):
+        """
+        Calcule les sections du rapport complet en parallèle et les rend dès qu'elles sont prêtes.
+
+        Chaque section est une requête indépendante, exécutée dans un thread sur sa propre
+        connexion du pool (DBConnection) ; les sections déjà en cache sont rendues aussitôt.
+        Les threads sont partagés par tous les rapports et bornés par la taille du pool
+        (voir _executeur_rapport).
+
+        Parameters
+        ----------
+        sections : list, optional
+            Noms des sections voulues (clés de SECTIONS_RAPPORT), par défaut toutes.
+
+        Yields
+        ------
+        tuple
+            (nom de la section, résultat), dans l'ordre où les sections se terminent ;
+            le résultat vaut None si la section a échoué.
+        """
+        noms = list(sections or self.SECTIONS_RAPPORT)
+        executeur = _executeur_rapport(len(self.SECTIONS_RAPPORT))
+        futures = {}
+        for nom in noms:
+            methode, kwargs = self.SECTIONS_RAPPORT[nom]
+            # copie du contexte : un échec de la section empêche de garder le rapport en cache
+            futures[executeur.submit(contextvars.copy_context().run, getattr(self, methode), **kwargs)] = nom
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                print(f"Erreur lors du calcul de la section {futures[future]} du rapport: {e}")
+                signaler_echec()
+                yield futures[future], None
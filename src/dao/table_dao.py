@@ -1,19 +1,29 @@
 import logging
 
+from datetime import datetime
+
+from psycopg2.extras import execute_values
+
 from src.utils.singleton import Singleton
 from src.utils.log_decorator import log
+from src.utils.cache import invalide_cache
 
 from src.dao.db_connection import DBConnection
+from src.dao.notification_table import notifier_table
+from src.dao.statistiques_dao import StatistiquesDao
 
 from src.business_object.table import Table
 from src.business_object.monnaie import Monnaie
+from src.business_object.pot import Pot
 from src.business_object.liste_cartes import ListeCartes
+from src.business_object.etat_table import EtatTable, JoueurAssis
 
 
 class TableDao(metaclass=Singleton):
     """Classe contenant les méthodes pour accéder aux Tables de poker de la base de données"""
 
     @log
+    @invalide_cache("table_poker")
     def creer(self, table: Table) -> bool:
         """Création d'une table de poker dans la base de données
 
@@ -125,6 +135,7 @@ class TableDao(metaclass=Singleton):
         return liste_tables
 
     @log
+    @invalide_cache("table_poker")
     def modifier(self, table: Table) -> bool:
         """Modification d'une table dans la base de données
 
@@ -163,6 +174,7 @@ class TableDao(metaclass=Singleton):
         return res == 1
 
     @log
+    @invalide_cache("table_poker", "partie", "partie_joueur")
     def supprimer(self, id_table: int) -> bool:
         """Suppression d'une table dans la base de données
 
@@ -231,6 +243,7 @@ class TableDao(metaclass=Singleton):
         return liste_tables
 
     @log
+    @invalide_cache("table_poker")
     def incrementer_nb_joueurs(self, id_table: int) -> bool:
         """Incrémente le nombre de joueurs d'une table de 1"""
         try:
@@ -243,6 +256,7 @@ class TableDao(metaclass=Singleton):
                         {"id_table": id_table},
                     )
                     res = cursor.rowcount
+                    notifier_table(cursor, id_table, "joueurs")
                 connection.commit()
         except Exception as e:
             logging.exception("Erreur lors de l'incrémentation du nombre de joueurs de la table %s", id_table)
@@ -251,6 +265,7 @@ class TableDao(metaclass=Singleton):
         return res == 1
     
     @log
+    @invalide_cache("table_poker")
     def decrementer_nb_joueurs(self, id_table: int) -> bool:
         """Décrémente le nombre de joueurs d'une table de 1"""
         try:
@@ -263,6 +278,7 @@ class TableDao(metaclass=Singleton):
                         {"id_table": id_table},
                     )
                     res = cursor.rowcount
+                    notifier_table(cursor, id_table, "joueurs")
                 connection.commit()
         except Exception as e:
             logging.exception("Erreur lors de la décrémentation du nombre de joueurs de la table %s", id_table)
@@ -298,6 +314,7 @@ class TableDao(metaclass=Singleton):
                         {"id_joueur_tour": id_joueur_tour, "id_table": id_table},
                     )
                     res = cursor.rowcount
+                    notifier_table(cursor, id_table, "tour")
                 connection.commit()
         except Exception as e:
             logging.exception("Erreur lors de la mise à jour de id_joueur_tour")
@@ -313,9 +330,10 @@ class TableDao(metaclass=Singleton):
                 with connection.cursor() as cursor:
                     cursor.execute(
                         "UPDATE table_poker SET flop=%(flop)s WHERE id_table=%(id_table)s;",
-                        {"flop": ListeCartes.cartes_to_str(flop), "id_table": id_table}
+                        {"flop": ListeCartes.cartes_to_bytes(flop), "id_table": id_table}
                     )
                     res = cursor.rowcount
+                    notifier_table(cursor, id_table, "cartes")
                 connection.commit()
         except Exception as e:
             logging.exception("Erreur lors de la mise à jour du flop")
@@ -330,9 +348,10 @@ class TableDao(metaclass=Singleton):
                 with connection.cursor() as cursor:
                     cursor.execute(
                         "UPDATE table_poker SET turn=%(turn)s WHERE id_table=%(id_table)s;",
-                        {"turn": ListeCartes.cartes_to_str(turn), "id_table": id_table}
+                        {"turn": ListeCartes.cartes_to_bytes(turn), "id_table": id_table}
                     )
                     res = cursor.rowcount
+                    notifier_table(cursor, id_table, "cartes")
                 connection.commit()
         except Exception as e:
             logging.exception("Erreur lors de la mise à jour du turn")
@@ -347,9 +366,10 @@ class TableDao(metaclass=Singleton):
                 with connection.cursor() as cursor:
                     cursor.execute(
                         "UPDATE table_poker SET river=%(river)s WHERE id_table=%(id_table)s;",
-                        {"river": ListeCartes.cartes_to_str(river), "id_table": id_table}
+                        {"river": ListeCartes.cartes_to_bytes(river), "id_table": id_table}
                     )
                     res = cursor.rowcount
+                    notifier_table(cursor, id_table, "cartes")
                 connection.commit()
         except Exception as e:
             logging.exception("Erreur lors de la mise à jour de la river")
@@ -369,16 +389,16 @@ class TableDao(metaclass=Singleton):
                     res = cursor.fetchone()
         except Exception as e:
             logging.exception("Erreur lors de la récupération des cartes communes")
-            return {"flop": ListeCartes(), "turn": ListeCartes(), "river": ListeCartes()}
+            return {"flop": ListeCartes([]), "turn": ListeCartes([]), "river": ListeCartes([])}
 
         if res:
             return {
-                "flop": ListeCartes.str_to_cartes(res["flop"]),
-                "turn": ListeCartes.str_to_cartes(res["turn"]),
-                "river": ListeCartes.str_to_cartes(res["river"]),
+                "flop": ListeCartes.bytes_to_cartes(res["flop"]),
+                "turn": ListeCartes.bytes_to_cartes(res["turn"]),
+                "river": ListeCartes.bytes_to_cartes(res["river"]),
             }
         else:
-            return {"flop": ListeCartes(), "turn": ListeCartes(), "river": ListeCartes()}
+            return {"flop": ListeCartes([]), "turn": ListeCartes([]), "river": ListeCartes([])}
     
     @log
     def alimenter_pot(self, id_table: int, montant: float) -> bool:
@@ -393,6 +413,7 @@ class TableDao(metaclass=Singleton):
                         {"montant": montant, "id_table": id_table}
                     )
                     res = cursor.rowcount
+                    notifier_table(cursor, id_table, "pot")
                 connection.commit()
         except Exception as e:
             logging.exception("Erreur lors de l'alimentation du pot pour la table %s", id_table)
@@ -412,12 +433,103 @@ class TableDao(metaclass=Singleton):
                         {"montant": montant, "id_table": id_table}
                     )
                     res = cursor.rowcount
+                    notifier_table(cursor, id_table, "pot")
                 connection.commit()
         except Exception as e:
             logging.exception("Erreur lors du retrait du pot pour la table %s", id_table)
             return False
         return res == 1
 
+    @log
+    @invalide_cache("joueur", "partie_joueur", "transaction", "stats_joueur")
+    def distribuer_pot(self, id_table: int, gains: dict) -> bool:
+        """Distribue le pot aux gagnants en une seule transaction.
+
+        Crédite chaque gagnant, enregistre les transactions (un seul INSERT multi-lignes),
+        retire du pot le total distribué, remet à zéro les mises du tour de la table,
+        enregistre le résultat de la main de chaque joueur (resultat_main) et la cumule
+        dans leurs statistiques.
+        Rien n'est modifié si le total dépasse le pot.
+
+        Parameters
+        ----------
+        id_table : int
+            Identifiant de la table.
+        gains : dict
+            Dictionnaire clé : id joueur, valeur : montant remporté (tous pots confondus).
+
+        Returns
+        -------
+        bool
+            True si le pot a été distribué.
+        """
+        total = round(sum(gains.values()), 2)
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "UPDATE table_poker              "
+                        "   SET pot = pot - %(total)s    "
+                        " WHERE id_table = %(id_table)s  "
+                        "   AND pot >= %(total)s;        ",
+                        {"total": total, "id_table": id_table},
+                    )
+                    if cursor.rowcount != 1:
+                        raise ValueError(f"Pot de la table {id_table} absent ou inférieur à {total}")
+                    gains = [(id_joueur, montant) for id_joueur, montant in gains.items() if montant > 0]
+                    if gains:
+                        execute_values(
+                            cursor,
+                            "UPDATE joueur AS j                          "
+                            "   SET credit = j.credit + v.montant        "
+                            "  FROM (VALUES %s) AS v(id_joueur, montant) "
+                            " WHERE j.id_joueur = v.id_joueur;           ",
+                            gains,
+                            template="(%s, %s::NUMERIC)",
+                        )
+                        execute_values(
+                            cursor,
+                            "INSERT INTO transaction (id_joueur, solde, date) VALUES %s;",
+                            [(id_joueur, round(montant)) for id_joueur, montant in gains],
+                            template="(%s, %s, NOW())",
+                        )
+                    # statistiques : une main de plus pour les joueurs de la table, gains et victoires (voir Pot.gagnants),
+                    # mise de chaque joueur sur la main (valeur de mise_tour avant sa remise à zéro)
+                    cursor.execute(
+                        "UPDATE partie_joueur AS pj SET mise_tour = 0                          "
+                        "  FROM (SELECT id_joueur, mise_tour FROM partie_joueur                "
+                        "         WHERE id_table = %(id_table)s FOR UPDATE) AS avant            "
+                        " WHERE pj.id_table = %(id_table)s AND pj.id_joueur = avant.id_joueur  "
+                        "RETURNING pj.id_joueur, avant.mise_tour AS mise;                      ",
+                        {"id_table": id_table},
+                    )
+                    lignes = cursor.fetchall()
+                    joueurs = [ligne["id_joueur"] for ligne in lignes]
+                    gains = dict(gains)
+                    mises = {ligne["id_joueur"]: ligne["mise"] for ligne in lignes}
+                    gagnants = Pot.gagnants(mises, gains)
+                    StatistiquesDao.cumuler_quantiles(
+                        cursor, "mise", [(id_table, ligne["mise"]) for ligne in lignes if ligne["mise"] > 0]
+                    )
+                    joueurs += [id_joueur for id_joueur in gains if id_joueur not in joueurs]
+                    execute_values(
+                        cursor,
+                        "INSERT INTO resultat_main (id_table, id_joueur, mise, gain, victoire) VALUES %s;",
+                        [
+                            (id_table, id_joueur, mises.get(id_joueur, 0), gains.get(id_joueur, 0), id_joueur in gagnants)
+                            for id_joueur in joueurs
+                        ],
+                    )
+                    StatistiquesDao.cumuler(cursor, [
+                        (id_joueur, 1, 1 if id_joueur in gagnants else 0, gains.get(id_joueur, 0), 0, datetime.now())
+                        for id_joueur in joueurs
+                    ])
+                    notifier_table(cursor, id_table, "pot")
+        except Exception as e:
+            logging.exception("Erreur lors de la distribution du pot de la table %s", id_table)
+            return False
+        return True
+
     @log
     def get_pot(self, id_table: int) -> float:
         """Retourne le montant actuel du pot pour une table."""
@@ -447,6 +559,7 @@ class TableDao(metaclass=Singleton):
                         {"montant": montant, "id_table": id_table}
                     )
                     res = cursor.rowcount
+                    notifier_table(cursor, id_table, "mise")
                 connection.commit()
         except Exception as e:
             logging.exception("Erreur lors de la mise à jour de val_derniere_mise pour la table %s", id_table)
@@ -497,9 +610,108 @@ class TableDao(metaclass=Singleton):
                         {"id_joueur_bouton": id_joueur_bouton, "id_table": id_table},
                     )
                     res = cursor.rowcount
+                    notifier_table(cursor, id_table, "bouton")
                 connection.commit()
         except Exception as e:
             logging.exception("Erreur lors de la mise à jour de id_joueur_bouton")
             return False
 
         return res == 1
+
+    # Requête de snapshot, partagée avec TableDaoAsync
+    REQUETE_SNAPSHOT = (
+        "SELECT t.id_table, t.nb_sieges, t.blind_initial, t.pot, t.val_derniere_mise,       "
+        "       t.id_joueur_tour, t.id_joueur_bouton, t.flop, t.turn, t.river,             "
+        "       pj.id_joueur, pj.id_siege, pj.statut, pj.mise_tour, pj.solde_partie,       "
+        "       j.credit                                                                  "
+        "  FROM table_poker t                                                             "
+        "  LEFT JOIN partie_joueur pj ON pj.id_table = t.id_table                         "
+        "  LEFT JOIN joueur j ON j.id_joueur = pj.id_joueur                               "
+        " WHERE t.id_table = %(id_table)s                                                 "
+        " ORDER BY pj.id_siege NULLS LAST, pj.id_joueur;                                   "
+    )
+
+    @log
+    def snapshot(self, id_table: int) -> EtatTable:
+        """Lit en une seule requête l'état complet d'une table : pot, dernière mise,
+        joueur dont c'est le tour, bouton, cartes communes et joueurs assis avec leur statut
+        et leur crédit.
+
+        Parameters
+        ----------
+        id_table : int
+            Identifiant de la table.
+
+        Returns
+        -------
+        etat : EtatTable
+            L'état de la table, None si la table n'existe pas ou en cas d'erreur.
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(self.REQUETE_SNAPSHOT, {"id_table": id_table})
+                    res = cursor.fetchall()
+        except Exception as e:
+            logging.exception("Erreur lors de la lecture de l'état de la table %s", id_table)
+            return None
+
+        return self.etat_depuis_lignes(res)
+
+    @staticmethod
+    def etat_depuis_lignes(res: list) -> EtatTable:
+        """Construit l'EtatTable à partir des lignes de REQUETE_SNAPSHOT (None si aucune ligne)"""
+        if not res:
+            return None
+
+        table = res[0]
+        joueurs = tuple(
+            JoueurAssis(
+                id_joueur=row["id_joueur"],
+                id_siege=row["id_siege"],
+                statut=row["statut"],
+                mise_tour=row["mise_tour"] or 0,
+                solde_partie=float(row["solde_partie"] or 0),
+                credit=float(row["credit"]) if row["credit"] is not None else None,
+            )
+            for row in res
+            if row["id_joueur"] is not None
+        )
+        return EtatTable(
+            id_table=table["id_table"],
+            nb_sieges=table["nb_sieges"],
+            blind_initial=float(table["blind_initial"]),
+            pot=float(table["pot"]),
+            val_derniere_mise=float(table["val_derniere_mise"] or 0),
+            id_joueur_tour=table["id_joueur_tour"],
+            id_joueur_bouton=table["id_joueur_bouton"],
+            flop=tuple(ListeCartes.bytes_to_cartes(table["flop"]).get_cartes()),
+            turn=tuple(ListeCartes.bytes_to_cartes(table["turn"]).get_cartes()),
+            river=tuple(ListeCartes.bytes_to_cartes(table["river"]).get_cartes()),
+            joueurs=joueurs,
+        )
+
+    @log
+    def annoncer_resultat(self, id_table: int, resultat: dict) -> bool:
+        """Diffuse le résultat d'une main aux clients abonnés à la table (événement "resultat")
+
+        Parameters
+        ----------
+        id_table : int
+            Identifiant de la table.
+        resultat : dict
+            Données sérialisables en JSON (gagnants, combinaison, pot).
+
+        Returns
+        -------
+        bool
+            True si l'annonce a été émise.
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    notifier_table(cursor, id_table, "resultat", resultat)
+        except Exception as e:
+            logging.exception("Erreur lors de l'annonce du résultat de la table %s", id_table)
+            return False
+        return True
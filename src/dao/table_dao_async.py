@@ -0,0 +1,66 @@
+import logging
+
+from src.utils.singleton import Singleton
+from src.utils.log_decorator import log
+
+from src.dao.db_connection_async import DBConnectionAsync
+from src.dao.table_dao import TableDao
+
+from src.business_object.liste_cartes import ListeCartes
+from src.business_object.etat_table import EtatTable
+
+
+class TableDaoAsync(metaclass=Singleton):
+    """Version asynchrone des méthodes de TableDao les plus sollicitées par l'API"""
+
+    @log
+    async def get_pot(self, id_table: int) -> float:
+        """Retourne le montant actuel du pot pour une table."""
+        try:
+            async with DBConnectionAsync().connection as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(
+                        "SELECT pot FROM table_poker WHERE id_table=%(id_table)s;",
+                        {"id_table": id_table}
+                    )
+                    res = await cursor.fetchone()
+        except Exception as e:
+            logging.exception("Erreur lors de la récupération du pot pour la table %s", id_table)
+            return 0.0
+        return float(res["pot"]) if res else 0.0
+
+    @log
+    async def get_cartes_communes(self, id_table: int) -> dict:
+        """Récupère le flop, turn et river d'une table"""
+        try:
+            async with DBConnectionAsync().connection as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(
+                        "SELECT flop, turn, river FROM table_poker WHERE id_table=%(id_table)s;",
+                        {"id_table": id_table}
+                    )
+                    res = await cursor.fetchone()
+        except Exception as e:
+            logging.exception("Erreur lors de la récupération des cartes communes")
+            res = None
+
+        if res:
+            return {
+                "flop": ListeCartes.bytes_to_cartes(res["flop"]),
+                "turn": ListeCartes.bytes_to_cartes(res["turn"]),
+                "river": ListeCartes.bytes_to_cartes(res["river"]),
+            }
+        return {"flop": ListeCartes([]), "turn": ListeCartes([]), "river": ListeCartes([])}
+
+    @log
+    async def snapshot(self, id_table: int) -> EtatTable:
+        """Version asynchrone de TableDao.snapshot (même requête unique)."""
+        try:
+            async with DBConnectionAsync().connection as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(TableDao.REQUETE_SNAPSHOT, {"id_table": id_table})
+                    res = await cursor.fetchall()
+        except Exception as e:
+            logging.exception("Erreur lors de la lecture de l'état de la table %s", id_table)
+            return None
+        return TableDao.etat_depuis_lignes(res)
@@ -2,6 +2,7 @@ import logging
 
 from src.utils.singleton import Singleton
 from src.utils.log_decorator import log
+from src.utils.cache import invalide_cache
 
 from src.dao.db_connection import DBConnection
 
@@ -10,6 +11,7 @@ from src.business_object.transaction import Transaction
 
 class TransactionDao(metaclass=Singleton):
     @log
+    @invalide_cache("transaction")
     def creer(self, transaction) -> bool:
         """Creation d'une transaction dans la base de données
 
@@ -137,6 +139,7 @@ class TransactionDao(metaclass=Singleton):
         return transactions
 
     @log
+    @invalide_cache("transaction")
     def supprimer(self, id_transaction: int) -> bool:
         """Supprime une transaction de la base de données"""
         try:
@@ -2,6 +2,7 @@ from typing import Optional, List, Dict
 from src.utils.log_decorator import log
 from src.dao.admin_dao import AdminDao
 from src.dao.statistiques_dao import StatistiquesDao
+from src.utils.cache import CacheResultats
 from src.business_object.admin import Admin
 from src.utils.securite import hash_password, verify_password
 
@@ -96,6 +97,15 @@ class AdminService:
         """Obtenir le classement des meilleurs joueurs, le top 10 par exemple."""
         return StatistiquesDao().obtenir_classement_joueurs(critere="credit", limite=limite)
 
+    @log
+    def obtenir_rapport_complet(self) -> Dict:
+        """Obtenir le rapport complet des statistiques (gardé en cache, voir src.utils.cache)."""
+        return StatistiquesDao().obtenir_rapport_complet()
+
+    def statistiques_cache(self) -> Dict:
+        """Obtenir les compteurs du cache des statistiques (succès, échecs, évictions, ...)."""
+        return CacheResultats().statistiques()
+
     @log
     def obtenir_activite_recente(self, jours: int = 7) -> Dict:
         """Obtenir les statistiques d'activité récente, sur la dernière semaine par exemple."""
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+
+from src.utils.singleton import Singleton
+
+from src.dao.notification_table import EcouteTablesAsync
+from src.service.table_service import TableService
+
+# Nombre maximal de messages en attente par abonné : au-delà, l'abonné est resynchronisé
+TAILLE_FILE = 100
+
+
+def calculer_delta(ancien: dict, nouveau: dict) -> dict:
+    """Champs de l'état d'une table qui ont changé (avec leur nouvelle valeur)
+
+    Parameters
+    ----------
+    ancien : dict
+        Etat précédent (EtatTable.en_dict()), None si inconnu.
+    nouveau : dict
+        Nouvel état.
+
+    Returns
+    -------
+    delta : dict
+        Dictionnaire clé : champ modifié, valeur : nouvelle valeur. Tout l'état si ancien est None.
+    """
+    if ancien is None:
+        return dict(nouveau)
+    return {cle: valeur for cle, valeur in nouveau.items() if ancien.get(cle) != valeur}
+
+
+class DiffuseurTable(metaclass=Singleton):
+    """
+    Diffusion en temps réel de l'état des tables aux clients de l'API (WebSocket)
+
+    Un seul écouteur par processus reçoit les notifications des tables suivies (voir notification_table) ;
+    pour chaque table, un changement en base donne lieu à une seule relecture de l'état, dont le delta
+    est envoyé à tous les abonnés de la table.
+
+    Messages envoyés dans la file de chaque abonné :
+    - {"type": "etat", "etat": {...}} : état complet (à l'abonnement, ou après un retard de l'abonné)
+    - {"type": "delta", "changements": {...}} : champs modifiés (tour, mise, pot, cartes, joueurs, ...)
+    - {"type": "resultat", "gagnants": [...], "combinaison": ..., "pot": ...} : fin de la main
+    """
+
+    def __init__(self):
+        self.__abonnes = {}
+        self.__etats = {}
+        self.__relectures = {}
+        self.__a_relire = set()
+        self.__resultats = {}
+        self.__ecoute = EcouteTablesAsync(self.__signaler)
+
+    async def abonner(self, id_table: int) -> asyncio.Queue:
+        """Abonne un client à une table.
+
+        Returns
+        -------
+        file : asyncio.Queue
+            File des messages destinés au client, contenant déjà l'état complet de la table ;
+            None si la table n'existe pas.
+        """
+        file = asyncio.Queue(maxsize=TAILLE_FILE)
+        self.__abonnes.setdefault(id_table, set()).add(file)
+        try:
+            await self.__ecoute.ecouter(id_table)
+            etat = await TableService().etat_table_async(id_table)
+        except Exception:
+            self.desabonner(id_table, file)
+            raise
+        if etat is None:
+            self.desabonner(id_table, file)
+            return None
+        self.__etats.setdefault(id_table, etat.en_dict())
+        file.put_nowait({"type": "etat", "etat": etat.en_dict()})
+        return file
+
+    def desabonner(self, id_table: int, file: asyncio.Queue):
+        """Désabonne un client ; la table n'est plus écoutée quand elle n'a plus d'abonné"""
+        abonnes = self.__abonnes.get(id_table, set())
+        abonnes.discard(file)
+        if not abonnes:
+            self.__abonnes.pop(id_table, None)
+            self.__etats.pop(id_table, None)
+            self.__resultats.pop(id_table, None)
+            self.__ecoute.arreter_ecoute(id_table)
+
+    def nb_abonnes(self, id_table: int) -> int:
+        """Nombre de clients abonnés à une table"""
+        return len(self.__abonnes.get(id_table, ()))
+
+    async def fermer(self):
+        """Arrête l'écoute des tables"""
+        await self.__ecoute.fermer()
+
+    def __signaler(self, id_table: int, evenement: str, donnees):
+        """Reçoit un événement de la table : relit son état (une relecture à la fois par table)
+
+        Le résultat d'une main est publié après la relecture, pour arriver après les changements
+        (pot, statuts) qui l'ont précédé.
+        """
+        if id_table not in self.__abonnes:
+            return
+        if evenement == "resultat":
+            self.__resultats.setdefault(id_table, []).append(donnees or {})
+        if id_table in self.__relectures:
+            # une relecture est en cours : les événements arrivés entre-temps donnent une seule relecture de plus
+            self.__a_relire.add(id_table)
+        else:
+            self.__relectures[id_table] = asyncio.create_task(self.__relire(id_table))
+
+    async def __relire(self, id_table: int):
+        """Relit l'état de la table et publie le delta, puis les résultats en attente"""
+        try:
+            while True:
+                self.__a_relire.discard(id_table)
+                etat = await TableService().etat_table_async(id_table)
+                if etat is not None and id_table in self.__abonnes:
+                    nouveau = etat.en_dict()
+                    changements = calculer_delta(self.__etats.get(id_table), nouveau)
+                    self.__etats[id_table] = nouveau
+                    if changements:
+                        self.__publier(id_table, {"type": "delta", "changements": changements})
+                for resultat in self.__resultats.pop(id_table, []):
+                    self.__publier(id_table, {"type": "resultat", **resultat})
+                if id_table not in self.__a_relire:
+                    break
+        except Exception as e:
+            logging.exception("Erreur lors de la diffusion de l'état de la table %s", id_table)
+        finally:
+            self.__relectures.pop(id_table, None)
+
+    def __publier(self, id_table: int, message: dict):
+        """Place le message dans la file de chaque abonné de la table"""
+        for file in list(self.__abonnes.get(id_table, ())):
+            try:
+                file.put_nowait(message)
+            except asyncio.QueueFull:
+                # abonné trop lent : ses messages en retard sont remplacés par l'état complet
+                while not file.empty():
+                    file.get_nowait()
+                file.put_nowait({"type": "etat", "etat": self.__etats.get(id_table)})
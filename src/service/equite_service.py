@@ -0,0 +1,240 @@
+import os
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+
+from src.utils.log_decorator import log
+
+from src.business_object.liste_cartes import ListeCartes
+from src.business_object.evaluateur import encoder_cartes
+from src.business_object.evaluateur_lot import evaluer_lot
+
+TAILLE_LOT = 20000
+MODES = ("monte_carlo", "exact", "auto")
+
+# Bornes d'un calcul (les paramètres viennent des clients de l'API)
+MAX_ITERATIONS = 1_000_000
+MAX_PROCESSUS = os.cpu_count() or 1
+
+# Cartes communes déjà distribuées nécessaires au mode exact (au plus 990 boards à parcourir)
+MIN_BOARD_EXACT = 3
+
+# Processus de calcul partagés par toutes les requêtes (lancés au premier calcul multi-processus)
+_executeur = None
+_verrou_executeur = threading.Lock()
+
+
+def _executeur_partage() -> ProcessPoolExecutor:
+    """Pool de processus de calcul, créé une fois avec MAX_PROCESSUS processus"""
+    global _executeur
+    with _verrou_executeur:
+        if _executeur is None:
+            _executeur = ProcessPoolExecutor(max_workers=MAX_PROCESSUS)
+        return _executeur
+
+
+def _codes_main(cartes) -> list[int]:
+    """Codes des cartes d'une main, liste vide si la main est inconnue (None ou vide)."""
+    if cartes is None:
+        return []
+    if hasattr(cartes, "get_cartes"):
+        cartes = cartes.get_cartes()
+    return encoder_cartes(cartes)
+
+
+def _compter(rangs):
+    """Victoires seules, égalités et parts de pot de chaque joueur à partir des rangs (joueurs, tirages)."""
+    gagne = rangs == rangs.max(axis=0)
+    nb_gagnants = gagne.sum(axis=0)
+    return (
+        (gagne & (nb_gagnants == 1)).sum(axis=1),
+        (gagne & (nb_gagnants > 1)).sum(axis=1),
+        (gagne / nb_gagnants).sum(axis=1),
+    )
+
+
+def _simuler(codes_mains, codes_board, codes_paquet, n_iterations, graine):
+    """Simule n_iterations fins de main et compte les victoires, égalités et parts de pot.
+
+    Les cartes manquantes (board et mains inconnues) sont tirées sans remise dans codes_paquet ;
+    chaque ligne du tirage est une permutation indépendante du paquet restant.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        Pour chaque joueur : nombre de victoires seules, nombre d'égalités, somme des parts de pot.
+    """
+    rng = np.random.default_rng(graine)
+    nb_joueurs = len(codes_mains)
+    nb_board = 5 - len(codes_board)
+    nb_tirees = nb_board + 2 * sum(1 for main in codes_mains if not main)
+    paquet = np.array(codes_paquet, dtype=np.uint8)
+    board_connu = np.array(codes_board, dtype=np.uint8)
+
+    victoires = np.zeros(nb_joueurs, dtype=np.int64)
+    egalites = np.zeros(nb_joueurs, dtype=np.int64)
+    parts = np.zeros(nb_joueurs, dtype=np.float64)
+
+    restant = n_iterations
+    while restant > 0:
+        n = min(TAILLE_LOT, restant)
+        tirages = rng.permuted(np.tile(paquet, (n, 1)), axis=1)[:, :nb_tirees]
+        board = np.concatenate([np.broadcast_to(board_connu, (n, len(board_connu))), tirages[:, :nb_board]], axis=1)
+
+        rangs = np.empty((nb_joueurs, n), dtype=np.int64)
+        position = nb_board
+        for i, main in enumerate(codes_mains):
+            if main:
+                cartes_main = np.broadcast_to(np.array(main, dtype=np.uint8), (n, 2))
+            else:
+                cartes_main = tirages[:, position:position + 2]
+                position += 2
+            rangs[i] = evaluer_lot(np.concatenate([cartes_main, board], axis=1))
+
+        victoires_lot, egalites_lot, parts_lot = _compter(rangs)
+        victoires += victoires_lot
+        egalites += egalites_lot
+        parts += parts_lot
+        restant -= n
+
+    return victoires, egalites, parts
+
+
+@lru_cache(maxsize=4096)
+def _enumerer(codes_mains: tuple, codes_board: tuple):
+    """Parcourt toutes les fins de board possibles pour des mains entièrement connues.
+
+    Le résultat ne dépend que des cartes connues : il est mémoïsé sur (mains, board).
+
+    Returns
+    -------
+    tuple[tuple, tuple, tuple, int]
+        Pour chaque joueur : victoires seules, égalités, parts de pot ; puis le nombre de boards parcourus.
+    """
+    connues = {code for main in codes_mains for code in main} | set(codes_board)
+    paquet = [code for code in range(52) if code not in connues]
+    fins = list(combinations(paquet, 5 - len(codes_board)))
+    fins = np.array(fins, dtype=np.uint8).reshape(len(fins), 5 - len(codes_board))
+    board = np.concatenate([np.broadcast_to(np.array(codes_board, dtype=np.uint8), (len(fins), len(codes_board))), fins],
+                           axis=1)
+    rangs = np.stack([
+        evaluer_lot(np.concatenate([np.broadcast_to(np.array(main, dtype=np.uint8), (len(fins), 2)), board], axis=1))
+        for main in codes_mains
+    ])
+    victoires, egalites, parts = _compter(rangs)
+    return tuple(victoires.tolist()), tuple(egalites.tolist()), tuple(parts.tolist()), len(fins)
+
+
+class EquiteService:
+    """Classe contenant les méthodes de calcul d'équité (probabilités de gain) des joueurs"""
+
+    @log
+    def calculer_equite(self, mains: dict, board=None, n_iterations: int = 10000, seed=None,
+                        n_processus: int = 1, mode: str = "monte_carlo") -> dict:
+        """
+        Calcule les probabilités de victoire et d'égalité de chaque joueur.
+
+        En mode "monte_carlo", le paquet restant est le paquet complet (ListeCartes()) privé des
+        cartes connues ; le board est complété et les mains inconnues sont tirées dans ce paquet
+        à chaque itération.
+        En mode "exact", toutes les fins de board possibles sont parcourues : le résultat est
+        déterministe (n_iterations, seed et n_processus sont ignorés), toutes les mains doivent
+        être connues et au moins MIN_BOARD_EXACT cartes communes distribuées.
+        Le mode "auto" choisit le mode exact pour 2 ou 3 joueurs aux mains connues
+        lorsqu'il reste au plus 2 cartes communes à distribuer, Monte Carlo sinon.
+
+        Parameters
+        ----------
+        mains : dict
+            Un dictionnaire clé : id joueur, valeurs : ListeCartes ou liste de 2 cartes,
+            None (ou liste vide) si la main du joueur est inconnue.
+        board : ListeCartes | list[Carte], optional
+            Les cartes communes déjà distribuées (0, 3, 4 ou 5 cartes).
+        n_iterations : int
+            Le nombre de fins de main simulées (au plus MAX_ITERATIONS).
+        seed : int, optional
+            Graine du générateur pseudo-aléatoire, pour un résultat reproductible.
+        n_processus : int
+            Nombre de processus entre lesquels les itérations sont réparties ;
+            chaque processus dispose d'un flux aléatoire indépendant (SeedSequence.spawn) ;
+            au plus MAX_PROCESSUS (le nombre de cœurs). Les processus sont partagés entre
+            les appels (voir _executeur_partage).
+        mode : str
+            "monte_carlo", "exact" ou "auto".
+
+        Returns
+        -------
+        dict
+            Un dictionnaire clé : id joueur, valeurs : dict avec les clés
+            "victoire", "egalite" (probabilités) et "equite" (part de pot moyenne).
+        """
+        if len(mains) < 2:
+            raise ValueError("Il faut au moins deux joueurs pour calculer une équité.")
+        if mode not in MODES:
+            raise ValueError(f"Mode inconnu : {mode}. Modes possibles : {', '.join(MODES)}.")
+        if n_iterations <= 0 or n_processus <= 0:
+            raise ValueError("n_iterations et n_processus doivent être strictement positifs.")
+        if n_iterations > MAX_ITERATIONS:
+            raise ValueError(f"n_iterations ne peut pas dépasser {MAX_ITERATIONS}.")
+        if n_processus > MAX_PROCESSUS:
+            raise ValueError(f"n_processus ne peut pas dépasser {MAX_PROCESSUS}.")
+
+        ids_joueurs = list(mains)
+        codes_mains = [_codes_main(mains[id_joueur]) for id_joueur in ids_joueurs]
+        codes_board = _codes_main(board)
+        if any(len(main) not in (0, 2) for main in codes_mains):
+            raise ValueError("Chaque main doit contenir 2 cartes ou être inconnue.")
+        if len(codes_board) not in (0, 3, 4, 5):
+            raise ValueError("Le board doit contenir 0, 3, 4 ou 5 cartes.")
+
+        connues = [code for main in codes_mains for code in main] + codes_board
+        if len(set(connues)) != len(connues):
+            raise ValueError("Une même carte apparaît plusieurs fois.")
+
+        toutes_connues = all(codes_mains)
+        if mode == "auto":
+            mode = "exact" if toutes_connues and len(codes_mains) <= 3 and len(codes_board) >= MIN_BOARD_EXACT else "monte_carlo"
+        if mode == "exact":
+            if not toutes_connues:
+                raise ValueError("Le mode exact nécessite que toutes les mains soient connues.")
+            if len(codes_board) < MIN_BOARD_EXACT:
+                raise ValueError(f"Le mode exact nécessite au moins {MIN_BOARD_EXACT} cartes communes.")
+            victoires, egalites, parts, n_boards = _enumerer(
+                tuple(tuple(sorted(main)) for main in codes_mains), tuple(sorted(codes_board))
+            )
+            return self._formater(ids_joueurs, victoires, egalites, parts, n_boards)
+
+        codes_paquet = [code for code in encoder_cartes(ListeCartes().get_cartes()) if code not in set(connues)]
+
+        sequence = np.random.SeedSequence(seed)
+        if n_processus == 1:
+            victoires, egalites, parts = _simuler(codes_mains, codes_board, codes_paquet, n_iterations, sequence)
+        else:
+            repartition = [n_iterations // n_processus + (i < n_iterations % n_processus) for i in range(n_processus)]
+            resultats = list(_executeur_partage().map(
+                _simuler,
+                [codes_mains] * n_processus,
+                [codes_board] * n_processus,
+                [codes_paquet] * n_processus,
+                repartition,
+                sequence.spawn(n_processus),
+            ))
+            victoires, egalites, parts = (sum(colonne) for colonne in zip(*resultats))
+
+        return self._formater(ids_joueurs, victoires, egalites, parts, n_iterations)
+
+    @staticmethod
+    def _formater(ids_joueurs, victoires, egalites, parts, total) -> dict:
+        """Convertit les compteurs par joueur en probabilités."""
+        return {
+            id_joueur: {
+                "victoire": float(victoires[i]) / total,
+                "egalite": float(egalites[i]) / total,
+                "equite": float(parts[i]) / total,
+            }
+            for i, id_joueur in enumerate(ids_joueurs)
+        }
@@ -1,6 +1,7 @@
 from typing import Optional, List
 from src.utils.log_decorator import log
 from src.dao.joueur_partie_dao import JoueurPartieDao
+from src.dao.joueur_partie_dao_async import JoueurPartieDaoAsync
 from src.business_object.joueur_partie import JoueurPartie
 from src.business_object.joueur import Joueur
 from src.business_object.siege import Siege
@@ -84,6 +85,110 @@ class JoueurPartieService:
         joueur_partie.miser(montant)
         return True
 
+    @log
+    def miser_atomique(self, id_joueur: int, id_table: int, montant: float) -> Optional[dict]:
+        """Mise d'un joueur sur son crédit, enregistrée en une seule transaction.
+
+        Débite le crédit du joueur (s'il suffit), alimente le pot de la table, augmente
+        la mise du tour du joueur et enregistre la transaction.
+
+        Parameters
+        ----------
+        id_joueur : int
+            L'identifiant du joueur.
+        id_table : int
+            L'identifiant de la table.
+        montant : float
+            Le montant à miser.
+
+        Returns
+        -------
+        soldes : dict
+            Nouveaux crédit, mise du tour et pot (voir JoueurPartieDao.miser_atomique) ;
+            None si le crédit du joueur est insuffisant.
+        """
+        if montant <= 0:
+            raise ValueError("Le montant de la mise doit être positif.")
+        if not id_joueur or not id_table:
+            raise ValueError("id_joueur et id_table sont requis.")
+        return JoueurPartieDao().miser_atomique(id_joueur, id_table, montant)
+
+    @log
+    def acheter_tapis(self, id_joueur: int, id_table: int, tapis: float) -> Optional[float]:
+        """Assoit un joueur à une table avec un tapis débité de son crédit.
+
+        Parameters
+        ----------
+        id_joueur : int
+            L'identifiant du joueur.
+        id_table : int
+            L'identifiant de la table.
+        tapis : float
+            Le montant apporté à la table.
+
+        Returns
+        -------
+        credit : float
+            Nouveau crédit du joueur ; None si son crédit est insuffisant ou s'il est déjà assis à la table.
+        """
+        if tapis <= 0:
+            raise ValueError("Le tapis doit être strictement positif.")
+        if not id_joueur or not id_table:
+            raise ValueError("id_joueur et id_table sont requis.")
+        return JoueurPartieDao().acheter_tapis(id_joueur, id_table, tapis)
+
+    @log
+    def rendre_tapis(self, id_joueur: int, id_table: int, tapis: Optional[float] = None) -> Optional[float]:
+        """Lève un joueur d'une table et recrédite son tapis.
+
+        Parameters
+        ----------
+        id_joueur : int
+            L'identifiant du joueur.
+        id_table : int
+            L'identifiant de la table.
+        tapis : float, optional
+            Le tapis du joueur au moment où il quitte la table ; si None, son solde
+            de partie enregistré en base.
+
+        Returns
+        -------
+        credit : float
+            Nouveau crédit du joueur ; None s'il n'était pas assis à la table.
+        """
+        if tapis is not None and tapis < 0:
+            raise ValueError("Le tapis ne peut pas être négatif.")
+        if not id_joueur or not id_table:
+            raise ValueError("id_joueur et id_table sont requis.")
+        return JoueurPartieDao().rendre_tapis(id_joueur, id_table, tapis)
+
+    @log
+    async def miser_async(self, id_joueur: int, montant: int, id_table: int) -> bool:
+        """Mise d'un joueur enregistrée directement en base, sans bloquer la boucle d'événements.
+
+        Même effet que miser_atomique : le crédit du joueur est débité (s'il suffit), le pot
+        de la table et la mise du tour augmentent, la transaction est enregistrée.
+        Parameters
+        ----------
+        id_joueur : int
+            L'identifiant du joueur.
+        montant : int
+            Le montant à miser.
+        id_table : int
+            L'identifiant de la table où le joueur mise.
+        Returns
+        -------
+        success : bool
+            True si la mise a été effectuée avec succès.
+            False sinon (crédit insuffisant, joueur absent de la table).
+        """
+        if montant <= 0:
+            raise ValueError("Le montant de la mise doit être positif.")
+        if not id_joueur or not id_table:
+            raise ValueError("id_joueur et id_table sont requis.")
+
+        return await JoueurPartieDaoAsync().miser(id_joueur, montant, id_table)
+
     @log
     def se_coucher(self, id_joueur: int) -> bool:
         """Permet à un joueur de se coucher.
@@ -215,3 +320,21 @@ class JoueurPartieService:
         if not id_joueur or not id_table:
             raise ValueError("id_joueur et id_table sont requis.")
         return JoueurPartieDao().recuperer_statut(id_joueur, id_table)
+
+    @log
+    def obtenir_statuts(self, id_table: int) -> dict[int, str]:
+        """Retourne le statut de tous les joueurs d'une table, lus en une seule requête.
+
+        Parameters
+        ----------
+        id_table : int
+            L'identifiant de la table.
+
+        Returns
+        -------
+        statuts : dict[int, str]
+            Dictionnaire clé : id joueur, valeur : statut (vide si aucun joueur).
+        """
+        if not id_table:
+            raise ValueError("id_table est requis.")
+        return JoueurPartieDao().recuperer_statuts(id_table)
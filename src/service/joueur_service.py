@@ -1,6 +1,7 @@
 from typing import List, Optional, Dict
 from src.utils.log_decorator import log
 from src.dao.joueur_dao import JoueurDao
+from src.dao.joueur_dao_async import JoueurDaoAsync
 from src.dao.statistiques_dao import StatistiquesDao
 from src.business_object.joueur import Joueur
 from src.utils.securite import hash_password
@@ -56,6 +57,14 @@ class JoueurService:
 
         return JoueurDao().trouver_par_id(id_joueur)
 
+    @log
+    async def trouver_par_id_async(self, id_joueur: int) -> Optional[Joueur]:
+        """Version asynchrone de trouver_par_id (pour l'API)."""
+        if id_joueur is None:
+            raise ValueError("L'identifiant du joueur ne peut pas être vide.")
+
+        return await JoueurDaoAsync().trouver_par_id(id_joueur)
+
     @log
     def lister_tous(self, inclure_mdp=False) -> List[Joueur]:
         """Liste tous les joueurs.
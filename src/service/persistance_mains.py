@@ -0,0 +1,91 @@
+import logging
+import queue
+import threading
+import time
+
+from src.utils.singleton import Singleton
+
+from src.dao.partie_dao import PartieDao
+
+# Nombre de tentatives d'enregistrement d'une main avant abandon, et pause entre deux tentatives
+NB_TENTATIVES = 3
+PAUSE_TENTATIVE = 0.5
+
+
+class PersistanceMains(metaclass=Singleton):
+    """
+    Enregistrement différé (write-behind) des mains jouées par les moteurs de table
+
+    Les moteurs de table (MoteurTable) ne font aucune écriture pendant une main : à la fin
+    de chaque main, son résumé est placé dans une file et enregistré par un thread dédié
+    (une transaction par main, voir PartieDao.enregistrer_main). Les mains d'une même table
+    sont enregistrées dans l'ordre où elles ont été jouées.
+    """
+
+    def __init__(self):
+        self.__file = queue.Queue()
+        self.__thread = None
+        self.__verrou = threading.Lock()
+        self.nb_echecs = 0
+
+    def soumettre(self, resume):
+        """Place le résumé d'une main dans la file d'enregistrement (retour immédiat)"""
+        with self.__verrou:
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__thread = threading.Thread(target=self.__boucle, name="persistance-mains", daemon=True)
+                self.__thread.start()
+        self.__file.put(resume)
+
+    def vider(self, delai: float = None) -> bool:
+        """Attend que toutes les mains soumises soient enregistrées
+
+        Parameters
+        ----------
+        delai : float, optional
+            Attente maximale en secondes (sans limite si None).
+
+        Returns
+        -------
+        vide : bool
+            True si la file a été vidée dans le délai
+        """
+        fin = None if delai is None else time.monotonic() + delai
+        while self.__file.unfinished_tasks:
+            if fin is not None and time.monotonic() >= fin:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def arreter(self, delai: float = None):
+        """Enregistre les mains en attente puis arrête le thread d'enregistrement"""
+        self.vider(delai)
+        with self.__verrou:
+            if self.__thread is not None and self.__thread.is_alive():
+                self.__file.put(None)
+                self.__thread.join(delai)
+            self.__thread = None
+
+    def __boucle(self):
+        while True:
+            resume = self.__file.get()
+            try:
+                if resume is None:
+                    return
+                self.__enregistrer(resume)
+            finally:
+                self.__file.task_done()
+
+    def __enregistrer(self, resume):
+        for tentative in range(1, NB_TENTATIVES + 1):
+            try:
+                if PartieDao().enregistrer_main(resume) is not None:
+                    return
+            except Exception as e:
+                logging.exception("Erreur lors de l'enregistrement de la main")
+            if tentative < NB_TENTATIVES:
+                time.sleep(PAUSE_TENTATIVE)
+        self.nb_echecs += 1
+        logging.error(
+            "Main %s de la table %s non enregistrée après %s tentatives",
+            resume.numero, resume.id_table, NB_TENTATIVES,
+        )
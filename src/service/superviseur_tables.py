@@ -0,0 +1,299 @@
+"""Serveur de tables réparti sur plusieurs processus.
+
+Un moteur de table (MoteurTable) est du code Python pur : dans un seul processus, toutes les
+tables se partagent un cœur à cause du GIL. Le superviseur lance N processus de tables, chacun
+propriétaire d'un ensemble disjoint de tables ; la table d'un identifiant est choisie par hachage
+cohérent (AnneauHachage). Le front FastAPI transmet chaque requête d'une table au processus qui la
+possède, par un tube (multiprocessing.Pipe).
+
+A l'arrêt du superviseur, chaque table ouverte est fermée (main en cours annulée) et les tapis des
+joueurs assis sont recrédités sur leur crédit.
+
+Ajouter un processus ne déplace que les tables que l'anneau lui attribue : leur moteur, main en
+cours comprise, est exporté (pickle) de l'ancien processus puis importé dans le nouveau.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+
+from src.utils.singleton import Singleton
+from src.utils.anneau_hachage import AnneauHachage
+
+from src.business_object.moteur_table import MoteurTable
+
+# Délai maximal d'enregistrement des mains en attente à l'arrêt d'un processus
+DELAI_ARRET = 10.0
+
+# Commandes transmises telles quelles au moteur de la table
+COMMANDES_MOTEUR = ("ajouter_joueur", "retirer_joueur", "nouvelle_main", "agir", "main")
+
+
+def _rendre_tapis(id_table: int, id_joueur: int, tapis: float):
+    """Lève un joueur de la table en base et recrédite son tapis (restitution par défaut)"""
+    from src.dao.joueur_partie_dao import JoueurPartieDao
+
+    if JoueurPartieDao().rendre_tapis(id_joueur, id_table, tapis) is None:
+        logging.error("Tapis du joueur %s à la table %s non recrédité", id_joueur, id_table)
+
+
+def _executer(moteurs: dict, commande: str, id_table: int, args: tuple):
+    """Exécute une commande du superviseur dans le processus de tables"""
+    from src.service.persistance_mains import PersistanceMains
+
+    if commande == "ouvrir":
+        if id_table in moteurs:
+            return False
+        moteurs[id_table] = MoteurTable(id_table, *args, persister=PersistanceMains().soumettre)
+        return True
+    if commande == "importer":
+        moteur = args[0]
+        moteur.persister = PersistanceMains().soumettre
+        moteurs[id_table] = moteur
+        return True
+    if commande == "etat":
+        return moteurs[id_table].en_dict() if id_table in moteurs else None
+    if id_table not in moteurs:
+        raise ValueError(f"La table {id_table} n'est pas ouverte.")
+    if commande == "exporter":
+        return moteurs.pop(id_table)
+    if commande == "fermer":
+        moteur = moteurs.pop(id_table)
+        moteur.annuler_main()
+        return {id_joueur: moteur.tapis(id_joueur) for id_joueur in moteur.sieges}
+    if commande in COMMANDES_MOTEUR:
+        return getattr(moteurs[id_table], commande)(*args)
+    raise ValueError(f"Commande inconnue : {commande}")
+
+
+def _boucle_processus(connexion):
+    """Boucle d'un processus de tables : reçoit (commande, id_table, args), renvoie (ok, résultat)"""
+    from src.service.persistance_mains import PersistanceMains
+
+    moteurs = {}
+    while True:
+        try:
+            commande, id_table, args = connexion.recv()
+        except EOFError:
+            commande = "arreter"
+        if commande == "arreter":
+            PersistanceMains().arreter(DELAI_ARRET)
+            connexion.close()
+            return
+        try:
+            connexion.send((True, _executer(moteurs, commande, id_table, args)))
+        except ValueError as e:
+            connexion.send((False, str(e)))
+        except Exception as e:
+            logging.exception("Erreur du processus de tables")
+            connexion.send((False, f"Erreur interne : {e}"))
+
+
+class _ProcessusTables:
+    """Processus de tables et tube de communication (une requête à la fois)"""
+
+    def __init__(self, contexte):
+        self.connexion, connexion_fille = contexte.Pipe()
+        self.processus = contexte.Process(target=_boucle_processus, args=(connexion_fille,), daemon=True)
+        self.processus.start()
+        connexion_fille.close()
+        self.verrou = threading.Lock()
+
+    def envoyer(self, commande: str, id_table: int = None, args: tuple = ()):
+        """Envoie une commande et attend la réponse (à appeler avec le verrou)"""
+        self.connexion.send((commande, id_table, args))
+        ok, resultat = self.connexion.recv()
+        if not ok:
+            raise ValueError(resultat)
+        return resultat
+
+    def arreter(self):
+        with self.verrou:
+            try:
+                self.connexion.send(("arreter", None, ()))
+            except (BrokenPipeError, OSError):
+                pass
+        self.processus.join(DELAI_ARRET)
+        self.connexion.close()
+
+
+class SuperviseurTables(metaclass=Singleton):
+    """
+    Superviseur des processus de tables
+
+    Les processus sont lancés au premier appel. Leur nombre est lu dans la variable
+    d'environnement POKER_PROCESSUS_TABLES (par défaut, le nombre de cœurs), et le nombre
+    maximal de processus (ajouter_processus compris) dans POKER_PROCESSUS_TABLES_MAX
+    (par défaut, le plus grand des deux).
+    Les erreurs de jeu (action illégale, table non ouverte, ...) sont levées en ValueError.
+    """
+
+    def __init__(self, nb_processus: int = None, nb_max: int = None, restituer=None):
+        """
+        Parameters
+        ----------
+        nb_processus : int, optional
+            Nombre de processus lancés au démarrage (POKER_PROCESSUS_TABLES si None).
+        nb_max : int, optional
+            Nombre maximal de processus (POKER_PROCESSUS_TABLES_MAX si None).
+        restituer : callable, optional
+            Appelée avec (id_table, id_joueur, tapis) pour chaque joueur encore assis à l'arrêt
+            du superviseur (par défaut, le tapis est recrédité en base).
+        """
+        self.__nb_initial = nb_processus or int(os.environ.get("POKER_PROCESSUS_TABLES", os.cpu_count() or 1))
+        self.nb_max = nb_max or int(
+            os.environ.get("POKER_PROCESSUS_TABLES_MAX", max(self.__nb_initial, os.cpu_count() or 1))
+        )
+        self.__restituer = restituer or _rendre_tapis
+        self.__contexte = multiprocessing.get_context("spawn")
+        self.__processus = []
+        self.__anneau = AnneauHachage()
+        self.__tables = {}
+        self.__verrou = threading.RLock()
+
+    @property
+    def nb_processus(self) -> int:
+        """Nombre de processus de tables lancés"""
+        return len(self.__processus)
+
+    def processus_de(self, id_table: int) -> int:
+        """Indice du processus propriétaire d'une table (ouverte ou non)"""
+        self.__demarrer()
+        return self.__tables.get(id_table, self.__anneau.noeud(id_table))
+
+    def tables(self) -> dict:
+        """Dictionnaire clé : id table ouverte, valeur : indice de son processus"""
+        return dict(self.__tables)
+
+    # ------------------------------------------------------------------ tables
+
+    def ouvrir_table(self, id_table: int, blind: float) -> bool:
+        """Ouvre le moteur d'une table dans son processus ; False s'il était déjà ouvert"""
+        self.__demarrer()
+        with self.__verrou:
+            indice = self.__anneau.noeud(id_table)
+            processus = self.__processus[indice]
+            with processus.verrou:
+                ouverte = processus.envoyer("ouvrir", id_table, (blind,))
+            self.__tables[id_table] = indice
+            return ouverte
+
+    def fermer_table(self, id_table: int) -> dict:
+        """Ferme le moteur d'une table ; renvoie les tapis des joueurs encore assis"""
+        with self.__verrou:
+            soldes = self.__envoyer(id_table, "fermer")
+            self.__tables.pop(id_table, None)
+            return soldes
+
+    def etat(self, id_table: int) -> dict:
+        """Etat public de la table (voir MoteurTable.en_dict), None si elle n'est pas ouverte"""
+        if id_table not in self.__tables:
+            return None
+        return self.__envoyer(id_table, "etat")
+
+    def ajouter_joueur(self, id_table: int, id_joueur: int, tapis: float):
+        self.__envoyer(id_table, "ajouter_joueur", (id_joueur, tapis))
+
+    def retirer_joueur(self, id_table: int, id_joueur: int) -> float:
+        return self.__envoyer(id_table, "retirer_joueur", (id_joueur,))
+
+    def nouvelle_main(self, id_table: int):
+        self.__envoyer(id_table, "nouvelle_main")
+
+    def agir(self, id_table: int, id_joueur: int, action: str, montant: float = 0.0):
+        """Applique une action ; renvoie le ResumeMain si elle termine la main, None sinon"""
+        return self.__envoyer(id_table, "agir", (id_joueur, action, montant))
+
+    def main(self, id_table: int, id_joueur: int) -> list[str]:
+        """Cartes privées d'un joueur pour la main en cours (liste vide s'il n'y participe pas)"""
+        return [str(carte) for carte in self.__envoyer(id_table, "main", (id_joueur,))]
+
+    # ------------------------------------------------------------------ processus
+
+    def ajouter_processus(self) -> int:
+        """Lance un processus de plus et lui transfère les tables que l'anneau lui attribue
+
+        Returns
+        -------
+        nb_deplacees : int
+            Nombre de tables déplacées vers le nouveau processus
+
+        Raises
+        ------
+        ValueError
+            Si le nombre maximal de processus (nb_max) est déjà atteint
+        """
+        self.__demarrer()
+        with self.__verrou:
+            indice = len(self.__processus)
+            if indice >= self.nb_max:
+                raise ValueError(f"Nombre maximal de processus de tables atteint ({self.nb_max}).")
+            nouveau = _ProcessusTables(self.__contexte)
+            self.__processus.append(nouveau)
+            self.__anneau.ajouter(indice)
+            nb_deplacees = 0
+            for id_table, ancien_indice in list(self.__tables.items()):
+                if self.__anneau.noeud(id_table) != indice:
+                    continue
+                ancien = self.__processus[ancien_indice]
+                # l'ancien processus reste verrouillé jusqu'à la mise à jour de __tables :
+                # une requête en attente sur ce verrou sera redirigée vers le nouveau processus
+                with ancien.verrou:
+                    moteur = ancien.envoyer("exporter", id_table)
+                    try:
+                        with nouveau.verrou:
+                            nouveau.envoyer("importer", id_table, (moteur,))
+                    except Exception:
+                        # la table reste dans l'ancien processus, main en cours et tapis compris
+                        logging.exception("Table %s non déplacée vers le processus %s", id_table, indice)
+                        ancien.envoyer("importer", id_table, (moteur,))
+                        continue
+                    self.__tables[id_table] = indice
+                nb_deplacees += 1
+            logging.info("Processus de tables %s ajouté, %s table(s) déplacée(s)", indice, nb_deplacees)
+            return nb_deplacees
+
+    def arreter(self):
+        """Arrête les processus de tables
+
+        Chaque table ouverte est d'abord fermée : la main en cours est annulée et le tapis de
+        chaque joueur assis lui est restitué. Les mains terminées sont enregistrées avant l'arrêt.
+        """
+        with self.__verrou:
+            for id_table in list(self.__tables):
+                try:
+                    soldes = self.fermer_table(id_table)
+                except Exception:
+                    logging.exception("Fermeture de la table %s impossible", id_table)
+                    continue
+                for id_joueur, tapis in soldes.items():
+                    try:
+                        self.__restituer(id_table, id_joueur, tapis)
+                    except Exception:
+                        logging.exception("Tapis du joueur %s à la table %s non restitué", id_joueur, id_table)
+            for processus in self.__processus:
+                processus.arreter()
+            self.__processus = []
+            self.__anneau = AnneauHachage()
+            self.__tables = {}
+
+    def __demarrer(self):
+        if self.__processus:
+            return
+        with self.__verrou:
+            while len(self.__processus) < self.__nb_initial:
+                self.__anneau.ajouter(len(self.__processus))
+                self.__processus.append(_ProcessusTables(self.__contexte))
+
+    def __envoyer(self, id_table: int, commande: str, args: tuple = ()):
+        """Transmet une commande au processus propriétaire de la table"""
+        while True:
+            indice = self.__tables.get(id_table)
+            if indice is None:
+                raise ValueError(f"La table {id_table} n'est pas ouverte.")
+            processus = self.__processus[indice]
+            with processus.verrou:
+                # la table a pu être déplacée pendant l'attente du verrou
+                if self.__tables.get(id_table) == indice:
+                    return processus.envoyer(commande, id_table, args)
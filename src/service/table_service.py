@@ -5,7 +5,9 @@ from src.business_object.table import Table
 from src.business_object.joueur import Joueur
 from src.business_object.accesspartie import AccessPartie
 from src.business_object.liste_cartes import ListeCartes
+from src.business_object.etat_table import EtatTable
 from src.dao.table_dao import TableDao
+from src.dao.table_dao_async import TableDaoAsync
 
 class TableService :
     """Classe contenant les méthodes de service des tables"""
@@ -102,6 +104,11 @@ class TableService :
         """
         return TableDao().get_cartes_communess(id_table)
 
+    @log
+    async def get_cartes_communes_async(self, id_table: int) -> dict:
+        """Version asynchrone de get_cartes_communes (pour l'API)."""
+        return await TableDaoAsync().get_cartes_communes(id_table)
+
     @log
     def alimenter_pot(self, id_table: int, montant: float) -> bool:
         """Ajoute une somme au pot de la table."""
@@ -116,10 +123,38 @@ class TableService :
             raise ValueError("Le montant doit être positif pour retirer du pot.")
         return TableDao().retirer_pot(id_table, montant)
 
+    @log
+    def distribuer_pot(self, id_table: int, gains: dict) -> bool:
+        """Crédite les gagnants et vide le pot de la table en une seule transaction.
+
+        Parameters
+        ----------
+        id_table : int
+            Identifiant de la table.
+        gains : dict
+            Dictionnaire clé : id joueur, valeur : montant remporté. En cas de pots
+            secondaires, un joueur reçoit la somme de ses gains sur chaque pot.
+
+        Returns
+        -------
+        bool
+            True si le pot a été distribué.
+        """
+        if not id_table:
+            raise ValueError("id_table requis.")
+        if any(montant < 0 for montant in gains.values()):
+            raise ValueError("Les gains doivent être positifs.")
+        return TableDao().distribuer_pot(id_table, gains)
+
     @log
     def get_pot(self, id_table: int) -> float:
         """Récupère le montant actuel du pot de la table."""
         return TableDao().get_pot(id_table)
+
+    @log
+    async def get_pot_async(self, id_table: int) -> float:
+        """Version asynchrone de get_pot (pour l'API)."""
+        return await TableDaoAsync().get_pot(id_table)
     
     @log
     def set_val_derniere_mise(self, id_table: int, montant: float) -> bool:
@@ -153,4 +188,39 @@ class TableService :
             raise ValueError("id_table requis.")
         return TableDao().set_id_joueur_bouton(id_table, id_joueur_bouton)
 
+    @log
+    def etat_table(self, id_table: int) -> EtatTable:
+        """Retourne l'état complet de la table (pot, dernière mise, tour, bouton,
+        cartes communes, joueurs et statuts), lu en une seule requête."""
+        if not id_table:
+            raise ValueError("id_table requis.")
+        return TableDao().snapshot(id_table)
+
+    @log
+    async def etat_table_async(self, id_table: int) -> EtatTable:
+        """Version asynchrone de etat_table (pour l'API)."""
+        if not id_table:
+            raise ValueError("id_table requis.")
+        return await TableDaoAsync().snapshot(id_table)
+
+    @log
+    def annoncer_resultat(self, id_table: int, gagnants: list[int], combinaison: str = None,
+                          pot: float = 0.0) -> bool:
+        """Diffuse le résultat d'une main aux clients qui suivent la table.
+
+        Parameters
+        ----------
+        id_table : int
+            Identifiant de la table.
+        gagnants : list[int]
+            Identifiants des gagnants (plusieurs en cas de partage du pot).
+        combinaison : str, optional
+            Combinaison gagnante (None si tous les autres joueurs se sont couchés).
+        pot : float
+            Montant du pot remporté.
+        """
+        if not id_table:
+            raise ValueError("id_table requis.")
+        resultat = {"gagnants": list(gagnants), "combinaison": combinaison, "pot": float(pot)}
+        return TableDao().annoncer_resultat(id_table, resultat)
 
@@ -0,0 +1,42 @@
+import pytest
+
+from src.utils.anneau_hachage import AnneauHachage
+
+
+class TestAnneauHachage:
+    def test_noeud_stable(self):
+        # GIVEN
+        anneau = AnneauHachage([0, 1, 2])
+
+        # WHEN / THEN
+        assert all(anneau.noeud(cle) == AnneauHachage([0, 1, 2]).noeud(cle) for cle in range(100))
+        assert {anneau.noeud(cle) for cle in range(100)} == {0, 1, 2}
+
+    def test_ajouter_ne_deplace_que_vers_le_nouveau_noeud(self):
+        # GIVEN
+        anneau = AnneauHachage([0, 1, 2])
+        avant = {cle: anneau.noeud(cle) for cle in range(1000)}
+
+        # WHEN
+        anneau.ajouter(3)
+
+        # THEN
+        deplacees = [cle for cle in avant if anneau.noeud(cle) != avant[cle]]
+        assert deplacees
+        assert all(anneau.noeud(cle) == 3 for cle in deplacees)
+        assert len(deplacees) < 500
+
+    def test_retirer(self):
+        # GIVEN
+        anneau = AnneauHachage([0, 1])
+
+        # WHEN
+        anneau.retirer(1)
+
+        # THEN
+        assert {anneau.noeud(cle) for cle in range(50)} == {0}
+
+    def test_anneau_vide(self):
+        # GIVEN / WHEN / THEN
+        with pytest.raises(ValueError):
+            AnneauHachage().noeud(1)
@@ -0,0 +1,189 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from src.utils.cache import CacheResultats, cache_resultat, invalide_cache, signaler_echec
+from src.utils.singleton import Singleton
+
+
+@pytest.fixture(autouse=True)
+def cache_neuf():
+    """Chaque test construit son propre CacheResultats (singleton)"""
+    with patch.dict(Singleton._instances, clear=True):
+        yield
+
+
+class Horloge:
+    def __init__(self):
+        self.temps = 0.0
+
+    def __call__(self):
+        return self.temps
+
+
+class DaoFactice:
+    def __init__(self):
+        self.nb_appels = 0
+
+    @cache_resultat("joueur")
+    def lire(self, id_joueur, limite=10):
+        self.nb_appels += 1
+        return {"id_joueur": id_joueur, "limite": limite}
+
+    @cache_resultat("joueur")
+    def lire_en_echec(self):
+        self.nb_appels += 1
+        signaler_echec()
+        return []
+
+    @cache_resultat("joueur")
+    def lire_composee(self):
+        self.nb_appels += 1
+        return {"joueur": self.lire(1), "echec": self.lire_en_echec()}
+
+    @invalide_cache("joueur")
+    def ecrire(self):
+        return True
+
+    @invalide_cache("joueur")
+    async def ecrire_async(self):
+        return True
+
+
+class TestCacheResultats:
+    def test_ttl(self):
+        # GIVEN
+        horloge = Horloge()
+        cache = CacheResultats(ttl=10, taille_max=10, horloge=horloge)
+        cache.mettre("cle", 1)
+
+        # WHEN / THEN
+        horloge.temps = 9
+        assert cache.lire("cle") == (True, 1)
+        horloge.temps = 10
+        assert cache.lire("cle") == (False, None)
+        assert cache.statistiques()["nb_entrees"] == 0
+
+    def test_eviction_lru(self):
+        # GIVEN
+        cache = CacheResultats(ttl=10, taille_max=2)
+        cache.mettre("a", 1)
+        cache.mettre("b", 2)
+        cache.lire("a")
+
+        # WHEN
+        cache.mettre("c", 3)
+
+        # THEN : b est la moins récemment utilisée
+        assert cache.lire("b") == (False, None)
+        assert cache.lire("a") == (True, 1)
+        assert cache.lire("c") == (True, 3)
+        assert cache.nb_evictions == 1
+
+    def test_invalider_par_table(self):
+        # GIVEN
+        cache = CacheResultats(ttl=10, taille_max=10)
+        cache.mettre("joueurs", 1, tables=("joueur",))
+        cache.mettre("parties", 2, tables=("partie",))
+
+        # WHEN
+        cache.invalider("joueur")
+
+        # THEN
+        assert cache.lire("joueurs") == (False, None)
+        assert cache.lire("parties") == (True, 2)
+
+    def test_resultat_calcule_avant_invalidation_non_garde(self):
+        # GIVEN
+        cache = CacheResultats(ttl=10, taille_max=10)
+        generation = cache.generation
+        cache.invalider("joueur")
+
+        # WHEN
+        cache.mettre("cle", 1, tables=("joueur",), generation=generation)
+
+        # THEN
+        assert cache.lire("cle") == (False, None)
+
+    def test_statistiques(self):
+        # GIVEN
+        cache = CacheResultats(ttl=10, taille_max=10)
+        cache.mettre("cle", 1)
+
+        # WHEN
+        cache.lire("cle")
+        cache.lire("absente")
+
+        # THEN
+        stats = cache.statistiques()
+        assert stats["nb_succes"] == 1
+        assert stats["nb_echecs"] == 1
+        assert stats["taux_succes"] == 0.5
+
+
+class TestDecorateurs:
+    def test_cache_resultat_par_arguments(self):
+        # GIVEN
+        CacheResultats(ttl=10, taille_max=10)
+        dao = DaoFactice()
+
+        # WHEN
+        premier = dao.lire(1)
+        premier["limite"] = 0
+        second = dao.lire(1)
+        dao.lire(1, limite=5)
+
+        # THEN : une copie est rendue, les arguments font partie de la clé
+        assert second == {"id_joueur": 1, "limite": 10}
+        assert dao.nb_appels == 2
+
+    def test_invalide_cache(self):
+        # GIVEN
+        CacheResultats(ttl=10, taille_max=10)
+        dao = DaoFactice()
+        dao.lire(1)
+
+        # WHEN
+        dao.ecrire()
+        dao.lire(1)
+        asyncio.run(dao.ecrire_async())
+        dao.lire(1)
+
+        # THEN
+        assert dao.nb_appels == 3
+
+    def test_ttl_nul_desactive_le_cache(self):
+        # GIVEN
+        CacheResultats(ttl=0, taille_max=10)
+        dao = DaoFactice()
+
+        # WHEN
+        dao.lire(1)
+        dao.lire(1)
+
+        # THEN
+        assert dao.nb_appels == 2
+
+    def test_echec_non_garde(self):
+        # GIVEN
+        CacheResultats(ttl=10, taille_max=10)
+        dao = DaoFactice()
+
+        # WHEN
+        dao.lire_en_echec()
+        dao.lire_en_echec()
+
+        # THEN
+        assert dao.nb_appels == 2
+
+    def test_echec_d_un_appel_imbrique_non_garde(self):
+        # GIVEN
+        CacheResultats(ttl=10, taille_max=10)
+        dao = DaoFactice()
+
+        # WHEN : lire_composee appelle lire (réussie) et lire_en_echec
+        dao.lire_composee()
+        dao.lire_composee()
+
+        # THEN : seule lire est gardée
+        assert dao.nb_appels == 5
@@ -24,4 +24,44 @@ class TestCarte():
         # WHEN / THEN
         with pytest.raises(ValueError) as excinfo:
             Carte(valeur, couleur)
-        assert "non valide" in str(excinfo.value)
\ No newline at end of file
+        assert "non valide" in str(excinfo.value)
+
+    def test_carte_instance_partagee(self):
+        # GIVEN
+        carte = Carte("As", "Pique")
+
+        # WHEN
+        meme_carte = Carte.from_str("As de pique")
+
+        # THEN
+        assert carte is meme_carte
+        assert hash(carte) == carte.code
+
+    def test_carte_code(self):
+        # GIVEN
+        carte = Carte("As", "Trêfle")
+
+        # WHEN / THEN
+        assert carte.indice_rang == 12
+        assert carte.code == 51
+        assert Carte.depuis_code(carte.code) is carte
+        assert {c.code for c in (Carte(v, co) for v in Carte.VALEURS() for co in Carte.COULEURS())} == set(range(52))
+
+    def test_carte_immuable(self):
+        # GIVEN
+        carte = Carte("Roi", "Coeur")
+
+        # WHEN / THEN
+        with pytest.raises(AttributeError):
+            carte.valeur = "Dame"
+
+    def test_carte_pickle(self):
+        # GIVEN
+        import pickle
+        carte = Carte("10", "Carreau")
+
+        # WHEN
+        copie = pickle.loads(pickle.dumps(carte))
+
+        # THEN
+        assert copie is carte
@@ -0,0 +1,35 @@
+import random
+from src.business_object.croupier import Croupier
+from src.business_object.liste_cartes import ListeCartes
+
+
+class TestCroupier():
+    def test_donne_rejouable_avec_graine(self):
+        # GIVEN
+        croupier_1 = Croupier(ListeCartes(rng=random.Random(42)))
+        croupier_2 = Croupier(ListeCartes(rng=random.Random(42)))
+
+        # WHEN
+        mains_1 = croupier_1.distribuer2([1, 2, 3], 2)
+        mains_2 = croupier_2.distribuer2([1, 2, 3], 2)
+        flop_1, flop_2 = croupier_1.distribuer_flop(), croupier_2.distribuer_flop()
+
+        # THEN
+        assert {k: v.get_cartes() for k, v in mains_1.items()} == {k: v.get_cartes() for k, v in mains_2.items()}
+        assert flop_1.get_cartes() == flop_2.get_cartes()
+        assert croupier_1.distribuer_turn() == croupier_2.distribuer_turn()
+        assert croupier_1.distribuer_river() == croupier_2.distribuer_river()
+
+    def test_distribution_sans_doublon(self):
+        # GIVEN
+        croupier = Croupier(ListeCartes(rng=random.Random(7)))
+
+        # WHEN
+        mains = croupier.distribuer2([1, 2], 2)
+        cartes = [c for main in mains.values() for c in main.get_cartes()]
+        cartes += croupier.distribuer_flop().get_cartes()
+        cartes += [croupier.distribuer_turn(), croupier.distribuer_river()]
+
+        # THEN
+        assert len(set(cartes)) == 9
+        assert len(croupier.pioche) == 43
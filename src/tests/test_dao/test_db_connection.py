@@ -0,0 +1,86 @@
+import os
+import pytest
+import psycopg2
+
+from unittest.mock import patch, MagicMock
+
+from src.utils.singleton import Singleton
+from src.dao.db_connection import DBConnection
+
+ENV = {
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DATABASE": "test",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_POOL_MIN": "1",
+    "POSTGRES_POOL_MAX": "2",
+    "POSTGRES_POOL_IDLE": "60",
+    "POSTGRES_POOL_TIMEOUT": "0.1",
+}
+
+
+@pytest.fixture
+def db_connection():
+    """DBConnection neuve sur un pool simulé (aucune base nécessaire)"""
+    with patch.dict(os.environ, ENV), patch.dict(Singleton._instances, clear=True), \
+         patch("src.dao.db_connection.dotenv.load_dotenv"), \
+         patch("src.dao.db_connection.ThreadedConnectionPool") as mock_pool_classe:
+        mock_pool = mock_pool_classe.return_value
+        mock_pool.getconn.side_effect = lambda: MagicMock(closed=0)
+        yield DBConnection(), mock_pool
+
+
+def test_connection_commit_et_rend_au_pool(db_connection):
+    # GIVEN
+    db, mock_pool = db_connection
+
+    # WHEN
+    with db.connection as connection:
+        pass
+
+    # THEN
+    connection.commit.assert_called_once()
+    connection.cursor.assert_not_called()  # pas de SELECT 1 à chaque emprunt
+    mock_pool.putconn.assert_called_once_with(connection, close=False)
+
+
+def test_connection_rollback_si_exception(db_connection):
+    # GIVEN
+    db, mock_pool = db_connection
+
+    # WHEN
+    with pytest.raises(ValueError):
+        with db.connection as connection:
+            raise ValueError("erreur")
+
+    # THEN
+    connection.rollback.assert_called_once()
+    connection.commit.assert_not_called()
+    mock_pool.putconn.assert_called_once_with(connection, close=False)
+
+
+def test_connection_cassee_fermee(db_connection):
+    # GIVEN
+    db, mock_pool = db_connection
+
+    # WHEN
+    with pytest.raises(psycopg2.OperationalError):
+        with db.connection as connection:
+            raise psycopg2.OperationalError("connexion perdue")
+
+    # THEN
+    mock_pool.putconn.assert_called_once_with(connection, close=True)
+
+
+def test_pool_borne(db_connection):
+    # GIVEN
+    db, mock_pool = db_connection
+
+    # WHEN / THEN : POSTGRES_POOL_MAX = 2, la troisième demande attend puis échoue
+    with db.connection, db.connection:
+        with pytest.raises(psycopg2.pool.PoolError):
+            with db.connection:
+                pass
+    with db.connection:
+        pass
@@ -2,13 +2,18 @@
 Tests unitaires pour le module JoueurPartieDao
 """
 
+import asyncio
 import os
 import pytest
 from datetime import datetime
+from unittest.mock import patch
 
 from src.utils.reset_database import ResetDatabase
+from src.utils.singleton import Singleton
 from src.dao.db_connection import DBConnection
+from src.dao.db_connection_async import DBConnectionAsync
 from src.dao.joueur_partie_dao import JoueurPartieDao
+from src.dao.joueur_partie_dao_async import JoueurPartieDaoAsync
 from src.dao.joueur_dao import JoueurDao
 from src.business_object.joueur_partie import JoueurPartie
 from src.business_object.joueur import Joueur
@@ -567,6 +572,198 @@ def test_recuperer_statut_ko():
     assert statut is None
 
 
+def test_recuperer_statuts_table(setup_joueur_test, setup_table_test):
+    """Test de récupération en une requête des statuts de tous les joueurs d'une table"""
+
+    # GIVEN
+    id_joueur = setup_joueur_test
+    id_table = setup_table_test
+
+    joueur = Joueur(pseudo="JoueurTest", mail="joueur@test.com", mdp="hash123",
+                    age=30, credit=Monnaie(1000), id_joueur=id_joueur)
+    JoueurPartieDao().creer(JoueurPartie(joueur=joueur, siege=Siege(id_siege=1), solde_partie=500), id_table)
+    JoueurPartieDao().modifier_statut(id_joueur, id_table, "en jeu")
+
+    # WHEN
+    statuts = JoueurPartieDao().recuperer_statuts(id_table)
+
+    # THEN
+    assert statuts == {id_joueur: "en jeu"}
+    assert JoueurPartieDao().recuperer_statuts(999999) == {}
+
+
+def test_miser_atomique(setup_joueur_test, setup_table_test):
+    """Test de la mise en une requête : crédit, mise du tour, pot et transaction"""
+
+    # GIVEN
+    id_joueur = setup_joueur_test
+    id_table = setup_table_test
+    joueur = Joueur(pseudo="JoueurTest", mail="joueur@test.com", mdp="hash123",
+                    age=30, credit=Monnaie(1000), id_joueur=id_joueur)
+    JoueurPartieDao().creer(JoueurPartie(joueur=joueur, siege=Siege(id_siege=1), solde_partie=500), id_table)
+
+    # WHEN
+    soldes = JoueurPartieDao().miser_atomique(id_joueur, id_table, 30)
+
+    # THEN
+    assert soldes["credit"] == 970
+    assert soldes["mise_tour"] == 30
+    assert soldes["pot"] == 30
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT solde FROM transaction WHERE id_transaction = %(id)s;",
+                           {"id": soldes["id_transaction"]})
+            assert cursor.fetchone()["solde"] == -30
+
+
+def test_miser_atomique_credit_insuffisant(setup_joueur_test, setup_table_test):
+    """Test de la mise refusée : rien n'est modifié si le crédit ne suffit pas"""
+
+    # GIVEN
+    id_joueur = setup_joueur_test
+    id_table = setup_table_test
+    joueur = Joueur(pseudo="JoueurTest", mail="joueur@test.com", mdp="hash123",
+                    age=30, credit=Monnaie(1000), id_joueur=id_joueur)
+    JoueurPartieDao().creer(JoueurPartie(joueur=joueur, siege=Siege(id_siege=1), solde_partie=500), id_table)
+
+    # WHEN
+    soldes = JoueurPartieDao().miser_atomique(id_joueur, id_table, 5000)
+
+    # THEN
+    assert soldes is None
+    assert JoueurPartieDao().miser_atomique(id_joueur, 999999, 10) is None
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT credit FROM joueur WHERE id_joueur = %(id)s;", {"id": id_joueur})
+            assert cursor.fetchone()["credit"] == 1000
+            cursor.execute("SELECT pot FROM table_poker WHERE id_table = %(id)s;", {"id": id_table})
+            assert cursor.fetchone()["pot"] == 0
+
+
+def test_acheter_puis_rendre_tapis(setup_joueur_test, setup_table_test):
+    """Test de l'achat du tapis (crédit débité, place créée) puis de son retour au crédit"""
+
+    # GIVEN
+    id_joueur = setup_joueur_test
+    id_table = setup_table_test
+
+    # WHEN
+    credit_assis = JoueurPartieDao().acheter_tapis(id_joueur, id_table, 300)
+    deja_assis = JoueurPartieDao().acheter_tapis(id_joueur, id_table, 100)
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT solde_partie FROM partie_joueur WHERE id_table = %(t)s AND id_joueur = %(j)s;",
+                {"t": id_table, "j": id_joueur},
+            )
+            solde_partie = cursor.fetchone()["solde_partie"]
+    credit_leve = JoueurPartieDao().rendre_tapis(id_joueur, id_table, 450)
+
+    # THEN
+    assert credit_assis == 700
+    assert deja_assis is None
+    assert solde_partie == 300
+    assert credit_leve == 1150
+    assert JoueurPartieDao().trouver_par_table(id_table) is None
+    assert JoueurPartieDao().rendre_tapis(id_joueur, id_table, 450) is None
+
+
+def test_rendre_tapis_solde_en_base(setup_joueur_test, setup_table_test):
+    """Test du retour du tapis sans moteur ouvert : le solde de la place est recrédité"""
+
+    # GIVEN
+    id_joueur = setup_joueur_test
+    id_table = setup_table_test
+    JoueurPartieDao().acheter_tapis(id_joueur, id_table, 300)
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE partie_joueur SET solde_partie = 420 WHERE id_table = %(t)s AND id_joueur = %(j)s;",
+                {"t": id_table, "j": id_joueur},
+            )
+
+    # WHEN
+    credit = JoueurPartieDao().rendre_tapis(id_joueur, id_table)
+
+    # THEN
+    assert credit == 1120
+    assert JoueurPartieDao().trouver_par_table(id_table) is None
+
+
+def test_acheter_tapis_credit_insuffisant(setup_joueur_test, setup_table_test):
+    """Test de l'achat refusé : ni débit ni place si le crédit ne suffit pas"""
+
+    # GIVEN
+    id_joueur = setup_joueur_test
+    id_table = setup_table_test
+
+    # WHEN
+    credit = JoueurPartieDao().acheter_tapis(id_joueur, id_table, 5000)
+
+    # THEN
+    assert credit is None
+    assert JoueurPartieDao().trouver_par_table(id_table) is None
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT credit FROM joueur WHERE id_joueur = %(id)s;", {"id": id_joueur})
+            assert cursor.fetchone()["credit"] == 1000
+
+
+def test_miser_async_une_seule_table(setup_joueur_test, setup_table_test):
+    """Test de la mise asynchrone d'un joueur assis à deux tables : crédit, pot et transaction
+    comme miser_atomique, seule la table visée est modifiée"""
+
+    # GIVEN : le joueur (crédit 1000) est assis aux tables 6001 et 6002
+    id_joueur = setup_joueur_test
+    id_table = setup_table_test
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO table_poker (id_table, nb_sieges, blind_initial, pot, nb_joueurs) "
+                "OVERRIDING SYSTEM VALUE VALUES (6002, 6, 10.00, 0.00, 0);"
+            )
+            cursor.execute(
+                "INSERT INTO partie_joueur (id_table, id_joueur, solde_partie) "
+                "VALUES (%(t1)s, %(j)s, 500), (6002, %(j)s, 500);",
+                {"t1": id_table, "j": id_joueur},
+            )
+
+    async def miser(montant):
+        try:
+            return await JoueurPartieDaoAsync().miser(id_joueur, montant, id_table)
+        finally:
+            await DBConnectionAsync().fermer()
+
+    # WHEN : pool asynchrone propre à la boucle d'événements du test
+    with patch.dict(Singleton._instances, clear=True):
+        ok = asyncio.run(miser(30))
+    with patch.dict(Singleton._instances, clear=True):
+        refusee = asyncio.run(miser(5000))
+
+    # THEN
+    assert ok
+    assert not refusee
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pj.id_table, pj.mise_tour, t.pot FROM partie_joueur pj "
+                "JOIN table_poker t ON t.id_table = pj.id_table "
+                "WHERE pj.id_joueur = %(j)s ORDER BY pj.id_table;",
+                {"j": id_joueur},
+            )
+            lignes = cursor.fetchall()
+            cursor.execute("SELECT credit FROM joueur WHERE id_joueur = %(j)s;", {"j": id_joueur})
+            credit = cursor.fetchone()["credit"]
+            cursor.execute("SELECT solde FROM transaction WHERE id_joueur = %(j)s;", {"j": id_joueur})
+            transactions = [ligne["solde"] for ligne in cursor.fetchall()]
+    assert [(l["id_table"], l["mise_tour"], l["pot"]) for l in lignes] == [
+        (id_table, 30, 30),
+        (6002, 0, 0),
+    ]
+    assert credit == 970
+    assert transactions == [-30]
+
+
 def test_modifier_puis_recuperer_statut(setup_joueur_test, setup_table_test):
     """Test de modification puis récupération du statut"""
     
@@ -0,0 +1,49 @@
+import pytest
+
+from src.utils.reset_database import ResetDatabase
+from src.dao.notification_table import AbonnementTable, canal_table
+from src.dao.table_dao import TableDao
+
+from pathlib import Path
+from dotenv import load_dotenv
+
+
+@pytest.fixture(scope="session", autouse=True)
+def conn_info():
+    chemin = Path(__file__).parent / ".env_test"
+    load_dotenv(dotenv_path=chemin, override=True)
+    try:
+        ResetDatabase().lancer(test_dao=True)
+    except Exception as e:
+        pytest.exit(f"Impossible d'initialiser la base de test : {e}")
+    yield
+
+
+def test_canal_table():
+    assert canal_table(12) == "table_12"
+
+
+def test_ecriture_reveille_abonne():
+    """Une écriture sur la table réveille les clients abonnés à son canal"""
+
+    # GIVEN
+    with AbonnementTable(1) as abonnement:
+        # WHEN
+        TableDao().alimenter_pot(1, 5.0)
+        TableDao().set_id_joueur_tour(1, 998)
+
+        # THEN - l'événement non attendu (pot) est ignoré
+        assert abonnement.attendre({"tour"}, delai=5) == ["tour"]
+
+
+def test_attendre_sans_evenement():
+    """Sans événement, l'attente se termine à l'expiration du délai"""
+
+    # GIVEN
+    with AbonnementTable(1) as abonnement:
+        # WHEN
+        TableDao().set_id_joueur_tour(2, 998)  # autre table
+        recus = abonnement.attendre(delai=0.2)
+
+    # THEN
+    assert recus == []
@@ -12,6 +12,8 @@ from src.business_object.pot import Pot
 from src.business_object.joueur import Joueur
 from src.business_object.siege import Siege
 from src.business_object.monnaie import Monnaie
+from src.business_object.carte import Carte
+from src.business_object.moteur_table import ResumeMain
 
 from pathlib import Path
 from dotenv import load_dotenv
@@ -311,5 +313,58 @@ def test_lister_parties_par_periode_aucune():
     assert len(parties) == 0
 
 
+def test_creer_lot():
+    """Créer plusieurs parties en une requête, identifiants attribués par la base"""
+
+    # GIVEN
+    parties = [
+        Partie(id_partie=None, joueurs=[], pot=Pot(10 * i), id_table=1, date_debut=datetime.now())
+        for i in range(1, 4)
+    ]
+
+    # WHEN
+    creation_ok = PartieDao().creer_lot(parties)
+
+    # THEN
+    assert creation_ok
+    ids = [partie.id_partie for partie in parties]
+    assert len(set(ids)) == 3 and 1 not in ids
+    assert [PartieDao().trouver_par_id(id_partie).pot.get_montant() for id_partie in ids] == [10, 20, 30]
+    assert PartieDao().creer_lot([])
+
+
+def test_enregistrer_main():
+    """Enregistrer une main jouée par le moteur de table en une transaction"""
+
+    # GIVEN
+    resume = ResumeMain(
+        id_table=1,
+        numero=1,
+        date_debut=datetime.now(),
+        board=(Carte("As", "Pique"), Carte("Roi", "Pique"), Carte("2", "Coeur")),
+        mains={999: (Carte("As", "Coeur"), Carte("As", "Carreau"))},
+        actions=((999, 0, "grosse blinde", 10.0),),
+        contributions={999: 10.0},
+        gains={999: 10.0},
+        soldes={999: 250.0},
+    )
+
+    # WHEN
+    id_partie = PartieDao().enregistrer_main(resume)
+
+    # THEN
+    assert id_partie is not None
+    assert PartieDao().trouver_par_id(id_partie).pot.get_montant() == 10
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT * FROM main_jouee WHERE id_partie = %(id)s;", {"id": id_partie})
+            main = cursor.fetchone()
+            cursor.execute("SELECT solde_partie FROM partie_joueur WHERE id_table = 1 AND id_joueur = 999;")
+            solde = cursor.fetchone()["solde_partie"]
+    assert len(bytes(main["board"])) == 3
+    assert main["gains"] == {"999": 10.0}
+    assert solde == 250
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
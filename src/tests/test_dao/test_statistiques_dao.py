@@ -2,10 +2,17 @@ import os
 import pytest
 from datetime import datetime, timedelta
 from decimal import Decimal
+from unittest.mock import PropertyMock, patch
 
 from src.utils.reset_database import ResetDatabase
 from src.dao.db_connection import DBConnection
+from src.dao import statistiques_dao
 from src.dao.statistiques_dao import StatistiquesDao
+from src.dao.partie_dao import PartieDao
+from src.dao.joueur_partie_dao import JoueurPartieDao
+from src.dao.table_dao import TableDao
+from src.business_object.carte import Carte
+from src.business_object.moteur_table import ResumeMain
 
 from pathlib import Path
 from dotenv import load_dotenv
@@ -168,6 +175,21 @@ def setup_parties_completes_test(setup_joueurs_test, setup_tables_test):
                     """
                 )
                 
+                # Résultat de chaque participation (mains jouées hors moteur)
+                cursor.execute(
+                    """
+                    INSERT INTO resultat_main (id_table, id_joueur, date_main, mise, gain, victoire)
+                    VALUES
+                        (2001, 1001, NOW() - INTERVAL '3 days', 100, 250, TRUE),
+                        (2001, 1002, NOW() - INTERVAL '3 days', 50, 0, FALSE),
+                        (2001, 1003, NOW() - INTERVAL '3 days', 80, 0, FALSE),
+                        (2002, 1001, NOW() - INTERVAL '1 day', 70, 0, FALSE),
+                        (2002, 1003, NOW() - INTERVAL '1 day', 120, 370, TRUE),
+                        (2003, 1004, NOW() - INTERVAL '1 hour', 40, 0, FALSE),
+                        (2003, 1005, NOW() - INTERVAL '1 hour', 60, 160, TRUE);
+                    """
+                )
+
                 # Créer des transactions
                 cursor.execute(
                     """
@@ -187,6 +209,10 @@ def setup_parties_completes_test(setup_joueurs_test, setup_tables_test):
                 )
                 
                 connection.commit()
+        # les statistiques des joueurs et l'activité sont lues dans les cumuls, reconstruits depuis ces données
+        StatistiquesDao().reconstruire_stats_joueur()
+        StatistiquesDao().reconstruire_activite()
+        StatistiquesDao().reconstruire_quantiles()
     except Exception as e:
         print(f"Erreur lors du setup complet: {e}")
 
@@ -469,12 +495,15 @@ def test_obtenir_stats_parties(setup_parties_completes_test):
     assert "pot_max" in stats
     assert "somme_totale_pots" in stats
     
-    # Vérifier que les valeurs sont cohérentes
-    assert stats["nb_parties_total"] >= 1  # Au moins une partie
-    if stats["nb_parties_total"] > 0:
-        assert stats["pot_moyen"] > 0
-        assert stats["pot_max"] >= stats["pot_moyen"]
-        assert stats["pot_min"] <= stats["pot_moyen"] or stats["pot_min"] == stats["pot_moyen"]
+    # Valeurs exactes du sketch global des pots : mêmes que sur la table partie
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) AS n, MIN(pot) AS mini, MAX(pot) AS maxi, SUM(pot) AS somme FROM partie;")
+            attendu = cursor.fetchone()
+    assert stats["nb_parties_total"] == attendu["n"] >= 1
+    assert (stats["pot_min"], stats["pot_max"]) == (attendu["mini"], attendu["maxi"])
+    assert stats["somme_totale_pots"] == pytest.approx(float(attendu["somme"]))
+    assert stats["pot_min"] <= stats["pot_moyen"] <= stats["pot_max"]
 
 
 def test_obtenir_stats_parties_vide():
@@ -505,10 +534,57 @@ def test_obtenir_stats_mises(setup_parties_completes_test):
     assert "mise_min" in stats
     assert "mise_max" in stats
     
-    # Vérifier la cohérence si des mises existent
-    if stats["nb_mises_total"] > 0:
-        assert stats["mise_max"] >= stats["mise_moyenne"]
-        assert stats["mise_min"] <= stats["mise_moyenne"]
+    # Toutes les valeurs portent sur les 7 mises des sketchs (40 à 120, somme 520)
+    assert stats["nb_mises_total"] == 7
+    assert (stats["mise_min"], stats["mise_max"]) == (40, 120)
+    assert stats["somme_totale_mises"] == 520
+    assert stats["mise_moyenne"] == pytest.approx(520 / 7)
+    assert stats["mise_min"] <= stats["mediane_mise"] <= stats["p99_mise"] <= stats["mise_max"]
+
+
+def test_obtenir_quantiles_reconstruits(setup_parties_completes_test):
+    """Les quantiles des pots sont lus dans les sketchs reconstruits depuis l'historique"""
+
+    # WHEN
+    pots_2002 = StatistiquesDao().obtenir_quantiles("pot", 2002)
+    mises = StatistiquesDao().obtenir_quantiles("mise")
+
+    # THEN : pots 800 et 450 sur la table 2002, mises des 7 participations
+    assert pots_2002["n"] == 2
+    assert (pots_2002["min"], pots_2002["max"]) == (450, 800)
+    assert pots_2002["mediane"] == 450
+    assert mises["n"] == 7
+    assert mises["p99"] == 120
+    assert StatistiquesDao().obtenir_stats_parties()["p90_pot"] >= 500
+
+
+def test_quantiles_mis_a_jour_en_fin_de_main(setup_joueurs_test, setup_tables_test):
+    """La création d'une partie et la distribution du pot alimentent les sketchs de la table"""
+
+    # GIVEN : 1001 a misé 30 et 1002 a misé 10 à la table 2003
+    from src.dao.partie_dao import PartieDao
+    from src.business_object.partie import Partie
+    from src.business_object.pot import Pot
+
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO partie_joueur (id_joueur, id_table, solde_partie, mise_tour) "
+                "VALUES (1001, 2003, 0, 30), (1002, 2003, 0, 10);"
+            )
+            cursor.execute("UPDATE table_poker SET pot = 40 WHERE id_table = 2003;")
+
+    # WHEN
+    assert PartieDao().creer(Partie(None, [], Pot(40), 2003, datetime.now()))
+    assert TableDao().distribuer_pot(2003, {1001: 40})
+
+    # THEN
+    pots = StatistiquesDao().obtenir_quantiles("pot", 2003)
+    mises = StatistiquesDao().obtenir_quantiles("mise", 2003)
+    assert (pots["n"], pots["mediane"]) == (1, 40)
+    assert (mises["n"], mises["min"], mises["max"]) == (2, 10, 30)
+    # le sketch global est tenu à jour dans la même transaction
+    assert StatistiquesDao().obtenir_quantiles("mise")["n"] == 2
 
 
 def test_obtenir_stats_tables(setup_parties_completes_test):
@@ -580,6 +656,71 @@ def test_obtenir_activite_par_periode_mois(setup_parties_completes_test):
     assert isinstance(activite, list)
 
 
+def test_activite_par_periode_coherente_entre_granularites(setup_parties_completes_test):
+    """Les heures, jours, semaines et mois reconstruits comptent les mêmes parties"""
+
+    # GIVEN
+    debut, fin = datetime.now() - timedelta(days=400), datetime.now() + timedelta(days=1)
+
+    # WHEN
+    activites = {
+        periode: StatistiquesDao().obtenir_activite_par_periode(periode, debut, fin)
+        for periode in ("heure", "jour", "semaine", "mois")
+    }
+
+    # THEN : au moins les 5 parties du jeu de données, les mêmes à chaque granularité
+    nb_parties = sum(a["nb_parties"] for a in activites["heure"])
+    pot_total = sum(a["pot_total"] for a in activites["heure"])
+    assert nb_parties >= 5
+    for periode, activite in activites.items():
+        assert sum(a["nb_parties"] for a in activite) == nb_parties, periode
+        assert sum(a["pot_total"] for a in activite) == pot_total, periode
+    assert sum(a["nb_tables_utilisees"] for a in activites["mois"]) >= 3
+
+
+def test_activite_par_periode_fenetre_vide(setup_parties_completes_test):
+    """Une fenêtre sans partie ne renvoie aucune période"""
+
+    # WHEN
+    activite = StatistiquesDao().obtenir_activite_par_periode(
+        "jour", datetime.now() + timedelta(days=10), datetime.now() + timedelta(days=20)
+    )
+
+    # THEN
+    assert activite == []
+
+
+def test_activite_mise_a_jour_a_la_creation_des_parties(setup_joueurs_test, setup_tables_test):
+    """Chaque partie créée est ajoutée à son heure, son jour et son mois"""
+
+    # GIVEN : 1001 et 1002 assis à la table 2001
+    from src.dao.partie_dao import PartieDao
+    from src.business_object.partie import Partie
+    from src.business_object.pot import Pot
+
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO partie_joueur (id_joueur, id_table, solde_partie) "
+                "VALUES (1001, 2001, 0), (1002, 2001, 0);"
+            )
+    date = datetime(2024, 3, 15, 21, 10)
+
+    # WHEN
+    for pot in (30, 50):
+        assert PartieDao().creer(Partie(None, [], Pot(pot), 2001, date))
+
+    # THEN
+    for periode in ("heure", "jour", "mois"):
+        activite = StatistiquesDao().obtenir_activite_par_periode(periode, datetime(2024, 1, 1), datetime(2025, 1, 1))
+        assert len(activite) == 1
+        assert activite[0]["nb_parties"] == 2
+        assert activite[0]["pot_total"] == 80
+        assert activite[0]["nb_joueurs"] == 2
+        assert activite[0]["nb_tables_utilisees"] == 1
+    assert StatistiquesDao().obtenir_activite_par_periode("heure", datetime(2024, 1, 1))[0]["periode"] == datetime(2024, 3, 15, 21)
+
+
 def test_obtenir_taux_abandon(setup_parties_completes_test):
     """Test du calcul des taux d'abandon"""
     
@@ -643,6 +784,21 @@ def test_obtenir_rapport_complet(setup_parties_completes_test):
     assert isinstance(rapport["stats_tables"], list)
 
 
+def test_executeur_rapport_partage_et_borne():
+    """Les threads du rapport sont créés une fois, au plus la moitié des connexions du pool"""
+
+    # GIVEN : pool de 6 connexions
+    with patch.object(statistiques_dao, "_executeur", None), \
+            patch.object(DBConnection, "taille_max", new_callable=PropertyMock, return_value=6):
+        # WHEN
+        executeur = statistiques_dao._executeur_rapport(8)
+
+        # THEN
+        assert executeur._max_workers == 3
+        assert statistiques_dao._executeur_rapport(8) is executeur
+        executeur.shutdown()
+
+
 def test_obtenir_rapport_complet_structure():
     """Test de la structure du rapport complet même sans données"""
     
@@ -654,6 +810,34 @@ def test_obtenir_rapport_complet_structure():
     assert len(rapport.keys()) == 8  # 8 sections principales
 
 
+def test_iterer_rapport_complet_en_parallele(setup_parties_completes_test):
+    """Les sections du rapport sont calculées en parallèle : la durée est celle de la plus lente"""
+
+    # GIVEN : chaque section de stats_parties et stats_mises dure 0,3 s
+    import time
+    from unittest.mock import patch
+
+    def lente(resultat):
+        def section(*args, **kwargs):
+            time.sleep(0.3)
+            return resultat
+        return section
+
+    dao = StatistiquesDao()
+    with patch.object(dao, "obtenir_stats_parties", lente({"pot_moyen": 1})), \
+            patch.object(dao, "obtenir_stats_mises", lente({"mise_moyenne": 2})):
+        # WHEN
+        debut = time.perf_counter()
+        sections = list(dao.iterer_rapport_complet())
+        duree = time.perf_counter() - debut
+
+    # THEN
+    assert duree < 0.55
+    assert {nom for nom, _ in sections} == set(StatistiquesDao.SECTIONS_RAPPORT)
+    assert dict(sections)["stats_parties"] == {"pot_moyen": 1}
+    assert sections[0][0] not in ("stats_parties", "stats_mises")  # rendues dès qu'elles sont prêtes
+
+
 # =========================================================================
 # TESTS DE CAS LIMITES
 # =========================================================================
@@ -714,5 +898,125 @@ def test_evolution_credit_sans_transactions(setup_joueurs_test):
     assert len(evolution) == 0
 
 
+# =========================================================================
+# TESTS DES STATISTIQUES CUMULÉES (stats_joueur)
+# =========================================================================
+
+def test_reconstruire_stats_joueur(setup_parties_completes_test):
+    """La reconstruction recalcule les cumuls depuis l'historique"""
+
+    # GIVEN : cumuls faussés
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE stats_joueur SET nb_parties = 0, nb_victoires = 0;")
+
+    # WHEN
+    nb_joueurs = StatistiquesDao().reconstruire_stats_joueur()
+
+    # THEN
+    assert nb_joueurs >= 5
+    assert StatistiquesDao().obtenir_stats_joueur(1001)["nb_parties_jouees"] >= 2
+
+
+def test_reconstruction_victoires_comme_le_cumul(setup_joueurs_test, setup_tables_test):
+    """Une mise non suivie rendue à son auteur n'est une victoire ni au cumul ni à la reconstruction"""
+
+    # GIVEN : 1002 mise 200, 1001 suit à tapis pour 50 et gagne ; 1002 récupère 150
+    resume = ResumeMain(
+        id_table=2001,
+        numero=1,
+        date_debut=datetime.now(),
+        board=(),
+        mains={1001: (Carte("As", "Coeur"), Carte("As", "Carreau")), 1002: (Carte("2", "Coeur"), Carte("7", "Pique"))},
+        actions=((1002, 0, "miser", 200.0), (1001, 0, "suivre", 50.0)),
+        contributions={1001: 50.0, 1002: 200.0},
+        gains={1001: 100.0, 1002: 150.0},
+    )
+
+    # WHEN
+    assert PartieDao().enregistrer_main(resume) is not None
+    cumul = {j: StatistiquesDao().obtenir_stats_joueur(j) for j in (1001, 1002)}
+    StatistiquesDao().reconstruire_stats_joueur()
+    reconstruit = {j: StatistiquesDao().obtenir_stats_joueur(j) for j in (1001, 1002)}
+
+    # THEN
+    assert cumul[1001]["nb_victoires"] == 1
+    assert cumul[1002]["nb_victoires"] == 0
+    assert reconstruit == cumul
+
+
+def test_reconstruction_mains_hors_moteur_comme_le_cumul(setup_joueurs_test, setup_tables_test):
+    """Les mains jouées hors moteur sont reconstruites comme elles ont été cumulées"""
+
+    # GIVEN : 1001 et 1002 misent 20 chacun à la table 2001, 1001 remporte le pot ;
+    # 1003 a des statistiques sans main archivée
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO partie_joueur (id_joueur, id_table, solde_partie) "
+                "VALUES (1001, 2001, 0), (1002, 2001, 0);"
+            )
+            cursor.execute(
+                "INSERT INTO stats_joueur (id_joueur, nb_parties, nb_victoires, total_gains, total_mises) "
+                "VALUES (1003, 7, 3, 120, 400);"
+            )
+    assert JoueurPartieDao().miser_atomique(1001, 2001, 20) is not None
+    assert JoueurPartieDao().miser_atomique(1002, 2001, 20) is not None
+    assert TableDao().distribuer_pot(2001, {1001: 40})
+
+    # WHEN
+    cumul = {j: StatistiquesDao().obtenir_stats_joueur(j) for j in (1001, 1002, 1003)}
+    nb_joueurs = StatistiquesDao().reconstruire_stats_joueur()
+    reconstruit = {j: StatistiquesDao().obtenir_stats_joueur(j) for j in (1001, 1002, 1003)}
+
+    # THEN
+    assert nb_joueurs == 2
+    assert cumul[1001]["mise_moyenne"] == 20 and cumul[1001]["nb_victoires"] == 1
+    assert cumul[1002]["total_gains"] == -20 and cumul[1002]["nb_victoires"] == 0
+    assert reconstruit == cumul
+
+
+def test_cumul_a_la_distribution_du_pot(setup_joueurs_test, setup_tables_test):
+    """La distribution du pot cumule une main pour chaque joueur de la table"""
+
+    # GIVEN : 1001 et 1002 assis à la table 2001, pot de 40
+
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO partie_joueur (id_joueur, id_table, solde_partie) "
+                "VALUES (1001, 2001, 0), (1002, 2001, 0);"
+            )
+            cursor.execute("UPDATE table_poker SET pot = 40 WHERE id_table = 2001;")
+
+    # WHEN
+    assert TableDao().distribuer_pot(2001, {1001: 40})
+
+    # THEN
+    gagnant = StatistiquesDao().obtenir_stats_joueur(1001)
+    perdant = StatistiquesDao().obtenir_stats_joueur(1002)
+    assert gagnant["nb_parties_jouees"] == 1 and gagnant["nb_victoires"] == 1
+    assert gagnant["total_gains"] == 40
+    assert perdant["nb_parties_jouees"] == 1 and perdant["nb_victoires"] == 0
+
+
+def test_stats_globales_cache_invalide_par_ecriture(setup_joueurs_test):
+    """Les statistiques gardées en cache sont invalidées par les écritures des DAO"""
+
+    # GIVEN
+    from src.dao.joueur_dao import JoueurDao
+    from src.business_object.joueur import Joueur
+    from src.business_object.monnaie import Monnaie
+
+    avant = StatistiquesDao().obtenir_stats_globales()["nb_joueurs_total"]
+    assert StatistiquesDao().obtenir_stats_globales()["nb_joueurs_total"] == avant
+
+    # WHEN
+    JoueurDao().creer(Joueur("JoueurCache", "cache@mail.com", "hash", 30, Monnaie(100)))
+
+    # THEN
+    assert StatistiquesDao().obtenir_stats_globales()["nb_joueurs_total"] == avant + 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -9,6 +9,8 @@ from src.dao.table_dao import TableDao
 
 from src.business_object.table import Table
 from src.business_object.monnaie import Monnaie
+from src.business_object.liste_cartes import ListeCartes
+from src.business_object.carte import Carte
 
 from pathlib import Path
 from dotenv import load_dotenv
@@ -124,5 +126,105 @@ def test_supprimer_table():
     assert TableDao().trouver_par_id(id_table) is None
 
 
+def test_snapshot_table():
+    """L'état de la table est lu en une seule fois, avec les joueurs assis"""
+
+    # GIVEN - une table avec deux joueurs assis
+    table = Table(nb_sieges=6, blind_initial=Monnaie(10.0))
+    TableDao().creer(table)
+    id_table = table.id_table
+    TableDao().alimenter_pot(id_table, 30.0)
+    TableDao().set_val_derniere_mise(id_table, 5.0)
+    TableDao().set_id_joueur_tour(id_table, 998)
+    TableDao().set_id_joueur_bouton(id_table, 997)
+    TableDao().set_flop(id_table, ListeCartes([Carte("As", "Pique"), Carte("Roi", "Coeur"), Carte("2", "Trêfle")]))
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO partie_joueur(id_table, id_joueur, mise_tour, solde_partie, statut, id_siege) "
+                "VALUES (%(id_table)s, 998, 5, 95, 'en jeu', 2), (%(id_table)s, 997, 0, 100, 's''est couché', 1);",
+                {"id_table": id_table},
+            )
+
+    # WHEN
+    etat = TableDao().snapshot(id_table)
+
+    # THEN
+    assert etat.id_table == id_table
+    assert etat.pot == 30.0
+    assert etat.val_derniere_mise == 5.0
+    assert etat.id_joueur_tour == 998
+    assert etat.id_joueur_bouton == 997
+    assert etat.flop == (Carte("As", "Pique"), Carte("Roi", "Coeur"), Carte("2", "Trêfle"))
+    assert etat.turn == () and etat.river == ()
+    assert etat.ids_joueurs == [997, 998]  # triés par siège
+    assert etat.statut(998) == "en jeu"
+    assert etat.statut(997) == "s'est couché"
+    assert etat.joueurs[1].solde_partie == 95.0
+    assert etat.credit(998) == 10.0
+    assert "credit" not in etat.en_dict()["joueurs"][0]
+
+
+def test_snapshot_table_sans_joueur():
+    """Une table sans joueur a un état sans joueurs, une table inconnue n'en a pas"""
+
+    # GIVEN
+    table = Table(nb_sieges=4, blind_initial=Monnaie(2.0))
+    TableDao().creer(table)
+
+    # WHEN
+    etat = TableDao().snapshot(table.id_table)
+
+    # THEN
+    assert etat.joueurs == ()
+    assert etat.blind_initial == 2.0
+    assert TableDao().snapshot(9999999) is None
+
+
+def credit(id_joueur):
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT credit FROM joueur WHERE id_joueur = %(id)s;", {"id": id_joueur})
+            return float(cursor.fetchone()["credit"])
+
+
+def test_distribuer_pot():
+    """Les gagnants sont crédités et le pot vidé en une transaction"""
+
+    # GIVEN - un pot de 31 partagé entre deux joueurs
+    table = Table(nb_sieges=6, blind_initial=Monnaie(10.0))
+    TableDao().creer(table)
+    id_table = table.id_table
+    TableDao().alimenter_pot(id_table, 31.0)
+    credits_avant = {998: credit(998), 997: credit(997)}
+
+    # WHEN
+    distribue = TableDao().distribuer_pot(id_table, {998: 15.5, 997: 15.5})
+
+    # THEN
+    assert distribue
+    assert TableDao().get_pot(id_table) == 0
+    assert credit(998) == credits_avant[998] + 15.5
+    assert credit(997) == credits_avant[997] + 15.5
+
+
+def test_distribuer_pot_superieur_au_pot():
+    """Rien n'est modifié si les gains dépassent le pot"""
+
+    # GIVEN
+    table = Table(nb_sieges=6, blind_initial=Monnaie(10.0))
+    TableDao().creer(table)
+    TableDao().alimenter_pot(table.id_table, 20.0)
+    credit_avant = credit(998)
+
+    # WHEN
+    distribue = TableDao().distribuer_pot(table.id_table, {998: 50.0})
+
+    # THEN
+    assert not distribue
+    assert TableDao().get_pot(table.id_table) == 20.0
+    assert credit(998) == credit_avant
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
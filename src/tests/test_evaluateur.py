@@ -0,0 +1,74 @@
+import pytest
+from src.business_object.evaluateur import force_main, combinaison_depuis_force, encoder, evaluer
+from src.business_object.combinaison import Combinaison
+from src.business_object.carte import Carte
+
+
+class TestEvaluateur():
+    def test_encoder_cartes_distinctes(self):
+        # GIVEN
+        cartes = [Carte(valeur, couleur) for valeur in Carte.VALEURS() for couleur in Carte.COULEURS()]
+
+        # WHEN
+        codes = {encoder(carte) for carte in cartes}
+
+        # THEN
+        assert codes == set(range(52))
+
+    def test_quinte_as_haute(self):
+        # GIVEN
+        cartes = [pytest.as_coeur, pytest.roi_pique, pytest.dame_trefle, pytest.valet_carreau,
+                  pytest.dix_coeur, pytest.deux_pique, pytest.trois_trefle]
+
+        # WHEN
+        force = force_main(cartes)
+
+        # THEN
+        assert combinaison_depuis_force(force) == Combinaison.Quinte
+
+    def test_quinte_as_basse_plus_faible_que_quinte_six(self):
+        # GIVEN
+        roue = [pytest.as_coeur, pytest.deux_pique, pytest.trois_trefle, pytest.quatre_carreau, pytest.cinq_coeur]
+        quinte_six = [pytest.six_coeur, pytest.deux_pique, pytest.trois_trefle, pytest.quatre_carreau,
+                      pytest.cinq_coeur]
+
+        # WHEN / THEN
+        assert combinaison_depuis_force(force_main(roue)) == Combinaison.Quinte
+        assert force_main(roue) < force_main(quinte_six)
+
+    def test_kicker_departage_les_paires(self):
+        # GIVEN
+        board = [pytest.as_coeur, pytest.as_pique, pytest.neuf_trefle, pytest.sept_carreau, pytest.deux_coeur]
+        main_roi = board + [pytest.roi_trefle, pytest.trois_pique]
+        main_dame = board + [pytest.dame_trefle, pytest.trois_carreau]
+
+        # WHEN / THEN
+        assert force_main(main_roi) > force_main(main_dame)
+
+    def test_meme_main_meme_force(self):
+        # GIVEN
+        board = [pytest.as_coeur, pytest.roi_pique, pytest.dame_trefle, pytest.valet_carreau, pytest.neuf_coeur]
+
+        # WHEN / THEN
+        assert force_main(board + [pytest.deux_pique, pytest.trois_trefle]) == force_main(
+            board + [pytest.deux_carreau, pytest.quatre_trefle]
+        )
+
+    def test_ordre_des_categories(self):
+        # GIVEN
+        flush = [pytest.deux_coeur, pytest.cinq_coeur, pytest.sept_coeur, pytest.neuf_coeur, pytest.valet_coeur]
+        quinte = [pytest.six_pique, pytest.sept_coeur, pytest.huit_trefle, pytest.neuf_carreau, pytest.dix_coeur]
+        full = [pytest.deux_coeur, pytest.deux_pique, pytest.deux_trefle, pytest.trois_carreau, pytest.trois_coeur]
+
+        # WHEN / THEN
+        assert force_main(quinte) < force_main(flush) < force_main(full)
+
+    def test_evaluer_sur_codes(self):
+        # GIVEN
+        cartes = [pytest.as_coeur, pytest.roi_coeur, pytest.dame_coeur, pytest.valet_coeur, pytest.dix_coeur]
+
+        # WHEN
+        force = evaluer([encoder(carte) for carte in cartes])
+
+        # THEN
+        assert combinaison_depuis_force(force) == Combinaison.QuinteRoyale
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from src.business_object.evaluateur import encoder_cartes, evaluer
+from src.business_object.evaluateur_lot import evaluer_lot
+from src.business_object.main_joueur_complete import MainJoueurComplete
+from src.business_object.combinaison import Combinaison
+
+
+class TestEvaluateurLot():
+    def test_evaluer_lot_identique_aux_mains_complete(self):
+        # GIVEN : les mains de test_main_joueur_complete.py
+        mains = [
+            [pytest.roi_coeur, pytest.dame_pique, pytest.huit_trefle, pytest.six_coeur,
+             pytest.quatre_pique, pytest.trois_trefle, pytest.deux_carreau],
+            [pytest.as_coeur, pytest.as_pique, pytest.trois_pique, pytest.dix_carreau,
+             pytest.dame_carreau, pytest.cinq_coeur, pytest.quatre_trefle],
+            [pytest.as_coeur, pytest.as_pique, pytest.trois_pique, pytest.trois_carreau,
+             pytest.dame_carreau, pytest.cinq_coeur, pytest.quatre_trefle],
+            [pytest.as_coeur, pytest.as_pique, pytest.as_trefle, pytest.trois_carreau,
+             pytest.dame_carreau, pytest.cinq_coeur, pytest.quatre_trefle],
+            [pytest.deux_coeur, pytest.trois_pique, pytest.quatre_trefle, pytest.cinq_carreau,
+             pytest.six_coeur, pytest.dame_coeur, pytest.roi_trefle],
+            [pytest.deux_coeur, pytest.cinq_coeur, pytest.sept_coeur, pytest.neuf_coeur,
+             pytest.valet_coeur, pytest.dame_pique, pytest.roi_trefle],
+            [pytest.as_coeur, pytest.as_pique, pytest.as_trefle, pytest.trois_carreau,
+             pytest.trois_coeur, pytest.cinq_coeur, pytest.quatre_trefle],
+            [pytest.as_coeur, pytest.as_pique, pytest.as_trefle, pytest.as_carreau,
+             pytest.trois_coeur, pytest.cinq_coeur, pytest.quatre_trefle],
+            [pytest.cinq_coeur, pytest.six_coeur, pytest.sept_coeur, pytest.huit_coeur,
+             pytest.neuf_coeur, pytest.as_pique, pytest.deux_trefle],
+            [pytest.as_coeur, pytest.roi_coeur, pytest.dame_coeur, pytest.valet_coeur,
+             pytest.dix_coeur, pytest.deux_pique, pytest.trois_trefle],
+        ]
+        codes = np.array([encoder_cartes(main) for main in mains], dtype=np.uint8)
+
+        # WHEN
+        rangs = evaluer_lot(codes)
+
+        # THEN
+        assert rangs.shape == (len(mains),)
+        assert rangs.tolist() == [MainJoueurComplete(main).force() for main in mains]
+        assert [rang >> 20 for rang in rangs.tolist()] == list(Combinaison)
+
+    def test_evaluer_lot_identique_a_evaluer(self):
+        # GIVEN
+        rng = np.random.default_rng(2024)
+        codes = np.argsort(rng.random((2000, 52)), axis=1)[:, :7].astype(np.uint8)
+
+        # WHEN
+        rangs = evaluer_lot(codes)
+
+        # THEN
+        assert rangs.tolist() == [evaluer(ligne) for ligne in codes.tolist()]
+
+    def test_evaluer_lot_dimension_invalide(self):
+        # GIVEN
+        codes = np.zeros((3, 8), dtype=np.uint8)
+
+        # THEN
+        with pytest.raises(ValueError):
+            # WHEN
+            evaluer_lot(codes)
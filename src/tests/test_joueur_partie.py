@@ -66,6 +66,7 @@ class TestJoueurPartie:
         
         assert joueur_partie.solde_partie.get() == 0
         assert joueur_partie.mise_tour.get() == 1000
+        assert joueur_partie.statut == "all-in"
         
         # Vérifier le message
         captured = capsys.readouterr()
@@ -1,3 +1,4 @@
+import random
 import pytest
 from src.business_object.carte import Carte
 from src.business_object.liste_cartes import ListeCartes
@@ -59,4 +60,35 @@ class TestListeCartes:
     def test_str_affiche_correctement(self, liste_2_cartes):
         liste = ListeCartes(liste_2_cartes)
         texte = str(liste)
-        assert "As" in texte or "Roi" in texte
\ No newline at end of file
+        assert "As" in texte or "Roi" in texte
+
+    def test_melanger_conserve_les_cartes(self):
+        liste = ListeCartes(rng=random.Random(1))
+        liste.melanger()
+        assert liste.melangee
+        assert sorted(c.code for c in liste.get_cartes()) == list(range(52))
+
+    def test_melanger_reproductible_avec_graine(self):
+        liste_1 = ListeCartes(rng=random.Random(2024)).melanger()
+        liste_2 = ListeCartes(rng=random.Random(2024)).melanger()
+        assert [liste_1.piocher() for _ in range(10)] == [liste_2.piocher() for _ in range(10)]
+
+    def test_piocher_apres_melange_prend_le_dessus(self):
+        liste = ListeCartes(rng=random.Random(3)).melanger()
+        dessus = liste.get_cartes()[-1]
+        assert liste.piocher() is dessus
+        assert len(liste) == 51
+
+    def test_cartes_to_bytes_un_octet_par_carte(self, liste_2_cartes):
+        liste = ListeCartes(liste_2_cartes)
+        octets = ListeCartes.cartes_to_bytes(liste)
+        assert octets == bytes([48, 46])
+        assert ListeCartes.bytes_to_cartes(octets).get_cartes() == liste_2_cartes
+
+    def test_bytes_to_cartes_lit_les_anciennes_lignes_texte(self, liste_2_cartes):
+        ancienne_ligne = ListeCartes.cartes_to_str(ListeCartes(liste_2_cartes)).encode("utf-8")
+        assert ListeCartes.bytes_to_cartes(memoryview(ancienne_ligne)).get_cartes() == liste_2_cartes
+
+    def test_bytes_to_cartes_vide(self):
+        assert len(ListeCartes.bytes_to_cartes(b"")) == 0
+        assert len(ListeCartes.bytes_to_cartes(None)) == 0
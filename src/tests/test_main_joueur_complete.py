@@ -189,3 +189,46 @@ class TestMainJoueurComplete():
 
         # THEN
         assert main_complete.combinaison() == Combinaison.QuinteRoyale
+
+    def test_gagnants_kicker(self):
+        # GIVEN
+        board = [pytest.as_coeur, pytest.as_pique, pytest.neuf_trefle, pytest.sept_carreau, pytest.deux_coeur]
+        dict_joueurs_main = {
+            1: board + [pytest.roi_trefle, pytest.trois_pique],
+            2: board + [pytest.dame_trefle, pytest.trois_carreau],
+        }
+
+        # WHEN
+        gagnants = MainJoueurComplete.gagnants(dict_joueurs_main)
+
+        # THEN
+        assert gagnants == [1]
+
+    def test_gagnants_quinte_contre_carte_haute(self):
+        # GIVEN
+        board = [pytest.as_coeur, pytest.roi_pique, pytest.dame_trefle, pytest.valet_carreau, pytest.neuf_coeur]
+        dict_joueurs_main = {
+            1: board + [pytest.deux_pique, pytest.trois_trefle],
+            2: board + [pytest.deux_carreau, pytest.quatre_trefle],
+            3: [pytest.dix_pique, pytest.cinq_trefle] + board,
+        }
+
+        # WHEN
+        gagnants = MainJoueurComplete.gagnants(dict_joueurs_main)
+
+        # THEN
+        assert gagnants == [3]
+
+    def test_gagnants_egalite(self):
+        # GIVEN
+        board = [pytest.as_coeur, pytest.roi_pique, pytest.dame_trefle, pytest.valet_carreau, pytest.neuf_coeur]
+        dict_joueurs_main = {
+            1: board + [pytest.deux_pique, pytest.trois_trefle],
+            2: board + [pytest.deux_carreau, pytest.quatre_trefle],
+        }
+
+        # WHEN
+        gagnants = MainJoueurComplete.gagnants(dict_joueurs_main)
+
+        # THEN
+        assert gagnants == [1, 2]
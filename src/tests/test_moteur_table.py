@@ -0,0 +1,202 @@
+import random
+import pytest
+
+from src.business_object.moteur_table import MoteurTable, ResumeMain
+
+
+def moteur_a(nb_joueurs, tapis=1000, persister=None):
+    moteur = MoteurTable(id_table=1, blind=10, rng=random.Random(7), persister=persister)
+    for id_joueur in range(1, nb_joueurs + 1):
+        moteur.ajouter_joueur(id_joueur, tapis)
+    return moteur
+
+
+class TestMoteurTable:
+    def test_nouvelle_main_blindes_et_cartes(self):
+        # GIVEN
+        moteur = moteur_a(3)
+
+        # WHEN
+        moteur.nouvelle_main()
+
+        # THEN : bouton 1, petite blinde 2, grosse blinde 3, parole au bouton
+        assert moteur.tapis(2) == 995
+        assert moteur.tapis(3) == 990
+        assert moteur.pot == 15
+        assert moteur.joueur_tour == 1
+        assert moteur.tour == "Pré-flop"
+        assert all(len(moteur.main(j)) == 2 for j in (1, 2, 3))
+
+    def test_tete_a_tete_bouton_petite_blinde(self):
+        # GIVEN
+        moteur = moteur_a(2)
+
+        # WHEN
+        moteur.nouvelle_main()
+
+        # THEN
+        assert moteur.tapis(1) == 995
+        assert moteur.tapis(2) == 990
+        assert moteur.joueur_tour == 1
+
+    def test_agir_hors_tour(self):
+        # GIVEN
+        moteur = moteur_a(3)
+        moteur.nouvelle_main()
+
+        # WHEN / THEN
+        with pytest.raises(ValueError):
+            moteur.agir(2, "suivre")
+
+    def test_relance_inferieure_au_minimum(self):
+        # GIVEN
+        moteur = moteur_a(3)
+        moteur.nouvelle_main()
+
+        # WHEN / THEN
+        with pytest.raises(ValueError):
+            moteur.agir(1, "miser", 5)
+
+    def test_retirer_joueur_pendant_la_main(self):
+        # GIVEN : 1 a la parole
+        moteur = moteur_a(3)
+        moteur.nouvelle_main()
+        etat = moteur.en_dict()
+
+        # WHEN / THEN : 2 ne peut quitter, la main n'est pas modifiée
+        with pytest.raises(ValueError):
+            moteur.retirer_joueur(2)
+        assert moteur.en_dict() == etat
+        assert moteur.joueur_tour == 1
+        assert moteur.statut(2) == "en jeu"
+
+    def test_retirer_joueur_apres_la_main(self):
+        # GIVEN
+        moteur = moteur_a(3)
+        moteur.nouvelle_main()
+        moteur.agir(1, "se coucher")
+        moteur.agir(2, "se coucher")
+
+        # WHEN
+        tapis = moteur.retirer_joueur(2)
+
+        # THEN
+        assert tapis == 995
+        assert moteur.sieges == [1, 3]
+
+    def test_tous_couches_sauf_un(self):
+        # GIVEN
+        resumes = []
+        moteur = moteur_a(3, persister=resumes.append)
+        moteur.nouvelle_main()
+
+        # WHEN
+        assert moteur.agir(1, "se coucher") is None
+        resume = moteur.agir(2, "se coucher")
+
+        # THEN
+        assert isinstance(resume, ResumeMain)
+        assert resumes == [resume]
+        assert resume.gains == {3: 15}
+        assert resume.soldes == {1: 1000, 2: 995, 3: 1005}
+        assert not moteur.en_cours
+
+    def test_main_jusqu_a_l_abattage(self):
+        # GIVEN
+        moteur = moteur_a(3)
+        moteur.nouvelle_main()
+        moteur.agir(1, "suivre")
+        moteur.agir(2, "suivre")
+        moteur.agir(3, "suivre")
+        assert moteur.tour == "Flop" and len(moteur.board) == 3
+
+        # WHEN : tout le monde parle à chaque tour
+        resume = None
+        while resume is None:
+            resume = moteur.agir(moteur.joueur_tour, "suivre")
+
+        # THEN
+        assert len(resume.board) == 5
+        assert resume.pot == 30
+        assert sum(resume.gains.values()) == pytest.approx(30)
+        assert sum(resume.soldes.values()) == pytest.approx(3000)
+
+    def test_relance_rouvre_les_enchères(self):
+        # GIVEN
+        moteur = moteur_a(3)
+        moteur.nouvelle_main()
+
+        # WHEN
+        moteur.agir(1, "miser", 20)
+        moteur.agir(2, "suivre")
+        moteur.agir(3, "suivre")
+
+        # THEN
+        assert moteur.tour == "Flop"
+        assert moteur.pot == 90
+        assert moteur.joueur_tour == 2
+
+    def test_tapis_distribue_le_board(self):
+        # GIVEN
+        moteur = moteur_a(2, tapis=100)
+        moteur.nouvelle_main()
+
+        # WHEN
+        moteur.agir(1, "miser", 1000)
+        resume = moteur.agir(2, "suivre")
+
+        # THEN
+        assert len(resume.board) == 5
+        assert resume.pot == 200
+        assert sum(resume.soldes.values()) == pytest.approx(200)
+
+    def test_bouton_tourne(self):
+        # GIVEN
+        moteur = moteur_a(3)
+        moteur.nouvelle_main()
+        moteur.agir(1, "se coucher")
+        moteur.agir(2, "se coucher")
+
+        # WHEN
+        moteur.nouvelle_main()
+
+        # THEN : bouton 2, blindes 3 et 1, parole au bouton
+        assert moteur.joueur_tour == 2
+        assert moteur.tapis(3) == 1000
+
+    def test_tapis_inegaux_pots_secondaires(self):
+        # GIVEN : 2 n'a que 100, 1 et 3 ont 1000
+        moteur = MoteurTable(id_table=1, blind=10, rng=random.Random(3))
+        moteur.ajouter_joueur(1, 1000)
+        moteur.ajouter_joueur(2, 100)
+        moteur.ajouter_joueur(3, 1000)
+        moteur.nouvelle_main()
+
+        # WHEN : 1 relance à 500, 2 suit à tapis, 3 suit
+        moteur.agir(1, "miser", 490)
+        moteur.agir(2, "suivre")
+        moteur.agir(3, "suivre")
+        resume = None
+        while resume is None:
+            resume = moteur.agir(moteur.joueur_tour, "suivre")
+
+        # THEN : 2 ne peut gagner plus que 3 fois sa mise
+        assert resume.contributions == {1: 500, 2: 100, 3: 500}
+        assert resume.gains.get(2, 0) <= 300
+        assert sum(resume.gains.values()) == pytest.approx(1100)
+        assert sum(resume.soldes.values()) == pytest.approx(2100)
+
+    def test_annuler_main_rend_les_mises(self):
+        # GIVEN
+        moteur = moteur_a(3)
+        moteur.nouvelle_main()
+        moteur.agir(1, "miser", 40)
+
+        # WHEN
+        moteur.annuler_main()
+
+        # THEN : chacun retrouve son tapis d'avant la main
+        assert not moteur.en_cours
+        assert moteur.pot == 0
+        assert [moteur.tapis(j) for j in (1, 2, 3)] == [1000, 1000, 1000]
+        assert moteur.retirer_joueur(1) == 1000
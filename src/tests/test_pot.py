@@ -1,6 +1,8 @@
 import pytest
 from src.business_object.pot import Pot
 from src.business_object.monnaie import Monnaie
+from src.business_object.carte import Carte
+from src.business_object.pot import PotSecondaire
 
 class TestPot : 
     def test_initialisation_pot(self):
@@ -55,3 +57,66 @@ class TestPot :
         # THEN
         assert pot.get_montant() == 0
         assert isinstance(pot.montant_pot, Monnaie)
+
+    def test_partager_centimes_aux_premiers(self):
+        # GIVEN / WHEN
+        gains = Pot.partager(10, [3, 1, 2])
+
+        # THEN
+        assert gains == {3: 3.34, 1: 3.33, 2: 3.33}
+        assert Pot.partager(10, []) == {}
+
+    def test_calculer_pots_secondaires(self):
+        # GIVEN : 1 à tapis pour 50, 4 couché après avoir misé 30
+        pot = Pot()
+        for id_joueur, montant in [(1, 50), (2, 100), (3, 100), (4, 30)]:
+            pot.ajouter_mise(montant, id_joueur)
+
+        # WHEN
+        pots = pot.calculer_pots({1, 2, 3})
+
+        # THEN
+        assert pots == [PotSecondaire(180, (1, 2, 3)), PotSecondaire(100, (2, 3))]
+        assert pot.get_montant() == 280
+
+    def test_repartir_tapis_gagne_le_pot_principal(self):
+        # GIVEN : 1 (à tapis pour 50) a la meilleure main, 2 bat 3 pour le pot secondaire
+        pot = Pot()
+        for id_joueur, montant in [(1, 50), (2, 100), (3, 100)]:
+            pot.ajouter_mise(montant, id_joueur)
+        board = [Carte("2", "Pique"), Carte("7", "Coeur"), Carte("9", "Carreau"), Carte("Valet", "Trêfle"), Carte("4", "Coeur")]
+        mains = {
+            1: [Carte("As", "Pique"), Carte("As", "Coeur")] + board,
+            2: [Carte("Roi", "Pique"), Carte("Roi", "Coeur")] + board,
+            3: [Carte("Dame", "Pique"), Carte("3", "Coeur")] + board,
+        }
+
+        # WHEN
+        gains = pot.repartir(mains)
+
+        # THEN
+        assert gains == {1: 150, 2: 100}
+
+    def test_repartir_mise_non_suivie_rendue(self):
+        # GIVEN : 2 a misé 300 mais 1 n'a pu suivre que 100 ; 1 gagne
+        pot = Pot()
+        pot.ajouter_mise(100, 1)
+        pot.ajouter_mise(300, 2)
+        board = [Carte("2", "Pique"), Carte("7", "Coeur"), Carte("9", "Carreau"), Carte("Valet", "Trêfle"), Carte("4", "Coeur")]
+        mains = {
+            1: [Carte("As", "Pique"), Carte("As", "Coeur")] + board,
+            2: [Carte("Roi", "Pique"), Carte("Roi", "Coeur")] + board,
+        }
+
+        # WHEN / THEN
+        assert pot.repartir(mains) == {1: 200, 2: 200}
+
+    def test_gagnants_mise_non_suivie_pas_une_victoire(self):
+        # GIVEN : 2 a misé 200, 1 n'a pu suivre que 50 et gagne ; 2 récupère ses 150 non suivis
+        contributions = {1: 50, 2: 200}
+        gains = {1: 100, 2: 150}
+
+        # WHEN / THEN
+        assert Pot.gagnants(contributions, gains) == {1}
+        assert Pot.gagnants({1: 100, 2: 100}, {1: 100, 2: 100}) == {1, 2}
+        assert Pot.gagnants({1: 10, 2: 5, 3: 0}, {1: 15}) == {1}
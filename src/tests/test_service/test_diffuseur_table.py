@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock, create_autospec
+
+from src.utils.singleton import Singleton
+from src.business_object.etat_table import EtatTable, JoueurAssis
+from src.dao.notification_table import EcouteTablesAsync
+from src.service.table_service import TableService
+from src.service.diffuseur_table import DiffuseurTable, calculer_delta
+
+
+def test_calculer_delta_champs_modifies():
+    # GIVEN
+    ancien = EtatTable(id_table=1, pot=10.0, id_joueur_tour=998).en_dict()
+    nouveau = EtatTable(id_table=1, pot=30.0, id_joueur_tour=997).en_dict()
+
+    # WHEN
+    delta = calculer_delta(ancien, nouveau)
+
+    # THEN
+    assert delta == {"pot": 30.0, "id_joueur_tour": 997}
+
+
+def test_calculer_delta_sans_etat_precedent():
+    # GIVEN
+    nouveau = EtatTable(id_table=1, joueurs=(JoueurAssis(998, 1, "en jeu"),)).en_dict()
+
+    # WHEN / THEN
+    assert calculer_delta(None, nouveau) == nouveau
+    assert calculer_delta(nouveau, nouveau) == {}
+
+
+def test_diffusion_a_tous_les_abonnes():
+    """Un changement en base est relu une seule fois puis envoyé à tous les abonnés de la table"""
+
+    # GIVEN
+    etats = [EtatTable(id_table=1, pot=10.0), EtatTable(id_table=1, pot=10.0), EtatTable(id_table=1, pot=25.0)]
+    rappels = []
+
+    def ecoute(rappel):
+        rappels.append(rappel)
+        return create_autospec(EcouteTablesAsync, instance=True)
+
+    async def scenario():
+        diffuseur = DiffuseurTable()
+        file_1 = await diffuseur.abonner(1)
+        file_2 = await diffuseur.abonner(1)
+        # WHEN - deux événements rapprochés
+        rappels[0](1, "pot", None)
+        rappels[0](1, "mise", None)
+        rappels[0](1, "resultat", {"gagnants": [998], "combinaison": None, "pot": 25.0})
+        await asyncio.sleep(0.01)
+        return [[file.get_nowait() for _ in range(file.qsize())] for file in (file_1, file_2)]
+
+    with patch.dict(Singleton._instances, clear=True), \
+         patch("src.service.diffuseur_table.EcouteTablesAsync", side_effect=ecoute), \
+         patch.object(TableService, "etat_table_async", new_callable=AsyncMock, side_effect=etats) as mock_etat:
+        messages = asyncio.run(scenario())
+
+    # THEN
+    for messages_abonne in messages:
+        assert messages_abonne[0] == {"type": "etat", "etat": etats[0].en_dict()}
+        assert {"type": "resultat", "gagnants": [998], "combinaison": None, "pot": 25.0} in messages_abonne
+        assert {"type": "delta", "changements": {"pot": 25.0}} in messages_abonne
+    assert mock_etat.await_count == 3  # 2 abonnements, 1 seule relecture pour les 2 événements
+
+
+def test_abonner_table_inconnue():
+    # GIVEN
+    with patch.dict(Singleton._instances, clear=True), \
+         patch("src.service.diffuseur_table.EcouteTablesAsync",
+               return_value=create_autospec(EcouteTablesAsync, instance=True)), \
+         patch.object(TableService, "etat_table_async", new_callable=AsyncMock, return_value=None):
+        diffuseur = DiffuseurTable()
+
+        # WHEN
+        file = asyncio.run(diffuseur.abonner(42))
+
+        # THEN
+        assert file is None
+        assert diffuseur.nb_abonnes(42) == 0
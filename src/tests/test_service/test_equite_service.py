@@ -0,0 +1,128 @@
+import pytest
+from unittest.mock import patch
+
+from src.service.equite_service import EquiteService, MAX_ITERATIONS
+
+
+def test_calculer_equite_reproductible():
+    # GIVEN
+    mains = {1: [pytest.as_pique, pytest.as_coeur], 2: [pytest.roi_pique, pytest.roi_coeur]}
+
+    # WHEN
+    equite_1 = EquiteService().calculer_equite(mains, None, 5000, seed=42)
+    equite_2 = EquiteService().calculer_equite(mains, None, 5000, seed=42)
+
+    # THEN
+    assert equite_1 == equite_2
+    assert 0.78 < equite_1[1]["equite"] < 0.86
+    assert equite_1[1]["equite"] + equite_1[2]["equite"] == pytest.approx(1)
+
+
+def test_calculer_equite_board_complet():
+    # GIVEN
+    mains = {1: [pytest.as_pique, pytest.deux_trefle], 2: [pytest.roi_pique, pytest.trois_trefle]}
+    board = [pytest.as_coeur, pytest.sept_carreau, pytest.neuf_trefle, pytest.valet_coeur, pytest.quatre_pique]
+
+    # WHEN
+    equite = EquiteService().calculer_equite(mains, board, 100, seed=1)
+
+    # THEN
+    assert equite[1] == {"victoire": 1.0, "egalite": 0.0, "equite": 1.0}
+    assert equite[2] == {"victoire": 0.0, "egalite": 0.0, "equite": 0.0}
+
+
+def test_calculer_equite_main_inconnue():
+    # GIVEN
+    mains = {1: [pytest.as_pique, pytest.as_coeur], 2: None, 3: None}
+
+    # WHEN
+    equite = EquiteService().calculer_equite(mains, None, 5000, seed=7)
+
+    # THEN
+    assert sum(e["equite"] for e in equite.values()) == pytest.approx(1)
+    assert equite[1]["equite"] > equite[2]["equite"]
+
+
+def test_calculer_equite_multi_processus():
+    # GIVEN
+    mains = {1: [pytest.as_pique, pytest.as_coeur], 2: [pytest.roi_pique, pytest.roi_coeur]}
+
+    # WHEN : 2 processus, même sur une machine à un cœur
+    with patch("src.service.equite_service.MAX_PROCESSUS", 2):
+        equite = EquiteService().calculer_equite(mains, None, 4000, seed=3, n_processus=2)
+
+    # THEN
+    assert 0.76 < equite[1]["equite"] < 0.88
+
+
+def test_calculer_equite_parametres_bornes():
+    # GIVEN
+    mains = {1: [pytest.as_pique, pytest.as_coeur], 2: [pytest.roi_pique, pytest.roi_coeur]}
+
+    # THEN
+    with pytest.raises(ValueError):
+        # WHEN
+        EquiteService().calculer_equite(mains, None, MAX_ITERATIONS + 1)
+    with patch("src.service.equite_service.MAX_PROCESSUS", 2), pytest.raises(ValueError):
+        EquiteService().calculer_equite(mains, None, 100, n_processus=3)
+
+
+def test_calculer_equite_carte_en_double():
+    # GIVEN
+    mains = {1: [pytest.as_pique, pytest.as_coeur], 2: [pytest.as_pique, pytest.roi_coeur]}
+
+    # THEN
+    with pytest.raises(ValueError):
+        # WHEN
+        EquiteService().calculer_equite(mains, None, 100)
+
+
+def test_calculer_equite_exact_turn():
+    # GIVEN : tirage couleur contre paire d'as, une carte à venir
+    mains = {1: [pytest.as_pique, pytest.as_coeur], 2: [pytest.roi_trefle, pytest.dame_trefle]}
+    board = [pytest.deux_trefle, pytest.sept_trefle, pytest.neuf_carreau, pytest.quatre_pique]
+
+    # WHEN
+    equite = EquiteService().calculer_equite(mains, board, mode="exact")
+
+    # THEN : 9 trèfles sur 44 cartes restantes
+    assert equite[2] == {"victoire": 9 / 44, "egalite": 0.0, "equite": 9 / 44}
+    assert equite[1]["victoire"] == 35 / 44
+
+
+def test_calculer_equite_auto_choisit_exact():
+    # GIVEN
+    mains = {1: [pytest.as_pique, pytest.as_coeur], 2: [pytest.roi_pique, pytest.roi_coeur]}
+    board = [pytest.deux_trefle, pytest.sept_carreau, pytest.roi_trefle]
+
+    # WHEN
+    equite_auto = EquiteService().calculer_equite(mains, board, 10, seed=1, mode="auto")
+    equite_exacte = EquiteService().calculer_equite(mains, board, mode="exact")
+
+    # THEN
+    assert equite_auto == equite_exacte
+    assert equite_exacte[1]["victoire"] == 85 / 990
+
+
+def test_calculer_equite_exact_main_inconnue():
+    # GIVEN
+    mains = {1: [pytest.as_pique, pytest.as_coeur], 2: None}
+
+    # THEN
+    with pytest.raises(ValueError):
+        # WHEN
+        EquiteService().calculer_equite(mains, None, mode="exact")
+
+
+def test_calculer_equite_exact_preflop_refuse():
+    # GIVEN : trois mains connues, aucune carte commune
+    mains = {
+        1: [pytest.as_pique, pytest.as_coeur],
+        2: [pytest.roi_pique, pytest.roi_coeur],
+        3: [pytest.deux_trefle, pytest.sept_carreau],
+    }
+
+    # THEN
+    with pytest.raises(ValueError):
+        # WHEN
+        EquiteService().calculer_equite(mains, None, mode="exact")
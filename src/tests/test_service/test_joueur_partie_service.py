@@ -167,3 +167,102 @@ def test_se_coucher_invalid_joueur():
         # THEN
         with pytest.raises(ValueError):
             joueur_partie_service.se_coucher(id_joueur)
+
+def test_miser_async_ok():
+    # GIVEN
+    import asyncio
+    from unittest.mock import AsyncMock
+    from src.dao.joueur_partie_dao_async import JoueurPartieDaoAsync
+
+    with patch.object(JoueurPartieDaoAsync, 'miser', new_callable=AsyncMock, return_value=True) as mock_miser:
+        # WHEN
+        result = asyncio.run(JoueurPartieService().miser_async(1, 50, 2))
+
+        # THEN
+        assert result is True
+        mock_miser.assert_awaited_once_with(1, 50, 2)
+
+def test_miser_async_montant_invalide():
+    # GIVEN
+    import asyncio
+
+    # THEN
+    with pytest.raises(ValueError):
+        # WHEN
+        asyncio.run(JoueurPartieService().miser_async(1, 0, 2))
+
+def test_miser_async_sans_table():
+    # GIVEN
+    import asyncio
+
+    # THEN
+    with pytest.raises(ValueError):
+        # WHEN
+        asyncio.run(JoueurPartieService().miser_async(1, 50, None))
+
+def test_miser_atomique_ok():
+    # GIVEN
+    soldes = {"credit": 970.0, "mise_tour": 30, "pot": 30.0, "id_transaction": 1}
+
+    with patch.object(JoueurPartieDao, 'miser_atomique', return_value=soldes) as mock_miser:
+        # WHEN
+        resultat = JoueurPartieService().miser_atomique(1, 4, 30)
+
+        # THEN
+        assert resultat == soldes
+        mock_miser.assert_called_once_with(1, 4, 30)
+
+
+def test_miser_atomique_montant_negatif():
+    # GIVEN / WHEN / THEN
+    with pytest.raises(ValueError):
+        JoueurPartieService().miser_atomique(1, 4, 0)
+
+
+def test_acheter_tapis_ok():
+    # GIVEN
+    with patch.object(JoueurPartieDao, 'acheter_tapis', return_value=700.0) as mock_acheter:
+        # WHEN
+        credit = JoueurPartieService().acheter_tapis(1, 4, 300)
+
+        # THEN
+        assert credit == 700.0
+        mock_acheter.assert_called_once_with(1, 4, 300)
+
+
+def test_acheter_tapis_invalide():
+    # GIVEN / WHEN / THEN
+    with pytest.raises(ValueError):
+        JoueurPartieService().acheter_tapis(1, 4, 0)
+    with pytest.raises(ValueError):
+        JoueurPartieService().acheter_tapis(1, None, 300)
+
+
+def test_rendre_tapis_ok():
+    # GIVEN
+    with patch.object(JoueurPartieDao, 'rendre_tapis', return_value=1150.0) as mock_rendre:
+        # WHEN
+        credit = JoueurPartieService().rendre_tapis(1, 4, 450)
+
+        # THEN
+        assert credit == 1150.0
+        mock_rendre.assert_called_once_with(1, 4, 450)
+
+
+def test_obtenir_statuts_ok():
+    # GIVEN
+    statuts = {1: "en jeu", 2: "s'est couché"}
+
+    with patch.object(JoueurPartieDao, 'recuperer_statuts', return_value=statuts) as mock_recuperer_statuts:
+        # WHEN
+        resultat = JoueurPartieService().obtenir_statuts(4)
+
+        # THEN
+        assert resultat == statuts
+        mock_recuperer_statuts.assert_called_once_with(4)
+
+
+def test_obtenir_statuts_sans_table():
+    # GIVEN / WHEN / THEN
+    with pytest.raises(ValueError):
+        JoueurPartieService().obtenir_statuts(None)
@@ -0,0 +1,47 @@
+from datetime import datetime
+from unittest.mock import patch
+
+from src.utils.singleton import Singleton
+from src.dao.partie_dao import PartieDao
+from src.business_object.moteur_table import ResumeMain
+from src.service import persistance_mains
+from src.service.persistance_mains import PersistanceMains
+
+
+def resume_main(numero):
+    return ResumeMain(id_table=1, numero=numero, date_debut=datetime.now(), board=(), mains={},
+                      actions=(), contributions={998: 10.0}, gains={998: 10.0}, soldes={998: 100.0})
+
+
+def test_soumettre_enregistre_dans_l_ordre():
+    # GIVEN
+    enregistres = []
+    with patch.dict(Singleton._instances, clear=True), \
+            patch.object(PartieDao, "enregistrer_main", side_effect=lambda r: enregistres.append(r.numero) or 1):
+        persistance = PersistanceMains()
+
+        # WHEN
+        for numero in (1, 2, 3):
+            persistance.soumettre(resume_main(numero))
+        vide = persistance.vider(delai=5)
+        persistance.arreter(delai=5)
+
+    # THEN
+    assert vide
+    assert enregistres == [1, 2, 3]
+
+
+def test_soumettre_reessaie_puis_abandonne():
+    # GIVEN
+    with patch.dict(Singleton._instances, clear=True), \
+            patch.object(persistance_mains, "PAUSE_TENTATIVE", 0), \
+            patch.object(PartieDao, "enregistrer_main", return_value=None) as mock_enregistrer:
+        persistance = PersistanceMains()
+
+        # WHEN
+        persistance.soumettre(resume_main(1))
+        persistance.arreter(delai=5)
+
+    # THEN
+    assert mock_enregistrer.call_count == persistance_mains.NB_TENTATIVES
+    assert persistance.nb_echecs == 1
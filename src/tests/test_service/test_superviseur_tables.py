@@ -0,0 +1,136 @@
+import pytest
+from unittest.mock import patch
+
+from src.utils.singleton import Singleton
+from src.service.superviseur_tables import SuperviseurTables, _ProcessusTables
+
+
+@pytest.fixture
+def restitutions():
+    return []
+
+
+@pytest.fixture
+def superviseur(restitutions):
+    with patch.dict(Singleton._instances, clear=True):
+        superviseur = SuperviseurTables(
+            nb_processus=2, nb_max=3, restituer=lambda *restitution: restitutions.append(restitution)
+        )
+        yield superviseur
+        superviseur.arreter()
+
+
+def test_tables_reparties_sur_les_processus(superviseur):
+    # GIVEN / WHEN
+    for id_table in range(1, 11):
+        superviseur.ouvrir_table(id_table, 10)
+
+    # THEN
+    assert superviseur.nb_processus == 2
+    assert set(superviseur.tables().values()) == {0, 1}
+    assert superviseur.ouvrir_table(1, 10) is False
+
+
+def test_jouer_et_action_illegale(superviseur):
+    # GIVEN
+    superviseur.ouvrir_table(1, 10)
+    superviseur.ajouter_joueur(1, 998, 1000)
+    superviseur.ajouter_joueur(1, 999, 1000)
+
+    # WHEN
+    superviseur.nouvelle_main(1)
+    etat = superviseur.etat(1)
+
+    # THEN
+    assert etat["pot"] == 15
+    assert etat["id_joueur_tour"] == 998
+    assert len(superviseur.main(1, 998)) == 2
+    assert superviseur.main(1, 997) == []
+    with pytest.raises(ValueError):
+        superviseur.agir(1, 999, "suivre")
+    with pytest.raises(ValueError):
+        superviseur.nouvelle_main(2)
+    assert superviseur.etat(2) is None
+
+
+def test_ajouter_processus_deplace_les_tables_en_cours(superviseur):
+    # GIVEN
+    for id_table in range(1, 21):
+        superviseur.ouvrir_table(id_table, 10)
+        superviseur.ajouter_joueur(id_table, 998, 1000)
+        superviseur.ajouter_joueur(id_table, 999, 1000)
+        superviseur.nouvelle_main(id_table)
+    etats = {id_table: superviseur.etat(id_table) for id_table in range(1, 21)}
+
+    # WHEN
+    nb_deplacees = superviseur.ajouter_processus()
+
+    # THEN : seules des tables attribuées au nouveau processus ont bougé, main en cours comprise
+    tables = superviseur.tables()
+    assert nb_deplacees == sum(1 for indice in tables.values() if indice == 2) > 0
+    assert {id_table: superviseur.etat(id_table) for id_table in range(1, 21)} == etats
+    id_deplacee = next(id_table for id_table, indice in tables.items() if indice == 2)
+    assert superviseur.agir(id_deplacee, 998, "suivre") is None
+    assert superviseur.etat(id_deplacee)["pot"] == 20
+
+
+def test_ajouter_processus_limite(superviseur):
+    # GIVEN
+    superviseur.ajouter_processus()
+
+    # WHEN / THEN
+    with pytest.raises(ValueError):
+        superviseur.ajouter_processus()
+    assert superviseur.nb_processus == 3
+
+
+def test_ajouter_processus_import_echoue(superviseur):
+    # GIVEN
+    for id_table in range(1, 21):
+        superviseur.ouvrir_table(id_table, 10)
+        superviseur.ajouter_joueur(id_table, 998, 1000)
+        superviseur.ajouter_joueur(id_table, 999, 1000)
+        superviseur.nouvelle_main(id_table)
+    tables = superviseur.tables()
+    etats = {id_table: superviseur.etat(id_table) for id_table in range(1, 21)}
+    envoyer = _ProcessusTables.envoyer
+
+    def envoyer_sauf_import(processus, commande, id_table=None, args=()):
+        if commande == "importer" and processus is nouveau[0]:
+            raise ValueError("processus perdu")
+        return envoyer(processus, commande, id_table, args)
+
+    nouveau = []
+    init = _ProcessusTables.__init__
+
+    def init_memorise(processus, contexte):
+        init(processus, contexte)
+        nouveau.append(processus)
+
+    # WHEN
+    with patch.object(_ProcessusTables, "__init__", init_memorise), \
+         patch.object(_ProcessusTables, "envoyer", envoyer_sauf_import):
+        nb_deplacees = superviseur.ajouter_processus()
+
+    # THEN : aucune table déplacée, chacune est restée dans son processus avec sa main en cours
+    assert nb_deplacees == 0
+    assert superviseur.tables() == tables
+    assert {id_table: superviseur.etat(id_table) for id_table in range(1, 21)} == etats
+
+
+def test_arreter_restitue_les_tapis(superviseur, restitutions):
+    # GIVEN : une main en cours sur la table 1, aucune sur la table 2
+    superviseur.ouvrir_table(1, 10)
+    superviseur.ajouter_joueur(1, 998, 1000)
+    superviseur.ajouter_joueur(1, 999, 1000)
+    superviseur.nouvelle_main(1)
+    superviseur.agir(1, 998, "miser", 40)
+    superviseur.ouvrir_table(2, 10)
+    superviseur.ajouter_joueur(2, 998, 300)
+
+    # WHEN
+    superviseur.arreter()
+
+    # THEN : la main en cours est annulée, chaque tapis est rendu une fois
+    assert sorted(restitutions) == [(1, 998, 1000), (1, 999, 1000), (2, 998, 300)]
+    assert superviseur.tables() == {}
@@ -189,4 +189,62 @@ def test_quitter_table_ko_joueur_non_trouve(mock_table_dao):
     # THEN
     assert result is False
     mock_table_dao["trouver_par_id"].assert_called_once_with(id_table)
-    mock_table_dao["modifier"].assert_not_called()
\ No newline at end of file
+    mock_table_dao["modifier"].assert_not_called()
+def test_get_pot_async():
+    # GIVEN
+    import asyncio
+    from unittest.mock import AsyncMock
+    from src.dao.table_dao_async import TableDaoAsync
+
+    with patch.object(TableDaoAsync, 'get_pot', new_callable=AsyncMock, return_value=150.0) as mock_get_pot:
+        # WHEN
+        pot = asyncio.run(TableService().get_pot_async(3))
+
+        # THEN
+        assert pot == 150.0
+        mock_get_pot.assert_awaited_once_with(3)
+
+
+def test_etat_table_ok():
+    # GIVEN
+    from src.business_object.etat_table import EtatTable, JoueurAssis
+    etat = EtatTable(id_table=3, pot=40.0, id_joueur_tour=998,
+                     joueurs=(JoueurAssis(998, 1, "en jeu"), JoueurAssis(997, 2, "s'est couché")))
+
+    with patch.object(TableDao, 'snapshot', return_value=etat) as mock_snapshot:
+        # WHEN
+        resultat = TableService().etat_table(3)
+
+        # THEN
+        assert resultat is etat
+        assert resultat.joueurs_avec_statut({"en jeu"}) == [998]
+        mock_snapshot.assert_called_once_with(3)
+
+
+def test_etat_table_sans_id():
+    # GIVEN / WHEN / THEN
+    with patch.object(TableDao, 'snapshot') as mock_snapshot:
+        with pytest.raises(ValueError):
+            TableService().etat_table(None)
+        mock_snapshot.assert_not_called()
+
+
+def test_distribuer_pot_ok():
+    # GIVEN
+    gains = {998: 15.5, 997: 15.5}
+
+    with patch.object(TableDao, 'distribuer_pot', return_value=True) as mock_distribuer:
+        # WHEN
+        resultat = TableService().distribuer_pot(3, gains)
+
+        # THEN
+        assert resultat
+        mock_distribuer.assert_called_once_with(3, gains)
+
+
+def test_distribuer_pot_gain_negatif():
+    # GIVEN / WHEN / THEN
+    with patch.object(TableDao, 'distribuer_pot') as mock_distribuer:
+        with pytest.raises(ValueError):
+            TableService().distribuer_pot(3, {998: -5})
+        mock_distribuer.assert_not_called()
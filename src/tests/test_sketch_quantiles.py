@@ -0,0 +1,87 @@
+import bisect
+import random
+import pytest
+
+from src.utils.sketch_quantiles import SketchKLL
+
+
+def erreur_de_rang(valeurs_triees, valeur, q):
+    return abs(bisect.bisect_right(valeurs_triees, valeur) / len(valeurs_triees) - q)
+
+
+class TestSketchKLL:
+    def test_exact_sous_la_capacite(self):
+        # GIVEN
+        sketch = SketchKLL()
+
+        # WHEN
+        for valeur in range(1, 101):
+            sketch.ajouter(valeur)
+
+        # THEN
+        assert sketch.quantile(0.5) == 50
+        assert sketch.quantile(0.9) == 90
+        assert (sketch.min, sketch.max, sketch.n) == (1, 100, 100)
+        assert (sketch.somme, sketch.moyenne) == (5050, 50.5)
+        assert sketch.ecart_type == pytest.approx(29.0115, abs=1e-4)
+
+    def test_erreur_de_rang_et_memoire_bornees(self):
+        # GIVEN
+        rng = random.Random(1)
+        valeurs = [rng.lognormvariate(3, 1) for _ in range(50000)]
+        sketch = SketchKLL(rng=random.Random(2))
+
+        # WHEN
+        for valeur in valeurs:
+            sketch.ajouter(valeur)
+
+        # THEN
+        triees = sorted(valeurs)
+        for q in (0.5, 0.9, 0.99):
+            assert erreur_de_rang(triees, sketch.quantile(q), q) < 0.0165
+        assert sketch.nb_retenues < 3 * sketch.k
+        assert (sketch.min, sketch.max) == (triees[0], triees[-1])
+
+    def test_fusionner(self):
+        # GIVEN : deux tables aux pots d'ordres de grandeur différents
+        petits, gros = SketchKLL(rng=random.Random(1)), SketchKLL(rng=random.Random(2))
+        for valeur in range(20000):
+            petits.ajouter(valeur)
+            gros.ajouter(20000 + valeur)
+
+        # WHEN
+        petits.fusionner(gros)
+
+        # THEN
+        assert petits.n == 40000
+        assert erreur_de_rang(list(range(40000)), petits.quantile(0.5), 0.5) < 0.0165
+        assert petits.max == 39999
+        assert petits.somme == sum(range(40000))
+
+    def test_en_bytes_depuis_bytes(self):
+        # GIVEN
+        sketch = SketchKLL(rng=random.Random(3))
+        for valeur in range(5000):
+            sketch.ajouter(valeur / 4)
+
+        # WHEN
+        donnees = sketch.en_bytes()
+        copie = SketchKLL.depuis_bytes(donnees)
+
+        # THEN : ~4 octets par valeur gardée
+        assert len(donnees) < 8 * sketch.nb_retenues + 64
+        assert (copie.n, copie.somme, copie.ecart_type) == (sketch.n, sketch.somme, sketch.ecart_type)
+        assert copie.quantiles([0.5, 0.9, 0.99]) == sketch.quantiles([0.5, 0.9, 0.99])
+
+    def test_sketch_vide(self):
+        # GIVEN / WHEN
+        sketch = SketchKLL.depuis_bytes(b"")
+
+        # THEN
+        assert sketch.quantile(0.5) is None
+        assert SketchKLL.depuis_bytes(sketch.en_bytes()).n == 0
+
+    def test_quantile_invalide(self):
+        # GIVEN / WHEN / THEN
+        with pytest.raises(ValueError):
+            SketchKLL().quantile(1.5)
@@ -0,0 +1,62 @@
+import bisect
+import hashlib
+
+# Nombre de points de chaque nœud sur l'anneau : plus il est élevé, plus la répartition est régulière
+NB_POINTS_PAR_NOEUD = 64
+
+
+def _hacher(cle: str) -> int:
+    """Hachage stable d'une clé (identique d'un processus à l'autre, contrairement à hash())"""
+    return int.from_bytes(hashlib.md5(cle.encode()).digest()[:8], "big")
+
+
+class AnneauHachage:
+    """
+    Hachage cohérent : associe chaque clé à un nœud
+
+    Chaque nœud occupe NB_POINTS_PAR_NOEUD points sur un anneau ; une clé appartient au nœud
+    du premier point qui la suit. Ajouter un nœud ne déplace qu'environ 1/n des clés,
+    toutes vers le nouveau nœud.
+
+    Exemple
+    -------
+    >>> anneau = AnneauHachage([0, 1, 2])
+    >>> anneau.noeud(42) in (0, 1, 2)
+    True
+    """
+
+    def __init__(self, noeuds=(), nb_points: int = NB_POINTS_PAR_NOEUD):
+        self.__nb_points = nb_points
+        self.__points = []
+        self.__noeuds_points = []
+        self.noeuds = []
+        for noeud in noeuds:
+            self.ajouter(noeud)
+
+    def __len__(self):
+        return len(self.noeuds)
+
+    def ajouter(self, noeud):
+        """Ajoute un nœud à l'anneau"""
+        if noeud in self.noeuds:
+            raise ValueError(f"Le nœud {noeud} est déjà dans l'anneau.")
+        self.noeuds.append(noeud)
+        for i in range(self.__nb_points):
+            point = _hacher(f"{noeud}#{i}")
+            indice = bisect.bisect(self.__points, point)
+            self.__points.insert(indice, point)
+            self.__noeuds_points.insert(indice, noeud)
+
+    def retirer(self, noeud):
+        """Retire un nœud de l'anneau : ses clés reviennent aux nœuds suivants"""
+        self.noeuds.remove(noeud)
+        garder = [i for i, n in enumerate(self.__noeuds_points) if n != noeud]
+        self.__points = [self.__points[i] for i in garder]
+        self.__noeuds_points = [self.__noeuds_points[i] for i in garder]
+
+    def noeud(self, cle):
+        """Nœud auquel appartient la clé"""
+        if not self.__points:
+            raise ValueError("L'anneau ne contient aucun nœud.")
+        indice = bisect.bisect(self.__points, _hacher(str(cle))) % len(self.__points)
+        return self.__noeuds_points[indice]
@@ -0,0 +1,81 @@
+"""Test de charge des endpoints les plus sollicités de l'API.
+
+Lance des clients concurrents pendant une durée donnée sur chaque endpoint et affiche
+le nombre de requêtes par seconde et la latence médiane.
+
+Usage (API lancée au préalable, par ex. ``python -m uvicorn src.api:app --port 9876``) :
+
+    python -m src.utils.benchmark_api --url http://127.0.0.1:9876 --clients 50 --duree 10
+
+Pour comparer deux versions de l'API, lancer le script successivement contre chacune,
+sur la même base PostgreSQL locale.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def endpoints(id_table: int, id_joueur: int) -> list:
+    """(nom, méthode, chemin, corps JSON) des endpoints mesurés"""
+    return [
+        ("GET /tables/{id}/pot", "GET", f"/tables/{id_table}/pot", None),
+        ("GET /tables/{id}/cartes-communes", "GET", f"/tables/{id_table}/cartes-communes", None),
+        ("GET /joueurs/{id}", "GET", f"/joueurs/{id_joueur}", None),
+        ("POST /joueurs-partie/miser", "POST", "/joueurs-partie/miser",
+         {"id_joueur": id_joueur, "montant": 1, "id_table": id_table}),
+    ]
+
+
+async def _client(client: httpx.AsyncClient, methode, chemin, corps, fin: float, latences: list, erreurs: list):
+    """Enchaîne les requêtes jusqu'à l'instant fin"""
+    while time.perf_counter() < fin:
+        debut = time.perf_counter()
+        try:
+            reponse = await client.request(methode, chemin, json=corps)
+            if reponse.status_code >= 500:
+                erreurs.append(reponse.status_code)
+        except httpx.HTTPError as e:
+            erreurs.append(type(e).__name__)
+        latences.append(time.perf_counter() - debut)
+
+
+async def mesurer(url: str, methode: str, chemin: str, corps, nb_clients: int, duree: float) -> dict:
+    """Mesure le débit d'un endpoint avec nb_clients clients concurrents pendant duree secondes"""
+    limites = httpx.Limits(max_connections=nb_clients, max_keepalive_connections=nb_clients)
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=30) as client:
+        await client.request(methode, chemin, json=corps)  # échauffement
+        latences, erreurs = [], []
+        fin = time.perf_counter() + duree
+        await asyncio.gather(*(
+            _client(client, methode, chemin, corps, fin, latences, erreurs) for _ in range(nb_clients)
+        ))
+    return {
+        "requetes_par_seconde": len(latences) / duree,
+        "latence_mediane_ms": 1000 * statistics.median(latences) if latences else float("nan"),
+        "erreurs": len(erreurs),
+    }
+
+
+async def main(url: str, nb_clients: int, duree: float, id_table: int, id_joueur: int):
+    print(f"{nb_clients} clients concurrents, {duree:.0f} s par endpoint, {url}")
+    for nom, methode, chemin, corps in endpoints(id_table, id_joueur):
+        resultat = await mesurer(url, methode, chemin, corps, nb_clients, duree)
+        print(
+            f"{nom:<38} {resultat['requetes_par_seconde']:>9.1f} req/s   "
+            f"médiane {resultat['latence_mediane_ms']:>7.1f} ms   erreurs {resultat['erreurs']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge de l'API PickPoker")
+    parser.add_argument("--url", default="http://127.0.0.1:9876")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duree", type=float, default=10)
+    parser.add_argument("--id-table", type=int, default=1)
+    parser.add_argument("--id-joueur", type=int, default=999)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.url, arguments.clients, arguments.duree, arguments.id_table, arguments.id_joueur))
@@ -0,0 +1,258 @@
+"""Cache des résultats des requêtes de statistiques.
+
+Les méthodes de lecture décorées par cache_resultat gardent leur résultat en mémoire, par méthode
+et arguments, pendant une durée de vie (TTL) et dans la limite d'un nombre d'entrées (les moins
+récemment utilisées sont évincées). Chaque entrée est étiquetée par les tables SQL qu'elle lit ;
+les méthodes d'écriture des DAO décorées par invalide_cache suppriment les entrées qui lisent
+les tables qu'elles modifient.
+
+Une méthode de lecture qui rattrape une erreur et rend une valeur par défaut (None, [], {})
+appelle signaler_echec : ce résultat n'est pas gardé, l'appel suivant refait la requête.
+
+Le cache est propre à chaque processus : une écriture faite par un autre processus (processus
+de tables, autre worker de l'API) n'est vue qu'à l'expiration de l'entrée.
+"""
+
+import contextvars
+import copy
+import inspect
+import os
+import threading
+import time
+
+from collections import OrderedDict
+from functools import wraps
+
+from src.utils.singleton import Singleton
+
+# Durée de vie d'une entrée, en secondes
+TTL_DEFAUT = 60.0
+
+# Nombre maximal d'entrées gardées
+TAILLE_DEFAUT = 256
+
+# Appel décoré par cache_resultat en cours (avec son appelant), pour signaler_echec
+_appel_en_cours = contextvars.ContextVar("appel_en_cours", default=None)
+
+
+class _Appel:
+    """Appel en cours d'une méthode décorée par cache_resultat"""
+
+    __slots__ = ("parent", "echec")
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.echec = False
+
+
+class CacheResultats(metaclass=Singleton):
+    """
+    Cache TTL + LRU des résultats, avec invalidation par table
+
+    Le cache est un singleton : la durée de vie et la taille sont lues une fois, à la
+    première construction, dans les variables d'environnement POKER_CACHE_TTL et
+    POKER_CACHE_TAILLE (TTL à 0 : cache désactivé). Les arguments ttl, taille_max et
+    horloge ne servent qu'à cette première construction (tests) ; les appels suivants
+    à CacheResultats() rendent la même instance, sans la reconfigurer.
+
+    Exemple
+    -------
+    >>> cache = CacheResultats()
+    >>> cache.mettre(("f", 1), 42, tables=("joueur",))
+    >>> cache.lire(("f", 1))
+    (True, 42)
+    >>> cache.invalider("joueur")
+    >>> cache.lire(("f", 1))
+    (False, None)
+    """
+
+    def __init__(self, ttl: float = None, taille_max: int = None, horloge=time.monotonic):
+        self.ttl = ttl if ttl is not None else float(os.environ.get("POKER_CACHE_TTL", TTL_DEFAUT))
+        self.taille_max = taille_max or int(os.environ.get("POKER_CACHE_TAILLE", TAILLE_DEFAUT))
+        self.__horloge = horloge
+        self.__entrees = OrderedDict()
+        self.__cles_par_table = {}
+        self.__generation = 0
+        self.__verrou = threading.Lock()
+        self.nb_succes = 0
+        self.nb_echecs = 0
+        self.nb_evictions = 0
+        self.nb_invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        """Compteur incrémenté à chaque invalidation"""
+        return self.__generation
+
+    def lire(self, cle) -> tuple:
+        """Cherche une entrée encore valide
+
+        Returns
+        -------
+        (trouve, valeur) : tuple
+            trouve vaut False si l'entrée est absente ou expirée
+        """
+        with self.__verrou:
+            entree = self.__entrees.get(cle)
+            if entree is not None and entree[0] <= self.__horloge():
+                self.__supprimer(cle)
+                entree = None
+            if entree is None:
+                self.nb_echecs += 1
+                return False, None
+            self.__entrees.move_to_end(cle)
+            self.nb_succes += 1
+            return True, entree[1]
+
+    def mettre(self, cle, valeur, tables: tuple = (), generation: int = None):
+        """Enregistre une entrée, évince la moins récemment utilisée si le cache est plein
+
+        Parameters
+        ----------
+        cle : hashable
+            Clé de l'entrée.
+        valeur : object
+            Résultat à garder.
+        tables : tuple, optional
+            Tables lues pour calculer le résultat.
+        generation : int, optional
+            Génération lue avant le calcul : si une invalidation a eu lieu depuis,
+            le résultat est peut-être périmé et n'est pas gardé.
+        """
+        if self.ttl <= 0:
+            return
+        with self.__verrou:
+            if generation is not None and generation != self.__generation:
+                return
+            if cle in self.__entrees:
+                self.__supprimer(cle)
+            self.__entrees[cle] = (self.__horloge() + self.ttl, valeur, tuple(tables))
+            for table in tables:
+                self.__cles_par_table.setdefault(table, set()).add(cle)
+            while len(self.__entrees) > self.taille_max:
+                self.__supprimer(next(iter(self.__entrees)))
+                self.nb_evictions += 1
+
+    def invalider(self, *tables):
+        """Supprime les entrées qui lisent l'une des tables (toutes si aucune n'est donnée)"""
+        with self.__verrou:
+            self.__generation += 1
+            self.nb_invalidations += 1
+            if not tables:
+                self.__entrees.clear()
+                self.__cles_par_table.clear()
+                return
+            for table in tables:
+                for cle in list(self.__cles_par_table.get(table, ())):
+                    self.__supprimer(cle)
+
+    def statistiques(self) -> dict:
+        """Compteurs du cache : succès, échecs, taux de succès, évictions, invalidations, taille"""
+        with self.__verrou:
+            nb_lectures = self.nb_succes + self.nb_echecs
+            return {
+                "nb_succes": self.nb_succes,
+                "nb_echecs": self.nb_echecs,
+                "taux_succes": round(self.nb_succes / nb_lectures, 4) if nb_lectures else 0.0,
+                "nb_evictions": self.nb_evictions,
+                "nb_invalidations": self.nb_invalidations,
+                "nb_entrees": len(self.__entrees),
+                "taille_max": self.taille_max,
+                "ttl": self.ttl,
+            }
+
+    def __supprimer(self, cle):
+        """Supprime une entrée et ses étiquettes (à appeler avec le verrou)"""
+        _, _, tables = self.__entrees.pop(cle)
+        for table in tables:
+            cles = self.__cles_par_table.get(table)
+            if cles is not None:
+                cles.discard(cle)
+                if not cles:
+                    del self.__cles_par_table[table]
+
+
+def cache_resultat(*tables):
+    """Décorateur de méthode de lecture : garde le résultat dans CacheResultats
+
+    La clé est le nom qualifié de la méthode et ses arguments (hors self). Le résultat
+    est copié à l'entrée et à la sortie du cache : l'appelant peut le modifier. Il n'est
+    pas gardé si signaler_echec a été appelée pendant l'appel.
+
+    Parameters
+    ----------
+    *tables : str
+        Tables lues par la méthode ; une écriture sur l'une d'elles invalide l'entrée.
+    """
+
+    def decorateur(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = CacheResultats()
+            cle = (func.__qualname__, args[1:], tuple(sorted(kwargs.items())))
+            trouve, valeur = cache.lire(cle)
+            if trouve:
+                return copy.deepcopy(valeur)
+            generation = cache.generation
+            appel = _Appel(_appel_en_cours.get())
+            jeton = _appel_en_cours.set(appel)
+            try:
+                resultat = func(*args, **kwargs)
+            finally:
+                _appel_en_cours.reset(jeton)
+            if not appel.echec:
+                cache.mettre(cle, copy.deepcopy(resultat), tables, generation)
+            return resultat
+
+        return wrapper
+
+    return decorateur
+
+
+def signaler_echec():
+    """Signale que la méthode de lecture en cours rend une valeur par défaut après une erreur
+
+    Ni son résultat, ni celui des méthodes décorées qui l'ont appelée ne sont gardés en cache.
+    Sans effet en dehors d'une méthode décorée par cache_resultat. Pour un appel fait dans
+    un autre thread, le lancer dans une copie du contexte (contextvars.copy_context().run).
+    """
+    appel = _appel_en_cours.get()
+    while appel is not None:
+        appel.echec = True
+        appel = appel.parent
+
+
+def invalide_cache(*tables):
+    """Décorateur de méthode d'écriture : invalide les résultats qui lisent les tables modifiées
+
+    L'invalidation a lieu après l'appel, que l'écriture ait réussi ou non.
+    Les méthodes asynchrones (async def) sont aussi prises en charge.
+
+    Parameters
+    ----------
+    *tables : str
+        Tables modifiées par la méthode.
+    """
+
+    def decorateur(func):
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    CacheResultats().invalider(*tables)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                CacheResultats().invalider(*tables)
+
+        return wrapper
+
+    return decorateur
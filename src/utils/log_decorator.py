@@ -1,3 +1,4 @@
+import inspect
 import logging.config
 import numbers
 
@@ -25,59 +26,82 @@ class LogIndetation:
         return "    " * cls.current_indentation
 
 
+def _debut(func, args, kwargs):
+    """Log de l'appel de la méthode, renvoie de quoi logger la sortie"""
+    logger = logging.getLogger(__name__)
+
+    LogIndetation.increase_indentation()
+    indentation = LogIndetation.get_indentation()
+
+    # Recuperation des parametres de la methode
+    class_name = args[0].__class__.__name__ if args else ""
+    method_name = func.__name__
+    args_list = list(
+        [str(arg) if not isinstance(arg, numbers.Number) else arg for arg in args[1:]]
+        + list(kwargs.values())
+    )
+
+    # pour cacher les mots de passe
+    param_names = func.__code__.co_varnames[1 : func.__code__.co_argcount]
+    for i, v in enumerate(param_names):
+        if v in ["password", "passwd", "pwd", "pass", "mot_de_passe", "mdp"] and i < len(args_list):
+            args_list[i] = "*****"
+
+    # Transforme en tuple pour avoir un affichage avec des parentheses
+    args_list = tuple(args_list)
+
+    # Affichage dans le fichier de log
+    logger.info(f"{indentation}{class_name}.{method_name}{args_list} - DEBUT")
+    return logger, indentation, f"{class_name}.{method_name}{args_list}"
+
+
+def _fin(logger, indentation, appel, result):
+    """Log de la sortie de la méthode"""
+    logger.info(f"{indentation}{appel} - FIN")
+
+    # Reduction de l affichage de la sortie si trop longue
+    if isinstance(result, list):
+        result_str = str([str(item) for item in result[:3]])
+        result_str += " ... (" + str(len(result)) + " elements)"
+    elif isinstance(result, dict):
+        result_str = [(str(k), str(v)) for k, v in result.items()][:3]
+        result_str += " ... (" + str(len(result)) + " elements)"
+    elif isinstance(result, str) and len(result) > 50:
+        result_str = result[:50]
+        result_str += " ... (" + str(len(result)) + " caracteres)"
+    else:
+        result_str = str(result)
+
+    logger.info(f"{indentation}   └─> Sortie : {result_str}")
+
+    LogIndetation.decrease_indentation()
+
+
 def log(func):
     """Création d'un décorateur nommé log
     Lorsque ce décorateur est appliqué à une méthode, cela affichera dans les logs :
     - l'appel de cette méthode avec les valeurs de paramètres
     - la sortie retournée par cette méthode
+    Les méthodes asynchrones (async def) sont aussi prises en charge : la sortie loggée
+    est le résultat attendu, pas la coroutine.
     """
 
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        logger = logging.getLogger(__name__)
-
-        LogIndetation.increase_indentation()
-        indentation = LogIndetation.get_indentation()
-
-        # Recuperation des parametres de la methode
-        class_name = args[0].__class__.__name__ if args else ""
-        method_name = func.__name__
-        args_list = list(
-            [str(arg) if not isinstance(arg, numbers.Number) else arg for arg in args[1:]]
-            + list(kwargs.values())
-        )
-
-        # pour cacher les mots de passe
-        param_names = func.__code__.co_varnames[1 : func.__code__.co_argcount]
-        for i, v in enumerate(param_names):
-            if v in ["password", "passwd", "pwd", "pass", "mot_de_passe", "mdp"]:
-                args_list[i] = "*****"
-
-        # Transforme en tuple pour avoir un affichage avec des parentheses
-        args_list = tuple(args_list)
-
-        # Affichage dans le fichier de log
-        logger.info(f"{indentation}{class_name}.{method_name}{args_list} - DEBUT")
-        result = func(*args, **kwargs)
-        logger.info(f"{indentation}{class_name}.{method_name}{args_list} - FIN")
+    if inspect.iscoroutinefunction(func):
 
-        # Reduction de l affichage de la sortie si trop longue
-        if isinstance(result, list):
-            result_str = str([str(item) for item in result[:3]])
-            result_str += " ... (" + str(len(result)) + " elements)"
-        elif isinstance(result, dict):
-            result_str = [(str(k), str(v)) for k, v in result.items()][:3]
-            result_str += " ... (" + str(len(result)) + " elements)"
-        elif isinstance(result, str) and len(result) > 50:
-            result_str = result[:50]
-            result_str += " ... (" + str(len(result)) + " caracteres)"
-        else:
-            result_str = str(result)
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            logger, indentation, appel = _debut(func, args, kwargs)
+            result = await func(*args, **kwargs)
+            _fin(logger, indentation, appel, result)
+            return result
 
-        logger.info(f"{indentation}   └─> Sortie : {result_str}")
-
-        LogIndetation.decrease_indentation()
+        return async_wrapper
 
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        logger, indentation, appel = _debut(func, args, kwargs)
+        result = func(*args, **kwargs)
+        _fin(logger, indentation, appel, result)
         return result
 
     return wrapper
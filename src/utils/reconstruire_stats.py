@@ -0,0 +1,36 @@
+"""Reconstruction des statistiques cumulées des joueurs (table stats_joueur),
+des séries d'activité par période (tables activite_*) et des sketchs de quantiles
+des pots et des mises (table sketch_quantiles).
+
+À lancer après les migrations 004 à 008 ou pour corriger les statistiques :
+    python -m src.utils.reconstruire_stats
+
+Les statistiques des joueurs sont reconstruites depuis les mains archivées (main_jouee et
+resultat_main) ; celles des joueurs sans main archivée sont laissées telles quelles
+(voir StatistiquesDao.reconstruire_stats_joueur).
+"""
+
+import logging
+
+import dotenv
+
+from src.dao.statistiques_dao import StatistiquesDao
+
+
+if __name__ == "__main__":
+    dotenv.load_dotenv()
+    nb_joueurs = StatistiquesDao().reconstruire_stats_joueur()
+    if nb_joueurs < 0:
+        logging.error("Echec de la reconstruction des statistiques")
+        raise SystemExit(1)
+    print(f"Statistiques recalculées pour {nb_joueurs} joueur(s)")
+    nb_heures = StatistiquesDao().reconstruire_activite()
+    if nb_heures < 0:
+        logging.error("Echec de la reconstruction de l'activité par période")
+        raise SystemExit(1)
+    print(f"Activité reconstruite sur {nb_heures} heure(s)")
+    nb_sketchs = StatistiquesDao().reconstruire_quantiles()
+    if nb_sketchs < 0:
+        logging.error("Echec de la reconstruction des quantiles")
+        raise SystemExit(1)
+    print(f"{nb_sketchs} sketch(s) de quantiles reconstruit(s)")
@@ -6,6 +6,7 @@ from unittest import mock
 
 from src.utils.log_decorator import log
 from src.utils.singleton import Singleton
+from src.utils.cache import invalide_cache
 from src.dao.db_connection import DBConnection
 
 from src.service.joueur_service import JoueurService
@@ -16,6 +17,7 @@ class ResetDatabase(metaclass=Singleton):
     """
 
     @log
+    @invalide_cache()
     def lancer(self, test_dao=False):
         """Lancement de la réinitialisation des données
         Si test_dao = True : réinitialisation des données de test"""
@@ -0,0 +1,210 @@
+"""Résumé de quantiles en flux (sketch KLL).
+
+Un SketchKLL garde un échantillon pondéré d'au plus ~3k valeurs, quel que soit le nombre de
+valeurs vues : le niveau h contient des valeurs de poids 2**h. Quand un niveau dépasse sa
+capacité, il est trié et une valeur sur deux (décalage aléatoire) monte au niveau suivant.
+
+Erreur : pour un quantile q, la valeur rendue a un rang réel compris entre (q - e)·n et (q + e)·n,
+avec e ≈ 1,65 % pour k = 200 (probabilité 99 %, valeur de référence de l'algorithme KLL) ;
+l'erreur décroît en O(1/k). Le nombre de valeurs, le minimum, le maximum, la somme, la moyenne
+et l'écart-type sont exacts.
+
+Les sketchs sont fusionnables (fusionner) : le sketch de plusieurs tables est la fusion de
+leurs sketchs, avec la même borne d'erreur. en_bytes / depuis_bytes donnent une forme
+compacte (valeurs en float32) pour les stocker en base (BYTEA).
+
+Exemple
+-------
+>>> sketch = SketchKLL()
+>>> for valeur in range(1, 101):
+...     sketch.ajouter(valeur)
+>>> sketch.quantile(0.5)
+50.0
+"""
+
+import math
+import random
+import struct
+
+# Paramètre de précision par défaut
+K_DEFAUT = 200
+
+# Rapport de capacité entre deux niveaux successifs
+FACTEUR_CAPACITE = 2 / 3
+
+# En-tête : version, k, nombre de niveaux, nombre de valeurs, minimum, maximum, somme, somme des carrés
+_ENTETE = struct.Struct("<BHBQdddd")
+_VERSION = 2
+
+
+class SketchKLL:
+    """
+    Sketch KLL : quantiles approchés d'un flux de valeurs en mémoire bornée
+
+    Attributs
+    ---------
+    k : int
+        Paramètre de précision (capacité du plus haut niveau).
+    n : int
+        Nombre de valeurs vues.
+    min, max : float
+        Plus petite et plus grande valeur vues (None si le sketch est vide).
+    somme : float
+        Somme des valeurs vues.
+    """
+
+    def __init__(self, k: int = K_DEFAUT, rng: random.Random = None):
+        if k < 8:
+            raise ValueError("Le paramètre k doit être au moins 8.")
+        self.k = k
+        self.n = 0
+        self.min = None
+        self.max = None
+        self.somme = 0.0
+        self.__somme_carres = 0.0
+        self.niveaux = [[]]
+        self.__rng = rng or random.Random()
+        self.__trie = None
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def nb_retenues(self) -> int:
+        """Nombre de valeurs gardées dans le sketch"""
+        return sum(len(niveau) for niveau in self.niveaux)
+
+    @property
+    def moyenne(self) -> float:
+        """Moyenne des valeurs vues (None si le sketch est vide)"""
+        return self.somme / self.n if self.n else None
+
+    @property
+    def ecart_type(self) -> float:
+        """Ecart-type (estimateur sans biais, comme STDDEV en SQL) ; None s'il y a moins de deux valeurs"""
+        if self.n < 2:
+            return None
+        return math.sqrt(max(0.0, (self.__somme_carres - self.somme**2 / self.n) / (self.n - 1)))
+
+    def ajouter(self, valeur: float):
+        """Ajoute une valeur au sketch"""
+        valeur = float(valeur)
+        self.niveaux[0].append(valeur)
+        self.n += 1
+        self.somme += valeur
+        self.__somme_carres += valeur * valeur
+        self.min = valeur if self.min is None else min(self.min, valeur)
+        self.max = valeur if self.max is None else max(self.max, valeur)
+        self.__trie = None
+        if len(self.niveaux[0]) >= self.__capacite(0):
+            self.__compacter()
+
+    def fusionner(self, autre: "SketchKLL"):
+        """Ajoute au sketch les valeurs résumées par un autre sketch"""
+        if autre.n == 0:
+            return
+        while len(self.niveaux) < len(autre.niveaux):
+            self.niveaux.append([])
+        for h, niveau in enumerate(autre.niveaux):
+            self.niveaux[h].extend(niveau)
+        self.n += autre.n
+        self.somme += autre.somme
+        self.__somme_carres += autre.__somme_carres
+        self.min = autre.min if self.min is None else min(self.min, autre.min)
+        self.max = autre.max if self.max is None else max(self.max, autre.max)
+        self.__trie = None
+        self.__compacter()
+
+    def quantile(self, q: float) -> float:
+        """Valeur approchée du quantile q (0 <= q <= 1), None si le sketch est vide"""
+        if not 0 <= q <= 1:
+            raise ValueError("Le quantile doit être compris entre 0 et 1.")
+        if self.n == 0:
+            return None
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+        valeurs, cumuls = self.__cumuls()
+        cible = q * cumuls[-1]
+        for valeur, cumul in zip(valeurs, cumuls):
+            if cumul >= cible:
+                return valeur
+        return self.max
+
+    def quantiles(self, qs) -> list:
+        """Valeurs approchées de plusieurs quantiles"""
+        return [self.quantile(q) for q in qs]
+
+    def en_bytes(self) -> bytes:
+        """Forme compacte du sketch (en-tête, puis chaque niveau : taille et valeurs en float32)"""
+        parties = [
+            _ENTETE.pack(
+                _VERSION,
+                self.k,
+                len(self.niveaux),
+                self.n,
+                math.nan if self.min is None else self.min,
+                math.nan if self.max is None else self.max,
+                self.somme,
+                self.__somme_carres,
+            )
+        ]
+        for niveau in self.niveaux:
+            parties.append(struct.pack(f"<I{len(niveau)}f", len(niveau), *niveau))
+        return b"".join(parties)
+
+    @classmethod
+    def depuis_bytes(cls, donnees: bytes, rng: random.Random = None) -> "SketchKLL":
+        """Reconstruit un sketch depuis sa forme compacte (un sketch vide si donnees est vide)"""
+        if not donnees:
+            return cls(rng=rng)
+        version, k, nb_niveaux, n, minimum, maximum, somme, somme_carres = _ENTETE.unpack_from(donnees)
+        if version != _VERSION:
+            raise ValueError(f"Version de sketch inconnue : {version}")
+        sketch = cls(k, rng)
+        sketch.n = n
+        sketch.min = None if math.isnan(minimum) else minimum
+        sketch.max = None if math.isnan(maximum) else maximum
+        sketch.somme = somme
+        sketch.__somme_carres = somme_carres
+        sketch.niveaux = []
+        position = _ENTETE.size
+        for _ in range(nb_niveaux):
+            (taille,) = struct.unpack_from("<I", donnees, position)
+            position += 4
+            sketch.niveaux.append(list(struct.unpack_from(f"<{taille}f", donnees, position)))
+            position += 4 * taille
+        return sketch
+
+    def __capacite(self, h: int) -> int:
+        """Capacité du niveau h : k pour le plus haut niveau, 2/3 de moins à chaque niveau en dessous"""
+        profondeur = len(self.niveaux) - h - 1
+        return max(2, math.ceil(self.k * FACTEUR_CAPACITE**profondeur))
+
+    def __compacter(self):
+        """Compacte les niveaux qui dépassent leur capacité, du plus bas au plus haut"""
+        h = 0
+        while h < len(self.niveaux):
+            if len(self.niveaux[h]) >= self.__capacite(h):
+                if h + 1 == len(self.niveaux):
+                    self.niveaux.append([])
+                niveau = sorted(self.niveaux[h])
+                # une valeur isolée reste au niveau : la somme des poids vaut toujours n
+                reste = [niveau.pop()] if len(niveau) % 2 else []
+                self.niveaux[h + 1].extend(niveau[self.__rng.randint(0, 1)::2])
+                self.niveaux[h] = reste
+            h += 1
+        self.__trie = None
+
+    def __cumuls(self):
+        """Valeurs gardées triées et poids cumulés (calculés une fois par état du sketch)"""
+        if self.__trie is None:
+            ponderees = sorted((valeur, 1 << h) for h, niveau in enumerate(self.niveaux) for valeur in niveau)
+            valeurs, cumuls, total = [], [], 0
+            for valeur, poids in ponderees:
+                total += poids
+                valeurs.append(valeur)
+                cumuls.append(total)
+            self.__trie = (valeurs, cumuls)
+        return self.__trie
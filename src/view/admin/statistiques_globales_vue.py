@@ -125,6 +125,7 @@ class StatistiquesGlobalesVue(VueAbstraite):
             print(f"Pot moyen : {stats['pot_moyen']:.2f}")
             print(f"Ecart-type du pot : {stats['ecart_type_pot']:.2f}")
             print(f"Pot median : {stats['mediane_pot']:.2f}")
+            print(f"Pot p90 / p99 : {stats['p90_pot']:.2f} / {stats['p99_pot']:.2f}")
             print(f"Pot minimum : {stats['pot_min']:.2f}")
             print(f"Pot maximum : {stats['pot_max']:.2f}")
             print(f"Somme totale des pots : {stats['somme_totale_pots']:.2f}")
@@ -143,6 +144,7 @@ class StatistiquesGlobalesVue(VueAbstraite):
             print(f"Mise moyenne : {stats['mise_moyenne']:.2f}")
             print(f"Ecart-type : {stats['ecart_type_mise']:.2f}")
             print(f"Mise mediane : {stats['mediane_mise']:.2f}")
+            print(f"Mise p90 / p99 : {stats['p90_mise']:.2f} / {stats['p99_mise']:.2f}")
             print(f"Mise minimum : {stats['mise_min']:.2f}")
             print(f"Mise maximum : {stats['mise_max']:.2f}")
             print(f"Somme totale des mises : {stats['somme_totale_mises']:.2f}")
@@ -221,49 +223,54 @@ class StatistiquesGlobalesVue(VueAbstraite):
         input("\nAppuyez sur Entree pour continuer...")
 
     def _afficher_rapport_complet(self, stats_dao: StatistiquesDao):
-        """Affiche un rapport complet."""
+        """Affiche un rapport complet, section par section dès que chacune est calculée."""
         print("\n" + "=" * 60)
         print("           RAPPORT COMPLET DE LA PLATEFORME")
         print("=" * 60 + "\n")
 
-        rapport = stats_dao.obtenir_rapport_complet()
-
-        if rapport:
-            # Stats globales
-            stats_g = rapport.get("stats_globales", {})
-            if stats_g:
-                print(">>> STATISTIQUES GENERALES")
-                print(f"    Joueurs: {stats_g.get('nb_joueurs_total', 0)}")
-                print(f"    Parties: {stats_g.get('nb_parties_total', 0)}")
-                print(f"    Tables: {stats_g.get('nb_tables_actives', 0)}")
-                print(f"    Credit total: {stats_g.get('credit_total_plateforme', 0):.2f}")
-                print()
-
-            # Stats parties
-            stats_p = rapport.get("stats_parties", {})
-            if stats_p:
-                print(">>> STATISTIQUES DES PARTIES")
-                print(f"    Pot moyen: {stats_p.get('pot_moyen', 0):.2f}")
-                print(f"    Pot max: {stats_p.get('pot_max', 0):.2f}")
-                print()
-
-            # Taux abandon
-            taux = rapport.get("taux_abandon", {})
-            if taux:
-                print(">>> TAUX D'ABANDON")
-                print(f"    Taux abandon: {taux.get('taux_abandon', 0):.1f}%")
-                print(f"    Taux victoire global: {taux.get('taux_victoire_global', 0):.1f}%")
-                print()
-
-            # Top joueurs
-            top = rapport.get("top_10_joueurs", [])
-            if top:
-                print(">>> TOP 3 JOUEURS (par credit)")
-                for i, j in enumerate(top[:3], 1):
-                    print(f"    {i}. {j.get('pseudo', 'N/A')} - {j.get('credit', 0):.2f}")
-                print()
-
-        else:
+        affichages = {
+            "stats_globales": self._afficher_section_globales,
+            "stats_parties": self._afficher_section_parties,
+            "taux_abandon": self._afficher_section_abandon,
+            "top_10_joueurs": self._afficher_section_top,
+        }
+        nb_sections = 0
+        for nom, section in stats_dao.iterer_rapport_complet(list(affichages)):
+            if section:
+                affichages[nom](section)
+                nb_sections += 1
+
+        if not nb_sections:
             print("Impossible de generer le rapport.")
 
         input("\nAppuyez sur Entree pour continuer...")
+
+    @staticmethod
+    def _afficher_section_globales(stats_g: dict):
+        print(">>> STATISTIQUES GENERALES")
+        print(f"    Joueurs: {stats_g.get('nb_joueurs_total', 0)}")
+        print(f"    Parties: {stats_g.get('nb_parties_total', 0)}")
+        print(f"    Tables: {stats_g.get('nb_tables_actives', 0)}")
+        print(f"    Credit total: {stats_g.get('credit_total_plateforme', 0):.2f}")
+        print(flush=True)
+
+    @staticmethod
+    def _afficher_section_parties(stats_p: dict):
+        print(">>> STATISTIQUES DES PARTIES")
+        print(f"    Pot moyen: {stats_p.get('pot_moyen', 0):.2f}")
+        print(f"    Pot max: {stats_p.get('pot_max', 0):.2f}")
+        print(flush=True)
+
+    @staticmethod
+    def _afficher_section_abandon(taux: dict):
+        print(">>> TAUX D'ABANDON")
+        print(f"    Taux abandon: {taux.get('taux_abandon', 0):.1f}%")
+        print(f"    Taux victoire global: {taux.get('taux_victoire_global', 0):.1f}%")
+        print(flush=True)
+
+    @staticmethod
+    def _afficher_section_top(top: list):
+        print(">>> TOP 3 JOUEURS (par credit)")
+        for i, j in enumerate(top[:3], 1):
+            print(f"    {i}. {j.get('pseudo', 'N/A')} - {j.get('credit', 0):.2f}")
+        print(flush=True)
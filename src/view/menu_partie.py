@@ -8,10 +8,13 @@ from src.business_object.siege import Siege
 from src.business_object.croupier import Croupier
 from src.business_object.liste_cartes import ListeCartes
 from src.business_object.monnaie import Monnaie
+from src.business_object.pot import Pot
 from src.business_object.main_joueur_complete import MainJoueurComplete
 from src.business_object.combinaison import Combinaison
-from src.service.transaction_service import TransactionService
-import time
+from src.service.equite_service import EquiteService
+from src.dao.notification_table import AbonnementTable
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import secrets
 
 COMBINAISON_LABELS = {
     Combinaison.CarteHaute: "Carte haute",
@@ -27,12 +30,63 @@ COMBINAISON_LABELS = {
 }
 
 
+# Le calcul d'équité tourne en arrière-plan pour ne pas bloquer la boucle de jeu
+EXECUTEUR_EQUITE = ThreadPoolExecutor(max_workers=1)
+
+
 class MenuPartie(VueAbstraite):
 
     def __init__(self, table):
         self.table = table
         self.solde_initial_partie = self.table.blind_initial.get()
 
+    @staticmethod
+    def lancer_calcul_equite(main, board, nb_adversaires):
+        """Lance en arrière-plan le calcul de l'équité de la main contre des adversaires inconnus."""
+        if nb_adversaires < 1:
+            return None
+        mains = {"joueur": main}
+        mains.update({f"adversaire {i}": None for i in range(1, nb_adversaires + 1)})
+        return EXECUTEUR_EQUITE.submit(EquiteService().calculer_equite, mains, board, 20000)
+
+    @staticmethod
+    def afficher_equite(calcul_equite, delai=0.5):
+        """Affiche l'équité si le calcul est terminé (attente bornée par delai secondes)."""
+        if calcul_equite is None:
+            return
+        try:
+            equite = calcul_equite.result(timeout=delai)["joueur"]
+        except TimeoutError:
+            print("Équité : calcul en cours...")
+            return
+        print(
+            f"Équité de ta main : {equite['equite']:.1%} "
+            f"(victoire {equite['victoire']:.1%}, égalité {equite['egalite']:.1%})"
+        )
+
+    @staticmethod
+    def repartir_pot(etat, mains: dict, meilleurs: list) -> dict:
+        """Gains de l'abattage, à partir des mises de chaque joueur sur la main (mise_tour).
+
+        Chaque couche du pot va à la meilleure main parmi les joueurs qui l'ont payée (voir
+        Pot.repartir) : un joueur à tapis ne gagne pas plus que ce qu'il a pu suivre. Les mises
+        absentes des contributions (joueurs partis pendant la main) vont aux meilleures mains.
+        """
+        pot = Pot()
+        for joueur_assis in etat.joueurs:
+            pot.ajouter_mise(float(joueur_assis.mise_tour or 0), joueur_assis.id_joueur)
+        # centimes indivisibles aux premiers joueurs après le bouton
+        ordre = etat.ids_joueurs
+        if etat.id_joueur_bouton in ordre:
+            debut = ordre.index(etat.id_joueur_bouton) + 1
+            ordre = ordre[debut:] + ordre[:debut]
+        gains = pot.repartir(mains, ordre)
+        reste = round(etat.pot - sum(gains.values()), 2)
+        if reste > 0:
+            for id_joueur, montant in Pot.partager(reste, meilleurs).items():
+                gains[id_joueur] = round(gains.get(id_joueur, 0) + montant, 2)
+        return gains
+
     def choisir_menu(self):
         session = Session()
         joueur = session.joueur
@@ -57,6 +111,8 @@ class MenuPartie(VueAbstraite):
             print(f"{joueur.pseudo} a été ajouté à la table {self.table.id_table}.")
             table_service = TableService()
             table_service.ajouter_joueur_table(self.table.id_table)
+            # Les attentes sont réveillées par les événements de la table (LISTEN/NOTIFY)
+            abonnement = AbonnementTable(self.table.id_table)
 
         else:
             print("Impossible d'ajouter le joueur à la partie.")
@@ -89,7 +145,7 @@ class MenuPartie(VueAbstraite):
                     quitter_partie = True
                     break
 
-                time.sleep(5)  # attente de 5 secondes avant de re-vérifier
+                abonnement.attendre({"joueurs"})  # attente de l'arrivée d'un joueur avant de re-vérifier
                 liste_joueurs_dans_partie = joueur_partie_service.lister_joueurs_selon_table(self.table.id_table)
 
             if quitter_partie == True:
@@ -112,14 +168,14 @@ class MenuPartie(VueAbstraite):
                         quitter_partie = True
                         break
 
-                    time.sleep(5)  # attente de 5 secondes avant de re-vérifier
+                    abonnement.attendre({"cartes_main"})  # attente de la distribution avant de re-vérifier
 
 
 
             ### Partie de code executée une seule fois
             if joueur.id_joueur == liste_joueurs_dans_partie[0]:
                 # Identifier le bouton du croupier (ici le premier joueur stocké dans la table)
-                id_bouton = TableService().get_id_joueur_bouton(self.table.id_table)
+                id_bouton = table_service.etat_table(self.table.id_table).id_joueur_bouton
 
                 # Si le bouton n'est pas défini ou plus dans la liste, choisir le premier joueur
                 if id_bouton not in liste_joueurs_dans_partie:
@@ -148,7 +204,8 @@ class MenuPartie(VueAbstraite):
                 print(f"Premier joueur à parler : {JoueurService().trouver_par_id(id_premier_joueur).pseudo}")
 
             # Stocker dans l'environnement de tous les joueurs l'id du premier a jouer
-            id_bouton = TableService().get_id_joueur_bouton(self.table.id_table)
+            etat = table_service.etat_table(self.table.id_table)
+            id_bouton = etat.id_joueur_bouton
             bouton_index = liste_joueurs_dans_partie.index(id_bouton)
             nb_joueurs = len(liste_joueurs_dans_partie)
             indice_grosse_blinde = (bouton_index + 2) % nb_joueurs
@@ -157,41 +214,22 @@ class MenuPartie(VueAbstraite):
             indice_premier_a_jouer = (indice_grosse_blinde + 1) % len(liste_joueurs_dans_partie)
             id_premier_joueur = liste_joueurs_dans_partie[indice_premier_a_jouer]
 
-            if joueur_partie_service.obtenir_statut(joueur.id_joueur, self.table.id_table) == "tour petite blinde":
-                # Débiter automatiquement les blindes et alimenter le pot
-                credit_pb = JoueurService().recuperer_credit(joueur.id_joueur)
-                montant_a_donner_blinde = float(credit_pb.get()) - float(self.table.blind_initial.get() / 2)
-                if montant_a_donner_blinde < 0:
+            if etat.statut(joueur.id_joueur) in {"tour petite blinde", "tour de blinde"}:
+                # Débiter automatiquement la blinde et alimenter le pot, en une seule transaction
+                blinde = float(self.table.blind_initial.get())
+                if etat.statut(joueur.id_joueur) == "tour petite blinde":
+                    blinde = blinde / 2
+                soldes = joueur_partie_service.miser_atomique(joueur.id_joueur, self.table.id_table, blinde)
+                if soldes is None:
                     print("Solde insufisant pour payer la blinde")
                     quitter_partie = True
                     break
-                else:
-                    JoueurService().modifier_credit(
-                        joueur.id_joueur, float(credit_pb.get()) - float(self.table.blind_initial.get() / 2)
-                    )
-                    TransactionService().enregistrer_transaction(joueur.id_joueur, - int(float(self.table.blind_initial.get() / 2)))
-
-                TableService().alimenter_pot(self.table.id_table, self.table.blind_initial.get() / 2)
-
-            if joueur_partie_service.obtenir_statut(joueur.id_joueur, self.table.id_table) == "tour de blinde":
-                credit_gb = JoueurService().recuperer_credit(joueur.id_joueur)
-                montant_a_donner_petite_blinde = float(credit_gb.get()) - float(self.table.blind_initial.get())
-                if montant_a_donner_petite_blinde < 0:
-                    print("Solde insufisant pour payer la blinde")
-                    quitter_partie = True
-                    break
-                else:
-                    JoueurService().modifier_credit(
-                        joueur.id_joueur, float(credit_gb.get()) - float(self.table.blind_initial.get())
-                    )
-                    TransactionService().enregistrer_transaction(joueur.id_joueur, - int(float(self.table.blind_initial.get())))
-
-                TableService().alimenter_pot(self.table.id_table, self.table.blind_initial.get())
+                joueur.credit = Monnaie(soldes["credit"])
 
             ### partie de code executée une seule fois
             if joueur.id_joueur == liste_joueurs_dans_partie[0]:
                 # executera le tirage dans le script d'un seul joueur
-                pioche = ListeCartes()
+                pioche = ListeCartes(rng=secrets.SystemRandom())
                 croupier = Croupier(pioche)
                 liste_joueurs_dans_partie = joueur_partie_service.lister_joueurs_selon_table(self.table.id_table)
                 mains_distribuees = croupier.distribuer2(liste_joueurs_dans_partie, 2)
@@ -222,16 +260,15 @@ class MenuPartie(VueAbstraite):
                 # if joueur.id_joueur == id_premier_joueur:
                 #     TableService().set_val_derniere_mise(self.table.id_table, 0.0)
 
-                liste_joueurs_en_jeu = []
                 statuts_en_jeu = {"tour de blinde", "tour petite blinde", "en jeu"}
-                for id_j in liste_joueurs_dans_partie:
-                    statut_joueur = joueur_partie_service.obtenir_statut(id_j, self.table.id_table)
-                    if statut_joueur in statuts_en_jeu:
-                        liste_joueurs_en_jeu.append(id_j)
+                etat = table_service.etat_table(self.table.id_table)
+                liste_joueurs_en_jeu = [
+                    id_j for id_j in liste_joueurs_dans_partie if etat.statut(id_j) in statuts_en_jeu
+                ]
 
-                while not TableService().get_id_joueur_tour(self.table.id_table) == joueur.id_joueur:
+                while not etat.id_joueur_tour == joueur.id_joueur:
                     print("En attente du tour des autres joueurs...")
-                    time.sleep(2)
+                    abonnement.attendre({"tour", "statut", "joueurs"})
 
                     action_attente = inquirer.select(
                         message="Voulez-vous continuer à attendre ou quitter la partie ?",
@@ -244,11 +281,10 @@ class MenuPartie(VueAbstraite):
                         break
 
                     # Vérifier que les joueurs ne sont pas partis pendant l'attente
-                    liste_joueurs_en_jeu = []
-                    for id_j in liste_joueurs_dans_partie:
-                        statut_joueur = joueur_partie_service.obtenir_statut(id_j, self.table.id_table)
-                        if statut_joueur in statuts_en_jeu:
-                            liste_joueurs_en_jeu.append(id_j)
+                    etat = table_service.etat_table(self.table.id_table)
+                    liste_joueurs_en_jeu = [
+                        id_j for id_j in liste_joueurs_dans_partie if etat.statut(id_j) in statuts_en_jeu
+                    ]
                     if len(liste_joueurs_en_jeu) == 1:
                         print("Tous les autres joueurs on quitté la partie")
                         break
@@ -267,29 +303,29 @@ class MenuPartie(VueAbstraite):
 
                 print(f"Votre credit actuel : {joueur.credit}")
 
+                # Une seule lecture de l'état de la table pour tout l'affichage et le calcul des mises
+                etat = table_service.etat_table(self.table.id_table)
+                statut_joueur = etat.statut(joueur.id_joueur)
+
                 print(f"Valeur actuelle de la blinde : {self.table.blind_initial}")
 
                 if tour == "Pré-flop":
-                    if joueur_partie_service.obtenir_statut(joueur.id_joueur, self.table.id_table) == "tour de blinde":
+                    if statut_joueur == "tour de blinde":
                         print("C'est ton tour de grosse blinde")
-                    if (
-                        joueur_partie_service.obtenir_statut(joueur.id_joueur, self.table.id_table)
-                        == "tour petite blinde"
-                    ):
+                    if statut_joueur == "tour petite blinde":
                         print("C'est ton tour de petite blinde")
 
-                pot_actuel = TableService().get_pot(id_table)
+                pot_actuel = etat.pot
                 print(f"Pot actuel : {pot_actuel}")
 
-                cartes_communes = table_service.get_cartes_communes(id_table)
-                flop = cartes_communes["flop"]
-                flop_cartes = flop.get_cartes()
+                flop = etat.flop
+                flop_cartes = list(flop)
                 flop_affichage = ", ".join(str(c) for c in flop_cartes)
-                turn = cartes_communes["turn"]
-                turn_carte = turn.get_cartes()
+                turn = etat.turn
+                turn_carte = list(turn)
                 turn_affichage = ", ".join(str(c) for c in turn_carte)
-                river = cartes_communes["river"]
-                river_carte = river.get_cartes()
+                river = etat.river
+                river_carte = list(river)
                 river_affichage = ", ".join(str(c) for c in river_carte)
                 if tour == "Flop":
                     print(f"Le flop est : {flop_affichage}")
@@ -302,25 +338,25 @@ class MenuPartie(VueAbstraite):
                     print(f"La river est : {river_affichage}")
                 print(f"Ta main est : {main_joueur_join}")
 
-                if not joueur_partie_service.obtenir_statut(joueur.id_joueur, self.table.id_table) in {
+                board_visible = {"Pré-flop": [], "Flop": flop_cartes, "Turn": flop_cartes + turn_carte,
+                                 "River": flop_cartes + turn_carte + river_carte}[tour]
+                calcul_equite = self.lancer_calcul_equite(cartes, board_visible, len(liste_joueurs_en_jeu) - 1)
+
+                if not statut_joueur in {
                     "tour de blinde",
                     "tour petite blinde",
                 } and tour == "Pré-flop":
-                    montant_pour_suivre = float(self.table.blind_initial.valeur) + float(
-                        TableService().get_val_derniere_mise(self.table.id_table)
-                    )
+                    montant_pour_suivre = float(self.table.blind_initial.valeur) + etat.val_derniere_mise
                     print(f"La valeur a payer pour suivre est : {montant_pour_suivre}")
-                elif (
-                    joueur_partie_service.obtenir_statut(joueur.id_joueur, self.table.id_table) == "tour petite blinde"
-                ) and tour == "Pré-flop":
-                    montant_pour_suivre = float(self.table.blind_initial.valeur) / 2 + float(
-                        TableService().get_val_derniere_mise(self.table.id_table)
-                    )
+                elif statut_joueur == "tour petite blinde" and tour == "Pré-flop":
+                    montant_pour_suivre = float(self.table.blind_initial.valeur) / 2 + etat.val_derniere_mise
                     print(f"La valeur a payer pour suivre est : {montant_pour_suivre}")
                 else:
-                    montant_pour_suivre = float(TableService().get_val_derniere_mise(self.table.id_table))
+                    montant_pour_suivre = etat.val_derniere_mise
                     print(f"La valeur a payer pour suivre est : {montant_pour_suivre}")
 
+                self.afficher_equite(calcul_equite)
+
                 action = inquirer.select(
                     message="Que voulez-vous faire ?",
                     choices=["Miser", "Suivre", "Se coucher", "Quitter la partie"],
@@ -330,91 +366,69 @@ class MenuPartie(VueAbstraite):
                     montant = int(inquirer.text(message="Montant à miser : ").execute())
 
                     if tour == "Pré-flop" and (
-                        not joueur_partie_service.obtenir_statut(joueur.id_joueur, self.table.id_table)
-                        in {"tour de blinde", "tour petite blinde"}
+                        not statut_joueur in {"tour de blinde", "tour petite blinde"}
                     ):
                         valeur_totale_paye = (
                             float(montant)
-                            + float(TableService().get_val_derniere_mise(self.table.id_table))
+                            + etat.val_derniere_mise
                             + float(self.table.blind_initial.valeur)
                         )
 
-                    elif (
-                        joueur_partie_service.obtenir_statut(joueur.id_joueur, self.table.id_table)
-                        == "tour petite blinde"
-                    ):
+                    elif statut_joueur == "tour petite blinde":
                         valeur_totale_paye = float(montant) + float(
-                            TableService().get_val_derniere_mise(self.table.id_table)
+                            etat.val_derniere_mise
                             + float(self.table.blind_initial.valeur / 2)
                         )
 
                     else:
                         valeur_totale_paye = (
                             float(montant)
-                            + float(TableService().get_val_derniere_mise(self.table.id_table))
+                            + etat.val_derniere_mise
                             + float(self.table.blind_initial.valeur)
                         )
 
-                    if joueur.credit.valeur < valeur_totale_paye:
+                    # débit du crédit (s'il suffit), pot et transaction en une seule requête
+                    soldes = JoueurPartieService().miser_atomique(
+                        joueur.id_joueur, self.table.id_table, valeur_totale_paye
+                    )
+                    if soldes is None:
                         print("Votre solde est insufisant")
                         JoueurPartieService().mettre_a_jour_statut(
                             joueur.id_joueur, self.table.id_table, "s'est couché"
                         )
                         print(f"{joueur.pseudo} s'est couché.")
                     else:
+                        joueur.credit = Monnaie(soldes["credit"])
                         TableService().set_val_derniere_mise(
-                            self.table.id_table, montant + TableService().get_val_derniere_mise(self.table.id_table)
+                            self.table.id_table, montant + etat.val_derniere_mise
                         )
 
-                        # retirer le solde du joueur
-                        solde = getattr(joueur, "credit", getattr(joueur, "solde", None))
-                        valeur_solde = solde.get()
-                        joueur.credit = Monnaie(float(valeur_solde) - float(valeur_totale_paye))
-                        JoueurService().modifier_credit(joueur.id_joueur, float(joueur.credit.get()))
-                        TransactionService().enregistrer_transaction(joueur.id_joueur, - int(valeur_totale_paye))
-                        # ajouter au pot
-                        TableService().alimenter_pot(self.table.id_table, valeur_totale_paye)
-
                         print(f"{joueur.pseudo} a misé {montant}.")
 
                 elif action == "Suivre":
 
                     if tour == "Pré-flop" and (
-                        not joueur_partie_service.obtenir_statut(joueur.id_joueur, self.table.id_table)
-                        in {"tour de blinde", "tour petite blinde"}
+                        not statut_joueur in {"tour de blinde", "tour petite blinde"}
                     ):
-                        valeur_totale_paye = float(TableService().get_val_derniere_mise(self.table.id_table)) + float(
-                            self.table.blind_initial.valeur
-                        )
+                        valeur_totale_paye = etat.val_derniere_mise + float(self.table.blind_initial.valeur)
 
-                    elif (
-                        joueur_partie_service.obtenir_statut(joueur.id_joueur, self.table.id_table)
-                        == "tour petite blinde"
-                    ):
-                        valeur_totale_paye = float(TableService().get_val_derniere_mise(self.table.id_table)) + float(
-                            self.table.blind_initial.valeur / 2
-                        )
+                    elif statut_joueur == "tour petite blinde":
+                        valeur_totale_paye = etat.val_derniere_mise + float(self.table.blind_initial.valeur / 2)
 
                     else:
-                        valeur_totale_paye = float(TableService().get_val_derniere_mise(self.table.id_table)) + float(
-                            self.table.blind_initial.valeur
-                        )
+                        valeur_totale_paye = etat.val_derniere_mise + float(self.table.blind_initial.valeur)
 
-                    if joueur.credit.valeur < valeur_totale_paye:
+                    soldes = JoueurPartieService().miser_atomique(
+                        joueur.id_joueur, self.table.id_table, valeur_totale_paye
+                    )
+                    if soldes is None:
                         print("Votre solde est insufisant")
                         JoueurPartieService().mettre_a_jour_statut(
                             joueur.id_joueur, self.table.id_table, "s'est couché"
                         )
                         print(f"{joueur.pseudo} s'est couché.")
                     else:
-                        # retirer le solde du joueur
-                        solde = getattr(joueur, "credit", getattr(joueur, "solde", None))
-                        valeur_solde = solde.get()
-                        joueur.credit = Monnaie(float(valeur_solde) - float(valeur_totale_paye))
-                        JoueurService().modifier_credit(joueur.id_joueur, float(joueur.credit.get()))
-                        TransactionService().enregistrer_transaction(joueur.id_joueur, - int(valeur_totale_paye))
-                        # ajouter au pot
-                        TableService().alimenter_pot(self.table.id_table, valeur_totale_paye)
+                        joueur.credit = Monnaie(soldes["credit"])
 
                         print(f"{joueur.pseudo} a suivi.")
 
@@ -424,7 +438,7 @@ class MenuPartie(VueAbstraite):
 
                     while JoueurPartieService().obtenir_statut(joueur.id_joueur, self.table.id_table) == "s'est couché":
                         print("En attente de la fin de la main des autres joueurs...")
-                        time.sleep(2)
+                        abonnement.attendre({"statut"})
 
                         action_attente = inquirer.select(
                             message="Voulez-vous continuer à attendre ou quitter la partie ?",
@@ -443,10 +457,11 @@ class MenuPartie(VueAbstraite):
                 # recharger la liste des joueurs et filtrer les joueurs actifs
                 liste_joueurs_dans_partie = joueur_partie_service.lister_joueurs_selon_table(self.table.id_table)
                 statuts_en_jeu = {"tour de blinde", "tour petite blinde", "en jeu"}
+                etat = table_service.etat_table(self.table.id_table)
                 liste_joueurs_en_jeu = [
                     jid
                     for jid in liste_joueurs_dans_partie
-                    if joueur_partie_service.obtenir_statut(jid, self.table.id_table) in statuts_en_jeu
+                    if etat.statut(jid) in statuts_en_jeu
                 ]
 
                 if len(liste_joueurs_en_jeu) == 0:
@@ -454,7 +469,7 @@ class MenuPartie(VueAbstraite):
                     print("Aucun joueur en jeu pour passer le tour.")
                 else:
                     # id courant (celui qui venait de jouer) stocké en DB
-                    id_courant = TableService().get_id_joueur_tour(self.table.id_table)
+                    id_courant = etat.id_joueur_tour
 
                     # s'assurer que id_courant est dans la liste (même type !)
                     try:
@@ -476,11 +491,8 @@ class MenuPartie(VueAbstraite):
                     break
 
                 # recalcul du nombre de joueurs en jeu
-                liste_joueurs_en_jeu = []
-                for id_j in liste_joueurs_dans_partie:
-                    statut_joueur = joueur_partie_service.obtenir_statut(id_j, self.table.id_table)
-                    if statut_joueur in statuts_en_jeu:
-                        liste_joueurs_en_jeu.append(id_j)
+                statuts = joueur_partie_service.obtenir_statuts(self.table.id_table)
+                liste_joueurs_en_jeu = [id_j for id_j in liste_joueurs_dans_partie if statuts.get(id_j) in statuts_en_jeu]
 
                 if joueur.id_joueur == liste_joueurs_en_jeu[-1]:  # dernier joueur à avoir joué
                     # gestion des cas de relance
@@ -488,27 +500,38 @@ class MenuPartie(VueAbstraite):
                     # Initialisation des contributions pour ce tour
                     liste_joueurs_dans_partie = joueur_partie_service.lister_joueurs_selon_table(self.table.id_table)
                     statuts_en_jeu = {"tour de blinde", "tour petite blinde", "en jeu"}
-                    joueurs_actifs = [
-                        jid
-                        for jid in liste_joueurs_dans_partie
-                        if joueur_partie_service.obtenir_statut(jid, self.table.id_table) in statuts_en_jeu
-                    ]
+                    statuts = joueur_partie_service.obtenir_statuts(self.table.id_table)
+                    joueurs_actifs = [jid for jid in liste_joueurs_dans_partie if statuts.get(jid) in statuts_en_jeu]
 
                     contribution_joueur = {jid: 0.0 for jid in joueurs_actifs}
                     mise_tour_courant = 0.0
 
                     def tour_clos():
+                        # statuts et crédits de tous les joueurs lus en une seule requête
+                        etat_cloture = table_service.etat_table(self.table.id_table)
                         for jid in list(contribution_joueur.keys()):
-                            statut = joueur_partie_service.obtenir_statut(jid, self.table.id_table)
-                            if statut == "s'est couché":
+                            if etat_cloture.statut(jid) == "s'est couché":
                                 continue
-                            credit = float(JoueurService().recuperer_credit(jid).get())
-                            if credit <= 0:
+                            if (etat_cloture.credit(jid) or 0.0) <= 0:
                                 continue
                             if contribution_joueur[jid] < mise_tour_courant:
                                 return False
                         return True
 
+                    def payer_cloture(montant):
+                        """Mise du joueur pendant la clôture ; il se couche si son crédit ne suffit pas"""
+                        soldes = joueur_partie_service.miser_atomique(joueur.id_joueur, self.table.id_table, montant)
+                        if soldes is None:
+                            print("Votre solde est insufisant")
+                            joueur_partie_service.mettre_a_jour_statut(
+                                joueur.id_joueur, self.table.id_table, "s'est couché"
+                            )
+                            print(f"{joueur.pseudo} s'est couché.")
+                            contribution_joueur.pop(joueur.id_joueur, None)
+                            return
+                        joueur.credit = Monnaie(soldes["credit"])
+                        contribution_joueur[joueur.id_joueur] += montant
+
                     # Boucle de clôture
                     securite = 0
                     max_securite = 1000
@@ -521,13 +544,14 @@ class MenuPartie(VueAbstraite):
                         liste_joueurs_dans_partie = joueur_partie_service.lister_joueurs_selon_table(
                             self.table.id_table
                         )
+                        etat = table_service.etat_table(self.table.id_table)
                         joueurs_actifs = [
                             jid
                             for jid in liste_joueurs_dans_partie
-                            if joueur_partie_service.obtenir_statut(jid, self.table.id_table) in statuts_en_jeu
+                            if etat.statut(jid) in statuts_en_jeu
                         ]
 
-                        joueur_courant = TableService().get_id_joueur_tour(self.table.id_table)
+                        joueur_courant = etat.id_joueur_tour
                         if joueur_courant not in joueurs_actifs:
                             if joueurs_actifs:
                                 joueur_courant = joueurs_actifs[0]
@@ -558,18 +582,14 @@ class MenuPartie(VueAbstraite):
                                     del contribution_joueur[joueur.id_joueur]
                             elif action == "Suivre":
                                 to_pay = min(float(joueur.credit), montant_a_suivre)
-                                JoueurService().modifier_credit(joueur.id_joueur, float(joueur.credit) - to_pay)
-                                TransactionService().enregistrer_transaction(joueur.id_joueur, - int(to_pay))
-                                TableService().alimenter_pot(self.table.id_table, to_pay)
-                                contribution_joueur[joueur.id_joueur] += to_pay
+                                if to_pay > 0:
+                                    payer_cloture(to_pay)
                             else:  # Miser / Relance
                                 montant = float(inquirer.text(message="Montant à relancer (additionnel) : ").execute())
                                 to_pay = min(float(joueur.credit), montant)
-                                JoueurService().modifier_credit(joueur.id_joueur, float(joueur.credit) - to_pay)
-                                TransactionService().enregistrer_transaction(joueur.id_joueur, - int(to_pay))
-                                TableService().alimenter_pot(self.table.id_table, to_pay)
-                                contribution_joueur[joueur.id_joueur] += to_pay
-                                if contribution_joueur[joueur.id_joueur] > mise_tour_courant:
+                                if to_pay > 0:
+                                    payer_cloture(to_pay)
+                                if contribution_joueur.get(joueur.id_joueur, 0.0) > mise_tour_courant:
                                     mise_tour_courant = contribution_joueur[joueur.id_joueur]
                                     print(f"Nouvelle mise à égaler : {mise_tour_courant}")
 
@@ -584,7 +604,7 @@ class MenuPartie(VueAbstraite):
                                 TableService().set_id_joueur_tour(self.table.id_table, prochain_joueur)
                         else:
                             print("En attente du tour des autres joueurs...")
-                            time.sleep(2)
+                            abonnement.attendre({"tour", "statut"})
 
                     # ---------- Fin : gestion stricte de la clôture ----------
 
@@ -594,11 +614,8 @@ class MenuPartie(VueAbstraite):
                 # Gestion de la fin de la main -> partie du code executé dans le script d'un seul joueur pour qu'il s'execute une fois
 
                 # recalcul du nombre de joueurs en jeu
-                liste_joueurs_en_jeu = []
-                for id_j in liste_joueurs_dans_partie:
-                    statut_joueur = joueur_partie_service.obtenir_statut(id_j, self.table.id_table)
-                    if statut_joueur in statuts_en_jeu:
-                        liste_joueurs_en_jeu.append(id_j)
+                statuts = joueur_partie_service.obtenir_statuts(self.table.id_table)
+                liste_joueurs_en_jeu = [id_j for id_j in liste_joueurs_dans_partie if statuts.get(id_j) in statuts_en_jeu]
 
             if (
                 joueur.id_joueur == liste_joueurs_en_jeu[0]
@@ -607,13 +624,11 @@ class MenuPartie(VueAbstraite):
                 if len(liste_joueurs_en_jeu) == 1:
                     id_gagnant = liste_joueurs_en_jeu[0]
 
-                    pot = TableService().get_pot(self.table.id_table)
+                    pot = table_service.etat_table(self.table.id_table).pot
                     print(f"Fin de la main : le gagnant remporte le pot : {pot}")
 
-                    nouveau_solde_du_gagnant = JoueurService().recuperer_credit(id_gagnant)
-                    JoueurService().modifier_credit(id_gagnant, int(nouveau_solde_du_gagnant.get()))
-                    TransactionService().enregistrer_transaction(id_gagnant, int(pot))
-                    TableService().retirer_pot(self.table.id_table, pot)
+                    table_service.distribuer_pot(self.table.id_table, {id_gagnant: pot})
+                    table_service.annoncer_resultat(self.table.id_table, [id_gagnant], None, pot)
 
             # Cas ou il reste plusieur joueur : le joueur avec la combinaison la plus haute remporte le pot
 
@@ -624,8 +639,7 @@ class MenuPartie(VueAbstraite):
                     id_table=id_table, id_joueur=id_en_jeu
                 )
 
-            # Comparer les mains
-            dict_id_combinaison = {}
+            # Comparer les mains : une seule évaluation par joueur, le rang ordonne totalement les mains
             # aplatir en UNE LISTE de cartes (et non pas liste de listes)
             flop_complet = (
                 (flop.get_cartes() if hasattr(flop, "get_cartes") else list(flop))
@@ -633,55 +647,35 @@ class MenuPartie(VueAbstraite):
                 + (river.get_cartes() if hasattr(river, "get_cartes") else list(river))
             )
 
+            dict_id_main_complete = {}
             for id, main_obj in dict_id_cartes.items():
                 main_list = main_obj.get_cartes() if hasattr(main_obj, "get_cartes") else list(main_obj)
-                main_complete = MainJoueurComplete(main_list + flop_complet)
-                dict_id_combinaison[id] = main_complete.combinaison()
-            # Trouver la valeur maximale
-            max_val = max(dict_id_combinaison.values())
-            combinaison_max = Combinaison(max_val)
-            id_max = [
-                k for k, v in dict_id_combinaison.items() if v == max_val
-            ]  # recupere les id avec la combinaison la plus haute
-
-            id_gagnant = id_max[0]
-            if not len(id_max) == 1:
-                # Creer dico
-                dict_comb_complete = {}
-                for id in id_max:
-                    dict_comb_complete[id] = (dict_id_cartes[id].get_cartes() if hasattr(dict_id_cartes[id], "get_cartes") else list(dict_id_cartes[id])) + flop_complet
-                    #dict_comb_complete[id] = dict_id_cartes[id] + ListeCartes(flop_complet)
-                id_gagnant = MainJoueurComplete.gagnants_avec_meme_combinaison(dict_comb_complete, combinaison_max)
-
-            # Créditer le gagnant
-            if isinstance(id_gagnant, list):
-                noms = ", ".join([JoueurService().trouver_par_id(i).pseudo for i in id_gagnant])
-                print(f"Les gagnants sont : {noms} avec une {COMBINAISON_LABELS.get(combinaison_max)}")
-                # Cas plusieurs gagnant il faut diviser le pot
-                if joueur.id_joueur == liste_joueurs_en_jeu[0]:
-                    pot = int(TableService().get_pot(self.table.id_table))
-                    repartition_pot = int(pot / len(id_gagnant))
+                dict_id_main_complete[id] = main_list + flop_complet
 
-                    for id in id_gagnant:
-                        nouveau_solde_du_gagnant = JoueurService().recuperer_credit(id)
-                        JoueurService().modifier_credit(id, float(repartition_pot + int(nouveau_solde_du_gagnant.get())))
-                        TransactionService().enregistrer_transaction(id, int(repartition_pot))
+            id_max = MainJoueurComplete.gagnants(dict_id_main_complete)
+            combinaison_max = MainJoueurComplete(dict_id_main_complete[id_max[0]]).combinaison()
 
-                    TableService().retirer_pot(self.table.id_table, pot)
+            id_gagnant = id_max[0] if len(id_max) == 1 else id_max
 
+            # Créditer les gagnants : chaque couche du pot va à la meilleure main parmi ceux qui l'ont payée
+            if isinstance(id_gagnant, list):
+                noms = ", ".join([JoueurService().trouver_par_id(i).pseudo for i in id_gagnant])
+                print(f"Les gagnants sont : {noms} avec une {COMBINAISON_LABELS.get(combinaison_max)}")
             else:
                 print(
                     f"Le gagnant est : {JoueurService().trouver_par_id(id_gagnant).pseudo} avec une {COMBINAISON_LABELS.get(combinaison_max)}"
                 )
 
-                pot = TableService().get_pot(self.table.id_table)
-                print(f"Fin de la main : le gagnant remporte le pot : {pot}")
-
-                if joueur.id_joueur == liste_joueurs_en_jeu[0]:
-                    nouveau_solde_du_gagnant = JoueurService().recuperer_credit(id_gagnant)
-                    JoueurService().modifier_credit(id_gagnant, float(pot + int(nouveau_solde_du_gagnant.get())))
-                    TransactionService().enregistrer_transaction(id_gagnant, int(pot))
-                    TableService().retirer_pot(self.table.id_table, pot)
+            if len(liste_joueurs_en_jeu) > 1 and joueur.id_joueur == liste_joueurs_en_jeu[0]:
+                etat = table_service.etat_table(self.table.id_table)
+                gains = self.repartir_pot(etat, dict_id_main_complete, id_max)
+                for id_j, montant in gains.items():
+                    print(f"{JoueurService().trouver_par_id(id_j).pseudo} remporte {montant}")
+                # tous les gagnants sont crédités en une seule transaction
+                table_service.distribuer_pot(self.table.id_table, gains)
+                table_service.annoncer_resultat(
+                    self.table.id_table, id_max, COMBINAISON_LABELS.get(combinaison_max), etat.pot
+                )
 
             # Mettre le statut couché a tous les joueurs pour eviter qu'il passent a l'étape suivante de la boucle
             # avant que tous les joueurs n'ai consulté le resultat de la partie en cours
@@ -700,30 +694,27 @@ class MenuPartie(VueAbstraite):
                     quitter_partie = True
                     break
 
-                time.sleep(5)  # attente de 5 secondes avant de re-vérifier
+                abonnement.attendre({"statut", "joueurs"})  # attente d'un changement avant de re-vérifier
                 liste_joueurs_dans_partie = joueur_partie_service.lister_joueurs_selon_table(self.table.id_table)
 
                 # recalcul du nombre de joueurs en jeu
-                liste_joueurs_en_jeu = []
-                for id_j in liste_joueurs_dans_partie:
-                    statut_joueur = joueur_partie_service.obtenir_statut(id_j, self.table.id_table)
-                    if statut_joueur in statuts_en_jeu:
-                        liste_joueurs_en_jeu.append(id_j)
+                statuts = joueur_partie_service.obtenir_statuts(self.table.id_table)
+                liste_joueurs_en_jeu = [id_j for id_j in liste_joueurs_dans_partie if statuts.get(id_j) in statuts_en_jeu]
 
             # lister joueurs dans partie
             liste_joueurs_dans_partie = joueur_partie_service.lister_joueurs_selon_table(self.table.id_table)
             if joueur.id_joueur == liste_joueurs_dans_partie[0]:
                 # Remet en jeu les joueurs couchés pour commencer une prochaine main
                 liste_joueurs_dans_partie = joueur_partie_service.lister_joueurs_selon_table(self.table.id_table)
+                statuts = joueur_partie_service.obtenir_statuts(self.table.id_table)
                 for id_j in liste_joueurs_dans_partie:
-                    statut_joueur = joueur_partie_service.obtenir_statut(id_j, self.table.id_table)
-                    if statut_joueur == "s'est couché":
+                    if statuts.get(id_j) == "s'est couché":
                         joueur_partie_service.mettre_a_jour_statut(id_j, self.table.id_table, "en jeu")
 
                 # Faire tourner la blinde
 
                 # Récupérer l'id du bouton actuel
-                id_bouton_actuel = table_service.get_id_joueur_bouton(self.table.id_table)
+                id_bouton_actuel = table_service.etat_table(self.table.id_table).id_joueur_bouton
 
                 # Calculer le nouveau bouton (le joueur suivant dans la liste)
                 index_actuel = liste_joueurs_dans_partie.index(id_bouton_actuel)
@@ -735,7 +726,7 @@ class MenuPartie(VueAbstraite):
 
                 # Changer les statuts des joueurs
                 for id_j in liste_joueurs_dans_partie:
-                    statut_joueur = joueur_partie_service.obtenir_statut(id_j, self.table.id_table)
+                    statut_joueur = statuts.get(id_j)
                     if (statut_joueur == "tour de blinde") or (statut_joueur == "tour petite blinde"):
                         joueur_partie_service.mettre_a_jour_statut(id_j, self.table.id_table, "en jeu")
 
@@ -746,6 +737,7 @@ class MenuPartie(VueAbstraite):
         # faire quitter la partie au joueur
         TableService().retirer_joueur_table(self.table.id_table)  # retirer le nb de joueurs dans la table table_poker
         joueur_partie_service.retirer_joueur_de_partie(joueur.id_joueur)  # retirer le joueur de la partie à la fin
+        abonnement.fermer()
         print(f"{joueur.pseudo} a quitté la partie.")
 
         from view.menu_joueur_vue import MenuJoueurVue